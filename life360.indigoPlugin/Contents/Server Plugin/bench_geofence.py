@@ -0,0 +1,77 @@
+"""Geofence evaluation benchmark
+
+Times the staged geofence evaluation in geofence.py against a full
+great_circle check of every member/fence pair.  Run from this directory with
+
+    python bench_geofence.py
+
+"""
+import random
+import time
+
+from geopy.distance import great_circle
+
+from geofence import CompiledFence, FenceIndex, evaluate, np, pair_distances
+
+
+def benchmark(fence_count=100, member_count=20, rounds=50, seed=360):
+    """
+    Time the staged evaluation against full per-pair distance checks.
+
+    Fences and members are scattered over a metro-sized area (~50 km), which
+    is what a real circle looks like: almost every pair is far apart.
+    """
+    rng = random.Random(seed)
+    fences = [CompiledFence(i, f"fence {i}", 40.0 + rng.uniform(-0.25, 0.25),
+                            -75.0 + rng.uniform(-0.25, 0.25), rng.uniform(0.05, 1.0))
+              for i in range(fence_count)]
+    members = [(i, 40.0 + rng.uniform(-0.25, 0.25), -75.0 + rng.uniform(-0.25, 0.25))
+               for i in range(member_count)]
+
+    def _geopy():
+        # what isInsideGeoFence used to do for every pair
+        return {m[0]: [f.key for f in fences
+                       if great_circle((f.lat, f.lon), (m[1], m[2])).km <= f.radius_km]
+                for m in members}
+
+    def _all_pairs():
+        return {m[0]: [f.key for f, km in zip(fences, pair_distances(
+                    [m[1]] * len(fences), [m[2]] * len(fences), fences)) if km <= f.radius_km]
+                for m in members}
+
+    def _staged():
+        result = evaluate(members, fences)
+        return {m[0]: result.fences_for(m[0]) for m in members}
+
+    index = FenceIndex()
+    for f in fences:
+        index.add(f)
+
+    def _indexed():
+        result = evaluate(members, fences, index)
+        return {m[0]: result.fences_for(m[0]) for m in members}
+
+    expected = _geopy()
+    timings = {}
+    for label, fn in (("geopy great_circle per pair", _geopy),
+                      ("haversine every pair", _all_pairs),
+                      ("bbox + equirectangular + exact", _staged),
+                      ("grid index + staged", _indexed)):
+        if fn() != expected:
+            raise AssertionError(f"{label} disagrees with great_circle")
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        timings[label] = (time.perf_counter() - start) / rounds
+
+    base = timings["geopy great_circle per pair"]
+    print(f"{fence_count} fences x {member_count} members, {rounds} rounds"
+          f" ({'numpy' if np is not None else 'pure Python'})")
+    for label, seconds in timings.items():
+        print(f"  {label:<32} {seconds * 1000:8.3f} ms/poll  {base / seconds:6.1f}x")
+    return timings
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark(fence_count=1000, rounds=5)
@@ -0,0 +1,96 @@
+"""Atomic on-disk store for the last Life360 snapshot (life360_cache.json)."""
+import hashlib
+import json
+import os
+import time
+
+
+class SnapshotStore:
+    """
+    Keeps the last snapshot on disk so a restarted plugin has data at once.
+
+    The snapshot is written as minified JSON to a temporary file which then
+    replaces the real one, so a crash mid-write leaves the previous cache
+    intact instead of a truncated file.  A digest of the encoded snapshot is
+    kept, and save() skips the write entirely when nothing changed.
+
+    The time of the last save is stored with the data.  When a poll finds
+    the data unchanged (an identical save, or a 304 reported via confirm())
+    only the file's modification time is bumped, so age() measures how long
+    ago Life360 last confirmed the snapshot, not when it last changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.saved_at = None    # epoch seconds the stored snapshot was written
+        self.confirmed_at = None  # epoch seconds Life360 last confirmed it (file mtime)
+        self._digest = None     # digest of the stored snapshot's encoding
+        self.writes = 0
+        self.skipped_writes = 0
+
+    @staticmethod
+    def _encode(data):
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def save(self, data):
+        """Write data unless it is identical to what is stored.  Returns True if written."""
+        body = self._encode(data)
+        digest = hashlib.sha1(body).hexdigest()
+        if digest == self._digest:
+            self.skipped_writes += 1
+            self.confirm()
+            return False
+        saved_at = time.time()
+        header = json.dumps({'saved_at': saved_at, 'digest': digest}, separators=(',', ':'))
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            # splice the already-encoded snapshot in rather than encoding it twice
+            f.write(header[:-1].encode('utf-8') + b',"data":' + body + b'}')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.saved_at = self.confirmed_at = saved_at
+        self._digest = digest
+        self.writes += 1
+        return True
+
+    def load(self):
+        """
+        Return the stored snapshot, or None when there is no cache file.
+
+        Files written before this store existed (the snapshot dict itself,
+        pretty-printed) still load; their age is taken from the file time.
+        Undecodable files raise ValueError.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            raw = json.loads(f.read().decode('utf-8'))
+        mtime = os.path.getmtime(self.path)
+        if isinstance(raw, dict) and 'data' in raw and 'saved_at' in raw:
+            data = raw['data']
+            self.saved_at = float(raw['saved_at'])
+        else:
+            data = raw
+            self.saved_at = mtime
+        self.confirmed_at = max(self.saved_at, mtime)
+        self._digest = hashlib.sha1(self._encode(data)).hexdigest()
+        return data
+
+    def confirm(self):
+        """Record that the stored snapshot is still current, without rewriting it."""
+        if self.saved_at is None:
+            return
+        now = time.time()
+        os.utime(self.path, (now, now))
+        self.confirmed_at = now
+
+    def age(self):
+        """Seconds since the stored snapshot was last saved or confirmed, or None if there is none."""
+        if self.confirmed_at is None:
+            return None
+        return max(0.0, time.time() - self.confirmed_at)
+
+    def stats(self):
+        """Return a one-line summary of the write counters."""
+        return f"snapshot cache: {self.writes} writes, {self.skipped_writes} unchanged writes skipped"
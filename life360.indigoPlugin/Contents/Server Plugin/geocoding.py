@@ -0,0 +1,272 @@
+"""Reverse-geocoding helpers for member addresses."""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from geopy.adapters import RequestsAdapter
+from geopy.geocoders import Nominatim
+
+# metres per degree of latitude (close enough everywhere for cache bucketing)
+_METERS_PER_DEGREE = 111320.0
+
+
+class ReverseGeocodeCache:
+    """
+    LRU cache of reverse-geocoded addresses keyed on a coordinate grid.
+
+    Coordinates are snapped to a grid of roughly precision_m metres, so a
+    member who hasn't moved (or only jitters within a cell) reuses the address
+    looked up last time instead of calling the geocoder again.  Entries expire
+    after ttl seconds and the least recently used entry is evicted once
+    max_entries is reached.  The cache can be persisted to a JSON file next to
+    life360_cache.json so it survives plugin restarts.
+    """
+
+    def __init__(self, precision_m=25.0, ttl=7 * 24 * 3600, max_entries=1000, path=None):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # grid key -> (address, stored_at)
+        self.precision_m = float(precision_m)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, precision_m=None, ttl=None, max_entries=None):
+        """Apply new settings; changing the precision empties the cache."""
+        with self._lock:
+            if precision_m is not None and float(precision_m) != self.precision_m:
+                self.precision_m = float(precision_m)
+                self._entries.clear()
+                self._dirty = True
+            if ttl is not None:
+                self.ttl = ttl
+            if max_entries is not None:
+                self.max_entries = max_entries
+                self._evict()
+
+    def key(self, lat, lon):
+        """Return the grid cell for a coordinate as a 'row,col' string."""
+        lat_step = self.precision_m / _METERS_PER_DEGREE
+        row = round(lat / lat_step)
+        # longitude cells shrink towards the poles — widen them to stay ~square
+        lon_step = lat_step / max(math.cos(math.radians(row * lat_step)), 1e-6)
+        col = round(lon / lon_step)
+        return f"{row},{col}"
+
+    def get(self, lat, lon):
+        """Return the cached address for lat/lon, or None on a miss."""
+        key = self.key(lat, lon)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, lat, lon, address):
+        """Store the address for the grid cell containing lat/lon."""
+        key = self.key(lat, lon)
+        with self._lock:
+            self._entries[key] = (address, time.time())
+            self._entries.move_to_end(key)
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def load(self):
+        """Load persisted entries, dropping expired ones.  Returns the count loaded."""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        # cells from a different grid size don't line up with ours
+        if float(data.get('precision_m', 0)) != self.precision_m:
+            return 0
+        now = time.time()
+        with self._lock:
+            self._entries.clear()
+            for key, address, stored_at in data.get('entries', []):
+                if now - stored_at <= self.ttl:
+                    self._entries[key] = (address, stored_at)
+            self._evict()
+            self._dirty = False
+            return len(self._entries)
+
+    def save(self):
+        """Write the cache to disk if it changed since the last save."""
+        if not self.path or not self._dirty:
+            return False
+        with self._lock:
+            data = {
+                'precision_m': self.precision_m,
+                'entries': [[k, a, t] for k, (a, t) in self._entries.items()],
+            }
+            self._dirty = False
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        return True
+
+    def stats(self):
+        """Return a one-line summary of the cache metrics."""
+        total = self.hits + self.misses
+        rate = (100.0 * self.hits / total) if total else 0.0
+        return (f"geocode cache: {len(self._entries)} entries, {self.hits} hits, "
+                f"{self.misses} misses ({rate:.0f}% hit rate), {self.evictions} evictions")
+
+
+class ReverseGeocoder:
+    """
+    One Nominatim geocoder shared by every member update.
+
+    The bundled geopy geocoders open a fresh urllib connection per request.
+    When requests is installed (it is in requirements.txt) the geocoder is
+    built with geopy's RequestsAdapter as its adapter_factory, so
+    consecutive lookups reuse one pooled keep-alive TCP/TLS connection
+    across polls; without it, lookups fall back to urllib.  Lookups go
+    through the ReverseGeocodeCache first when one is given.
+    """
+
+    def __init__(self, user_agent='life360', cache=None, timeout=10):
+        self.cache = cache
+        adapter_factory = None
+        if RequestsAdapter.is_available:
+            adapter_factory = functools.partial(RequestsAdapter, pool_connections=1, pool_maxsize=2)
+        self._geocoder = Nominatim(user_agent=user_agent, timeout=timeout,
+                                   adapter_factory=adapter_factory)
+        self._adapter = self._geocoder.adapter
+
+    @property
+    def keepalive(self):
+        """True when lookups share a pooled keep-alive session."""
+        return self._adapter is not None
+
+    def reverse(self, lat, lon):
+        """Return the address for lat/lon as a string, from the cache when possible."""
+        if self.cache is not None:
+            address = self.cache.get(lat, lon)
+            if address is not None:
+                return address
+        return self.lookup(lat, lon)
+
+    def lookup(self, lat, lon):
+        """Ask Nominatim for the address (skipping the cache read) and cache it."""
+        address = str(self._geocoder.reverse((lat, lon)))
+        if self.cache is not None:
+            self.cache.put(lat, lon, address)
+        return address
+
+    def close(self):
+        """Release the pooled connections."""
+        if self._adapter is not None:
+            self._adapter.session.close()
+
+
+class GeocodeWorker:
+    """
+    Background thread that resolves member addresses off the polling thread.
+
+    The polling loop submits (key, lat, lon) whenever a member's coordinates
+    miss the address cache and carries on; the worker performs the lookups
+    one at a time, no closer together than min_interval seconds (Nominatim
+    allows one request per second), and hands each answer to on_result(key,
+    lat, lon, address) from the worker thread; address is None when the
+    lookup failed, so the caller can keep what it had and try again.  The
+    coordinates are those the lookup was made for, so the caller can
+    discard an answer that is no longer for where the member is.  Only the newest coordinates per key
+    are kept, cancel() drops a key's queued job, and at most max_pending
+    keys wait at any time.
+    """
+
+    def __init__(self, geocoder, on_result, min_interval=1.0, max_pending=100, logger=None):
+        self._geocoder = geocoder
+        self._on_result = on_result
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()   # key -> (lat, lon), newest coordinates win
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._last_request = 0.0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="life360-geocoder", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop the worker; lookups still queued are abandoned."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def submit(self, key, lat, lon):
+        """Queue a lookup.  Returns False if the queue is full."""
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending[key] = (lat, lon)
+            self._wakeup.set()
+        return True
+
+    def cancel(self, key):
+        """Drop the queued lookup for key, if any.  A lookup in flight still completes."""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _next(self):
+        with self._lock:
+            if not self._pending:
+                self._wakeup.clear()
+                return None
+            return self._pending.popitem(last=False)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            while not self._stopping.is_set():
+                job = self._next()
+                if job is None:
+                    break
+                key, (lat, lon) = job
+                cache = self._geocoder.cache
+                address = cache.get(lat, lon) if cache is not None else None
+                if address is None:
+                    # throttle only real requests; cache hits are free
+                    delay = self._last_request + self.min_interval - time.monotonic()
+                    if delay > 0 and self._stopping.wait(delay):
+                        return
+                    try:
+                        address = self._geocoder.lookup(lat, lon)
+                    except Exception as e:
+                        if self.logger:
+                            self.logger.debug(f"Geocoder error: {e}")
+                        address = None
+                    finally:
+                        self._last_request = time.monotonic()
+                try:
+                    self._on_result(key, lat, lon, address)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"Error applying geocoded address: {e}")
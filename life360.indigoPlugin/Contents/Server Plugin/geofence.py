@@ -0,0 +1,578 @@
+"""Geofence evaluation for every member against every fence in one pass."""
+import math
+
+from geographiclib.geodesic import Geodesic
+from geopy.distance import haversine_km_many
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Same mean radius geopy's great_circle uses, so distances line up with it
+EARTH_RADIUS_KM = 6371.009
+_KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+
+class CompiledFence:
+    """
+    A circular geofence parsed once from its device props.
+
+    Holds everything the evaluation hot path needs so that nothing is parsed
+    and no trig is done on the centre per member: the centre in radians with
+    its sin/cos, the radius as an angle and as a haversine threshold, and a
+    lat/lon bounding box for a cheap rejection test.  boundary_band_km is how
+    far the equirectangular approximation may be off for this fence; pairs
+    whose approximate distance lands that close to the radius get the exact
+    distance instead.
+    """
+
+    polygon = False
+
+    __slots__ = (
+        'key', 'name', 'lat', 'lon', 'radius_km',
+        'lat_rad', 'lon_rad', 'sin_lat', 'cos_lat',
+        'angular_radius', 'hav_radius',
+        'min_lat', 'max_lat', 'lon_half_width', 'boundary_band_km',
+    )
+
+    def __init__(self, key, name, lat, lon, radius_km):
+        self.key = key
+        self.name = name
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+        self.lat_rad = math.radians(lat)
+        self.lon_rad = math.radians(lon)
+        self.sin_lat = math.sin(self.lat_rad)
+        self.cos_lat = math.cos(self.lat_rad)
+        self.angular_radius = radius_km / EARTH_RADIUS_KM
+        # inside <=> haversine(d) <= haversine(radius); no asin/sqrt needed
+        self.hav_radius = math.sin(min(self.angular_radius, math.pi) / 2) ** 2
+
+        radius_deg = math.degrees(self.angular_radius)
+        self.min_lat = lat - radius_deg
+        self.max_lat = lat + radius_deg
+        # a circle that reaches a pole spans every longitude
+        if self.max_lat >= 90 or self.min_lat <= -90:
+            self.lon_half_width = 180.0
+        else:
+            self.lon_half_width = math.degrees(
+                math.asin(min(math.sin(self.angular_radius) / self.cos_lat, 1.0)))
+
+        # Equirectangular error grows with distance and with tan(lat); near
+        # the poles don't trust it at all.  1% + 1 m on top as a safety margin.
+        if abs(lat) > 80:
+            self.boundary_band_km = math.inf
+        else:
+            self.boundary_band_km = radius_km * (
+                0.01 + self.angular_radius * (1 + abs(math.tan(self.lat_rad)))) + 0.001
+
+    @classmethod
+    def from_props(cls, key, props):
+        """Build a fence from geofence device pluginProps.  Raises ValueError if invalid."""
+        try:
+            return cls(key, props.get('geofence_name', ''), float(props['geofence_lat']),
+                       float(props['geofence_long']), float(props['geofence_radius']))
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"incomplete geofence settings: {e}") from None
+
+    def bbox_contains(self, lat, lon):
+        """Cheap test: could lat/lon (degrees) be inside the fence at all?"""
+        if lat < self.min_lat or lat > self.max_lat:
+            return False
+        return abs((lon - self.lon + 180.0) % 360.0 - 180.0) <= self.lon_half_width
+
+    def distance_km(self, lat, lon):
+        """Exact great-circle distance (km) from the centre to lat/lon (degrees)."""
+        lat_rad = math.radians(lat)
+        a = (math.sin((lat_rad - self.lat_rad) / 2) ** 2
+             + self.cos_lat * math.cos(lat_rad) * math.sin((math.radians(lon) - self.lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+    def contains(self, lat, lon):
+        """Exact test: is lat/lon (degrees) within the radius of the centre?"""
+        if not self.bbox_contains(lat, lon):
+            return False
+        lat_rad = math.radians(lat)
+        a = (math.sin((lat_rad - self.lat_rad) / 2) ** 2
+             + self.cos_lat * math.cos(lat_rad) * math.sin((math.radians(lon) - self.lon_rad) / 2) ** 2)
+        return a <= self.hav_radius
+
+
+class FenceIndex:
+    """
+    Bucket grid over compiled fences for candidate lookups.
+
+    The globe is cut into cell_deg x cell_deg cells and each fence is filed
+    under every cell its bounding box touches, so a member only has to be
+    tested against the fences in its own cell.  Fences that would cover more
+    than max_cells cells (huge radii, polar caps) go on a short "wide" list
+    that every query includes.  add() and remove() only touch the cells of
+    the one fence involved, so device start/stop keeps the index current
+    without a rebuild.
+    """
+
+    def __init__(self, cell_deg=0.05, max_cells=256):
+        self.cell_deg = cell_deg
+        self.max_cells = max_cells
+        self._columns = int(round(360.0 / cell_deg))
+        self._buckets = {}    # (row, col) -> set of fence keys
+        self._wide = set()    # fence keys checked for every query
+        self._fences = {}     # fence key -> (fence, cells)
+
+    def __len__(self):
+        return len(self._fences)
+
+    def __contains__(self, key):
+        return key in self._fences
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_deg),
+                math.floor(lon / self.cell_deg) % self._columns)
+
+    def _cells_for(self, fence):
+        if fence.lon_half_width >= 180.0:
+            return None
+        rows = range(math.floor(fence.min_lat / self.cell_deg),
+                     math.floor(fence.max_lat / self.cell_deg) + 1)
+        first = math.floor((fence.lon - fence.lon_half_width) / self.cell_deg)
+        last = math.floor((fence.lon + fence.lon_half_width) / self.cell_deg)
+        if len(rows) * (last - first + 1) > self.max_cells:
+            return None
+        return [(row, col % self._columns) for row in rows for col in range(first, last + 1)]
+
+    def add(self, fence):
+        """Insert a fence, replacing any previous fence with the same key."""
+        self.remove(fence.key)
+        cells = self._cells_for(fence)
+        if cells is None:
+            self._wide.add(fence.key)
+        else:
+            for cell in cells:
+                self._buckets.setdefault(cell, set()).add(fence.key)
+        self._fences[fence.key] = (fence, cells)
+
+    def remove(self, key):
+        """Drop a fence; unknown keys are ignored."""
+        entry = self._fences.pop(key, None)
+        if entry is None:
+            return
+        cells = entry[1]
+        if cells is None:
+            self._wide.discard(key)
+            return
+        for cell in cells:
+            bucket = self._buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[cell]
+
+    def candidates(self, lat, lon):
+        """Return the keys of fences that might contain lat/lon."""
+        bucket = self._buckets.get(self._cell(lat, lon))
+        if bucket is None:
+            return self._wide
+        return bucket | self._wide if self._wide else bucket
+
+
+def parse_polygon(text):
+    """Parse 'lat,long; lat,long; ...' (semicolons or newlines) into a list of float pairs."""
+    vertices = []
+    for chunk in text.replace('\n', ';').split(';'):
+        if not chunk.strip():
+            continue
+        parts = chunk.split(',')
+        if len(parts) != 2:
+            raise ValueError(f"'{chunk.strip()}' is not a lat,long pair")
+        lat, lon = float(parts[0]), float(parts[1])
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"'{chunk.strip()}' is out of range")
+        vertices.append((lat, lon))
+    if len(vertices) > 1 and vertices[0] == vertices[-1]:
+        vertices.pop()   # closing vertex repeated — the polygon closes itself
+    if len(vertices) < 3:
+        raise ValueError("a polygon needs at least 3 corners")
+    return vertices
+
+
+class CompiledPolygon:
+    """
+    A polygon geofence parsed once from its device props.
+
+    Area and perimeter are the geodesic values from the bundled
+    geographiclib PolygonArea.  Containment uses ray casting over an edge
+    list precomputed in (lat, unwrapped lon) — each edge stores its latitude
+    span and slope so most edges are skipped with two comparisons — behind
+    the same bounding box test as circular fences.  That planar test is
+    exact enough for lot- and neighbourhood-sized polygons.
+
+    It exposes the same attributes as CompiledFence so the index, evaluate()
+    and OccupancyTracker treat both alike.  radius_km is 0 and distance_km()
+    is the distance to the nearest edge (0 inside), so the exit margin means
+    "this far outside the polygon".
+    """
+
+    polygon = True
+
+    __slots__ = (
+        'key', 'name', 'vertices', 'edges', 'lat', 'lon', 'radius_km',
+        'min_lat', 'max_lat', 'lon_half_width', 'boundary_band_km',
+        'area_m2', 'perimeter_m', '_ref_lon', '_km_per_lon',
+    )
+
+    def __init__(self, key, name, vertices):
+        if len(vertices) < 3:
+            raise ValueError("a polygon needs at least 3 corners")
+        self.key = key
+        self.name = name
+        # unwrap longitudes around the first corner so a polygon crossing
+        # the antimeridian stays contiguous
+        self._ref_lon = vertices[0][1]
+        self.vertices = [(lat, self._unwrap(lon)) for lat, lon in vertices]
+        lats = [v[0] for v in self.vertices]
+        lons = [v[1] for v in self.vertices]
+        self.min_lat = min(lats)
+        self.max_lat = max(lats)
+        self.lat = (self.min_lat + self.max_lat) / 2
+        centre_lon = (min(lons) + max(lons)) / 2
+        self.lon = (centre_lon + 180.0) % 360.0 - 180.0
+        self.lon_half_width = (max(lons) - min(lons)) / 2
+        self.radius_km = 0.0
+        self.boundary_band_km = 0.0
+        self._km_per_lon = _KM_PER_DEGREE * math.cos(math.radians(self.lat))
+
+        self.edges = []
+        for (lat1, lon1), (lat2, lon2) in zip(self.vertices, self.vertices[1:] + self.vertices[:1]):
+            if lat1 == lat2:
+                continue   # horizontal edges never cross a horizontal ray
+            self.edges.append((min(lat1, lat2), max(lat1, lat2), lat1, lon1,
+                               (lon2 - lon1) / (lat2 - lat1)))
+
+        area = Geodesic.WGS84.Polygon()
+        for lat, lon in vertices:
+            area.AddPoint(lat, lon)
+        _count, self.perimeter_m, signed_area = area.Compute(False, True)
+        self.area_m2 = abs(signed_area)
+
+    @classmethod
+    def from_props(cls, key, props):
+        """Build a fence from geofence device pluginProps.  Raises ValueError if invalid."""
+        return cls(key, props.get('geofence_name', ''), parse_polygon(props.get('geofence_polygon', '')))
+
+    def _unwrap(self, lon):
+        return self._ref_lon + (lon - self._ref_lon + 180.0) % 360.0 - 180.0
+
+    def bbox_contains(self, lat, lon):
+        """Cheap test: could lat/lon (degrees) be inside the polygon at all?"""
+        if lat < self.min_lat or lat > self.max_lat:
+            return False
+        return abs((lon - self.lon + 180.0) % 360.0 - 180.0) <= self.lon_half_width
+
+    def point_in_polygon(self, lat, lon):
+        """Ray-casting test without the bounding box check."""
+        lon = self._unwrap(lon)
+        inside = False
+        for lo_lat, hi_lat, lat1, lon1, slope in self.edges:
+            if lo_lat <= lat < hi_lat and lon < lon1 + (lat - lat1) * slope:
+                inside = not inside
+        return inside
+
+    def contains(self, lat, lon):
+        """Exact test: is lat/lon (degrees) inside the polygon?"""
+        return self.bbox_contains(lat, lon) and self.point_in_polygon(lat, lon)
+
+    def distance_km(self, lat, lon):
+        """Distance (km) from lat/lon to the nearest edge, or 0 when inside."""
+        if self.contains(lat, lon):
+            return 0.0
+        return self.edge_distance_km(lat, lon)
+
+    def edge_distance_km(self, lat, lon):
+        """Distance (km) from lat/lon to the nearest edge, inside or outside."""
+        # local flat projection around the polygon — fine at fence scale
+        px = self._unwrap(lon) * self._km_per_lon
+        py = lat * _KM_PER_DEGREE
+        best = math.inf
+        for (lat1, lon1), (lat2, lon2) in zip(self.vertices, self.vertices[1:] + self.vertices[:1]):
+            ax, ay = lon1 * self._km_per_lon, lat1 * _KM_PER_DEGREE
+            bx, by = lon2 * self._km_per_lon, lat2 * _KM_PER_DEGREE
+            dx, dy = bx - ax, by - ay
+            length = dx * dx + dy * dy
+            t = 0.0 if length == 0 else max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length))
+            best = min(best, math.hypot(px - ax - t * dx, py - ay - t * dy))
+        return best
+
+
+def compile_fence(key, props):
+    """Compile a geofence device's props into a CompiledFence or CompiledPolygon."""
+    if props.get('geofence_shape', 'circle') == 'polygon':
+        return CompiledPolygon.from_props(key, props)
+    return CompiledFence.from_props(key, props)
+
+
+def pair_distances(member_lats, member_lons, fences):
+    """
+    Return exact great-circle distances (km) for paired lists of points and fences.
+
+    member_lats[i]/member_lons[i] is measured against fences[i].  The whole
+    batch is computed in one pass of great_circle's atan2 formula —
+    vectorised with NumPy when it is installed, otherwise with geopy's
+    haversine_km_many on plain floats — using each fence's precomputed
+    radians, sin(lat) and cos(lat).
+    """
+    if not fences:
+        return []
+
+    if np is not None:
+        lat1 = np.radians(np.asarray(member_lats, dtype=float))
+        lon1 = np.radians(np.asarray(member_lons, dtype=float))
+        lat2 = np.array([f.lat_rad for f in fences])
+        lon2 = np.array([f.lon_rad for f in fences])
+        sin1, cos1 = np.sin(lat1), np.cos(lat1)
+        sin2 = np.array([f.sin_lat for f in fences])
+        cos2 = np.array([f.cos_lat for f in fences])
+        dlon = lon2 - lon1
+        sin_dlon, cos_dlon = np.sin(dlon), np.cos(dlon)
+        return (EARTH_RADIUS_KM * np.arctan2(
+            np.hypot(cos2 * sin_dlon, cos1 * sin2 - sin1 * cos2 * cos_dlon),
+            sin1 * sin2 + cos1 * cos2 * cos_dlon)).tolist()
+
+    return haversine_km_many(
+        [math.radians(lat) for lat in member_lats],
+        [math.radians(lon) for lon in member_lons],
+        [f.lat_rad for f in fences], [f.lon_rad for f in fences],
+        EARTH_RADIUS_KM, in_radians=True,
+        cos_lat2s=[f.cos_lat for f in fences], sin_lat2s=[f.sin_lat for f in fences])
+
+
+def near_boundary(lat, lon, fences, margin_km):
+    """
+    Return the first fence whose edge is within margin_km of lat/lon, or None.
+
+    Checks both sides of the edge, so a member just inside a fence counts as
+    well as one just outside.  Fences more than margin_km beyond their
+    latitude span are skipped before any distance is computed.
+    """
+    margin_deg = margin_km / _KM_PER_DEGREE
+    for f in fences:
+        if lat < f.min_lat - margin_deg or lat > f.max_lat + margin_deg:
+            continue
+        if f.polygon:
+            if f.edge_distance_km(lat, lon) <= margin_km:
+                return f
+        elif abs(f.distance_km(lat, lon) - f.radius_km) <= margin_km:
+            return f
+    return None
+
+
+class GeofenceResult:
+    """
+    Outcome of one evaluation: which members are inside which fences.
+
+    Member and fence keys are whatever the caller passed in (the plugin uses
+    Indigo device ids).  Fence order is preserved, so fences_for() lists
+    fences in the order they were given.
+    """
+
+    def __init__(self, member_keys, fence_keys, distances, inside):
+        self.member_keys = member_keys
+        self.fence_keys = fence_keys
+        self._distances = distances     # member key -> {fence key: km}
+        self._inside = inside           # member key -> [fence keys containing it]
+
+    def distance(self, member_key, fence_key):
+        """
+        Return the member's distance (km) to the fence centre.
+
+        None means the pair was rejected by the bounding box, i.e. the member
+        is nowhere near the fence.
+        """
+        return self._distances.get(member_key, {}).get(fence_key)
+
+    def fences_for(self, member_key):
+        """Return the fences the member is inside."""
+        return self._inside.get(member_key, [])
+
+    def members_in(self, fence_key):
+        """Return the members inside the fence, in member order."""
+        return [m for m in self.member_keys if fence_key in self._inside.get(m, ())]
+
+
+def evaluate(members, fences, index=None):
+    """
+    Evaluate every member against every fence.
+
+    members is a list of (key, lat, lon); fences is a list of CompiledFence
+    or CompiledPolygon.  When a FenceIndex over (at least) those fences is given, each member is
+    only tested against the fences in its grid cell.  Returns a
+    GeofenceResult.
+
+    Most member/fence pairs are far apart, so the test runs in stages:
+
+    0. the spatial index, if any, picks the candidate fences per member;
+    1. the fence's lat/lon bounding box rejects distant pairs outright;
+    2. an equirectangular distance (one sqrt, no per-pair trig) settles
+       every pair that isn't within boundary_band_km of the radius;
+    3. the remaining near-boundary pairs get the exact great-circle distance,
+       all in one batched pass.
+    """
+    member_keys = [m[0] for m in members]
+    distances = {key: {} for key in member_keys}
+    inside = {key: set() for key in member_keys}
+    near = []   # (member key, fence position, lat, lon) needing the exact distance
+    position = {f.key: i for i, f in enumerate(fences)}
+
+    for key, lat, lon in members:
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        cos_lat = math.cos(lat_rad)
+        if index is None:
+            candidates = enumerate(fences)
+        else:
+            candidates = [(position[k], fences[position[k]])
+                          for k in index.candidates(lat, lon) if k in position]
+        for i, f in candidates:
+            if not f.bbox_contains(lat, lon):
+                continue
+            if f.polygon:
+                # containment is exact and cheap; distances outside are only
+                # needed by OccupancyTracker, which asks the fence directly
+                if f.point_in_polygon(lat, lon):
+                    distances[key][f.key] = 0.0
+                    inside[key].add(i)
+                continue
+            dlon = (lon_rad - f.lon_rad + math.pi) % (2 * math.pi) - math.pi
+            km = EARTH_RADIUS_KM * math.hypot(lat_rad - f.lat_rad, dlon * cos_lat)
+            if abs(km - f.radius_km) <= f.boundary_band_km:
+                near.append((key, i, lat, lon))
+                continue
+            distances[key][f.key] = km
+            if km <= f.radius_km:
+                inside[key].add(i)
+
+    exact = pair_distances([n[2] for n in near], [n[3] for n in near],
+                           [fences[n[1]] for n in near])
+    for (key, i, _lat, _lon), km in zip(near, exact):
+        f = fences[i]
+        distances[key][f.key] = km
+        if km <= f.radius_km:
+            inside[key].add(i)
+
+    # keep fences in the order they were given
+    inside = {key: [fences[i].key for i in sorted(indexes)] for key, indexes in inside.items()}
+    return GeofenceResult(member_keys, [f.key for f in fences], distances, inside)
+
+
+class OccupancyTracker:
+    """
+    Enter/exit state machine for every (member, fence) pair.
+
+    A hard radius cut-off makes GPS jitter at the boundary flap a member in
+    and out.  Instead:
+
+    - a member enters when its fix is within the fence radius;
+    - it only exits once it is further than radius + exit_margin_km, with the
+      fix's reported accuracy added on top (it must be outside even allowing
+      for the error); an exit_margin_km of 0 turns this off, so a member
+      exits as soon as its fix is outside the radius;
+    - fixes less accurate than max_accuracy_km cannot cause a transition;
+    - a transition has to hold for dwell_seconds of consecutive polls before
+      it is committed.
+
+    The first evaluation of a member commits straight away, so a restart
+    doesn't have to wait out the dwell time for members already inside.
+    Only pairs that are inside, or pending a transition, are stored.
+    """
+
+    def __init__(self, exit_margin_km=0.0, dwell_seconds=0, max_accuracy_km=None):
+        self.exit_margin_km = exit_margin_km
+        self.dwell_seconds = dwell_seconds
+        self.max_accuracy_km = max_accuracy_km
+        self._pairs = {}    # member key -> {fence key: [inside, pending_since]}
+        self._seen = set()  # members evaluated at least once
+
+    def configure(self, exit_margin_km=None, dwell_seconds=None, max_accuracy_km=None):
+        if exit_margin_km is not None:
+            self.exit_margin_km = exit_margin_km
+        if dwell_seconds is not None:
+            self.dwell_seconds = dwell_seconds
+        self.max_accuracy_km = max_accuracy_km
+
+    def update(self, members, fences, result, now):
+        """
+        Advance the state machines with one poll's evaluation.
+
+        members is a list of (key, lat, lon, accuracy_km) — accuracy may be
+        None; fences maps fence key -> CompiledFence; result is the
+        GeofenceResult from evaluate().  Returns the committed transitions as
+        (member key, fence key, entered) tuples.
+        """
+        transitions = []
+        for key, lat, lon, accuracy in members:
+            accuracy = accuracy or 0.0
+            reliable = self.max_accuracy_km is None or accuracy <= self.max_accuracy_km
+            first = key not in self._seen
+            self._seen.add(key)
+            pairs = self._pairs.setdefault(key, {})
+            for fence_key in set(result.fences_for(key)) | set(pairs):
+                fence = fences.get(fence_key)
+                if fence is None:
+                    pairs.pop(fence_key, None)
+                    continue
+                state = pairs.get(fence_key) or [False, None]
+                inside = state[0]
+                km = result.distance(key, fence_key)
+                if km is None:
+                    # rejected by the bounding box — only matters if we were inside
+                    km = fence.distance_km(lat, lon) if inside else math.inf
+                if not reliable:
+                    wanted = inside
+                elif inside and self.exit_margin_km > 0:
+                    wanted = km <= fence.radius_km + self.exit_margin_km + accuracy
+                else:
+                    wanted = km <= fence.radius_km
+
+                if wanted == inside:
+                    state[1] = None
+                elif first or self.dwell_seconds <= 0:
+                    state = [wanted, None]
+                    transitions.append((key, fence_key, wanted))
+                elif state[1] is None:
+                    state[1] = now
+                elif now - state[1] >= self.dwell_seconds:
+                    state = [wanted, None]
+                    transitions.append((key, fence_key, wanted))
+
+                if state[0] or state[1] is not None:
+                    pairs[fence_key] = state
+                else:
+                    pairs.pop(fence_key, None)
+        return transitions
+
+    def fences_for(self, member_key, order=None):
+        """Return the fences the member is inside, in the order of order if given."""
+        keys = [k for k, state in self._pairs.get(member_key, {}).items() if state[0]]
+        if order is not None:
+            rank = {k: i for i, k in enumerate(order)}
+            keys.sort(key=lambda k: rank.get(k, len(rank)))
+        return keys
+
+    def members_in(self, fence_key, order=None):
+        """Return the members inside the fence, in the order of order if given."""
+        keys = [m for m, pairs in self._pairs.items()
+                if fence_key in pairs and pairs[fence_key][0]]
+        if order is not None:
+            rank = {k: i for i, k in enumerate(order)}
+            keys.sort(key=lambda k: rank.get(k, len(rank)))
+        return keys
+
+    def forget_member(self, member_key):
+        self._pairs.pop(member_key, None)
+        self._seen.discard(member_key)
+
+    def forget_fence(self, fence_key):
+        for pairs in self._pairs.values():
+            pairs.pop(fence_key, None)
+
@@ -5,6 +5,8 @@ inverse geodesic problems are solved by
 
   * :meth:`~geographiclib.geodesic.Geodesic.Inverse` Solve the inverse
     geodesic problem
+  * :meth:`~geographiclib.geodesic.Geodesic.InverseMany` Solve many
+    inverse geodesic problems in one call
   * :meth:`~geographiclib.geodesic.Geodesic.Direct` Solve the direct
     geodesic problem
   * :meth:`~geographiclib.geodesic.Geodesic.ArcDirect` Solve the direct
@@ -697,9 +699,28 @@ class Geodesic:
     return (lam12, salp2, calp2, sig12, ssig1, csig1, ssig2, csig2, eps,
             domg12, dlam12)
 
+  @staticmethod
+  def _Scratch():
+    """Private: return scratch areas C1a, C2a, C3a, C4a for _GenInverse"""
+    # index zero elements of C1a, C2a, C3a are unused.  Every element read by
+    # _GenInverse is written earlier in the same call, so these can be
+    # reused across calls.
+    return (list(range(Geodesic.nC1_ + 1)), list(range(Geodesic.nC2_ + 1)),
+            list(range(Geodesic.nC3_)), list(range(Geodesic.nC4_)))
+
+  def _SinCosBeta(self, lat):
+    """Private: return sine and cosine of the reduced latitude"""
+    sbet, cbet = Math.sincosd(lat); sbet *= self._f1
+    # Ensure cbet = +epsilon at poles
+    sbet, cbet = Math.norm(sbet, cbet); cbet = max(Geodesic.tiny_, cbet)
+    return sbet, cbet
+
   # return a12, s12, salp1, calp1, salp2, calp2, m12, M12, M21, S12
-  def _GenInverse(self, lat1, lon1, lat2, lon2, outmask):
+  def _GenInverse(self, lat1, lon1, lat2, lon2, outmask,
+                  scratch = None, betas = None):
     """Private: General version of the inverse problem"""
+    # scratch is an optional result of _Scratch() to reuse; betas optionally
+    # maps (canonical) latitudes to precomputed _SinCosBeta values.
     a12 = s12 = m12 = M12 = M21 = S12 = math.nan # return vals
 
     outmask &= Geodesic.OUT_MASK
@@ -742,13 +763,10 @@ class Geodesic:
 
     # real phi, sbet1, cbet1, sbet2, cbet2, s12x, m12x
 
-    sbet1, cbet1 = Math.sincosd(lat1); sbet1 *= self._f1
-    # Ensure cbet1 = +epsilon at poles
-    sbet1, cbet1 = Math.norm(sbet1, cbet1); cbet1 = max(Geodesic.tiny_, cbet1)
-
-    sbet2, cbet2 = Math.sincosd(lat2); sbet2 *= self._f1
-    # Ensure cbet2 = +epsilon at poles
-    sbet2, cbet2 = Math.norm(sbet2, cbet2); cbet2 = max(Geodesic.tiny_, cbet2)
+    beta = betas.get(lat1) if betas else None
+    sbet1, cbet1 = beta if beta else self._SinCosBeta(lat1)
+    beta = betas.get(lat2) if betas else None
+    sbet2, cbet2 = beta if beta else self._SinCosBeta(lat2)
 
     # If cbet1 < -sbet1, then cbet2 - cbet1 is a sensitive measure of the
     # |bet1| - |bet2|.  Alternatively (cbet1 >= -sbet1), abs(sbet2) + sbet1 is
@@ -769,10 +787,7 @@ class Geodesic:
     dn2 = math.sqrt(1 + self._ep2 * Math.sq(sbet2))
 
     # real a12, sig12, calp1, salp1, calp2, salp2
-    # index zero elements of these arrays are unused
-    C1a = list(range(Geodesic.nC1_ + 1))
-    C2a = list(range(Geodesic.nC2_ + 1))
-    C3a = list(range(Geodesic.nC3_))
+    C1a, C2a, C3a, C4a = scratch if scratch else Geodesic._Scratch()
 
     meridian = lat1 == -90 or slam12 == 0
 
@@ -958,7 +973,6 @@ class Geodesic:
         A4 = Math.sq(self.a) * calp0 * salp0 * self._e2
         ssig1, csig1 = Math.norm(ssig1, csig1)
         ssig2, csig2 = Math.norm(ssig2, csig2)
-        C4a = list(range(Geodesic.nC4_))
         self._C4f(eps, C4a)
         B41 = Geodesic._SinCosSeries(False, ssig1, csig1, C4a)
         B42 = Geodesic._SinCosSeries(False, ssig2, csig2, C4a)
@@ -1051,6 +1065,79 @@ class Geodesic:
     if outmask & Geodesic.AREA: result['S12'] = S12
     return result
 
+  def InverseMany(self, lat1s, lon1s, lat2s, lon2s,
+                  outmask = GeodesicCapability.DISTANCE):
+    """Solve many inverse geodesic problems in one call
+
+    :param lat1s: latitudes of the first points in degrees
+    :param lon1s: longitudes of the first points in degrees
+    :param lat2s: latitudes of the second points in degrees
+    :param lon2s: longitudes of the second points in degrees
+    :param outmask: the :ref:`output mask <outmask>`
+    :return: a :ref:`dict` of lists (or NumPy arrays)
+
+    Each argument is a sequence (list, tuple or NumPy array) or a single
+    number; a number is used for every pair, so one origin can be
+    measured against many points.  The sequences must all have the same
+    length.  The result is keyed like the one from
+    :meth:`~geographiclib.geodesic.Geodesic.Inverse` (*a12* plus the
+    entries selected by *outmask*, default DISTANCE) but each entry holds
+    one value per pair, identical to what Inverse returns for that pair.
+    The *lat1*, *lon1*, *lat2*, *lon2* echoes are omitted.  If any
+    argument is a NumPy array, the entries are NumPy arrays.
+
+    The coefficient scratch areas are allocated once for the whole batch
+    and the reduced latitude of a single-number origin is computed once.
+
+    """
+
+    args = [lat1s, lon1s, lat2s, lon2s]
+    usenumpy = False
+    n = None
+    for i, x in enumerate(args):
+      if hasattr(x, 'tolist'):  # NumPy arrays become lists of floats
+        x = x.tolist()
+        usenumpy = usenumpy or isinstance(x, list)
+      if isinstance(x, (int, float)):
+        args[i] = x
+        continue
+      x = list(x)
+      if n is not None and len(x) != n:
+        raise ValueError("InverseMany sequences differ in length")
+      n = len(x); args[i] = x
+    if n is None: n = 1
+    betas = {}
+    for i in (0, 2):
+      if not isinstance(args[i], list):
+        # the canonical form of the latitude is +/- this
+        lat = Math.AngRound(Math.LatFix(args[i]))
+        if lat != 0 and not math.isnan(lat):
+          betas[lat] = self._SinCosBeta(lat)
+          betas[-lat] = self._SinCosBeta(-lat)
+        args[i] = [args[i]] * n
+    for i in (1, 3):
+      if not isinstance(args[i], list): args[i] = [args[i]] * n
+
+    scratch = Geodesic._Scratch()
+    rows = [self._GenInverse(lat1, lon1, lat2, lon2, outmask, scratch, betas)
+            for lat1, lon1, lat2, lon2 in zip(*args)]
+    (a12, s12, salp1, calp1, salp2, calp2,
+     m12, M12, M21, S12) = zip(*rows) if rows else ((),) * 10
+    outmask &= Geodesic.OUT_MASK
+    result = {'a12': list(a12)}
+    if outmask & Geodesic.DISTANCE: result['s12'] = list(s12)
+    if outmask & Geodesic.AZIMUTH:
+      result['azi1'] = [Math.atan2d(s, c) for s, c in zip(salp1, calp1)]
+      result['azi2'] = [Math.atan2d(s, c) for s, c in zip(salp2, calp2)]
+    if outmask & Geodesic.REDUCEDLENGTH: result['m12'] = list(m12)
+    if outmask & Geodesic.GEODESICSCALE:
+      result['M12'] = list(M12); result['M21'] = list(M21)
+    if outmask & Geodesic.AREA: result['S12'] = list(S12)
+    if usenumpy:
+      import numpy
+      result = {k: numpy.array(v, dtype=float) for k, v in result.items()}
+    return result
+
   # return a12, lat2, lon2, azi2, s12, m12, M12, M21, S12
   def _GenDirect(self, lat1, lon1, azi1, arcmode, s12_a12, outmask):
     """Private: General version of direct problem"""
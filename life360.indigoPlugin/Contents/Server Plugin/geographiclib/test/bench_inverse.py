@@ -0,0 +1,60 @@
+"""Inverse benchmark
+
+Reports Geodesic inverse calls per second with scratch areas allocated
+afresh on every call (what Inverse does), with one set of scratch areas
+passed down to every call, and with InverseMany (which does the latter)
+for the same pairs.  Run from the directory containing geographiclib with
+
+    python -m geographiclib.test.bench_inverse
+
+"""
+
+import random
+import time
+
+from geographiclib.geodesic import Geodesic
+
+def pairs(count, seed = 15):
+  """Return count random (lat1, lon1, lat2, lon2) tuples"""
+  r = random.Random(seed)
+  return [(r.uniform(-90, 90), r.uniform(-180, 180),
+           r.uniform(-90, 90), r.uniform(-180, 180)) for _ in range(count)]
+
+def rates(fns, points, rounds):
+  """Return the best calls per second of each fn over points"""
+  # the variants take turns within each round so that load on the machine
+  # affects them alike
+  best = [0.0] * len(fns)
+  for _ in range(rounds):
+    for i, fn in enumerate(fns):
+      start = time.perf_counter()
+      fn(points)
+      best[i] = max(best[i], len(points) / (time.perf_counter() - start))
+  return best
+
+def allocating(points, geod = Geodesic.WGS84):
+  """Solve each pair with freshly allocated scratch areas"""
+  for lat1, lon1, lat2, lon2 in points:
+    geod._GenInverse(lat1, lon1, lat2, lon2, Geodesic.DISTANCE,
+                     Geodesic._Scratch())
+
+def reusing(points, geod = Geodesic.WGS84):
+  """Solve each pair with one set of scratch areas passed down"""
+  scratch = Geodesic._Scratch()
+  for lat1, lon1, lat2, lon2 in points:
+    geod._GenInverse(lat1, lon1, lat2, lon2, Geodesic.DISTANCE, scratch)
+
+def batch(points, geod = Geodesic.WGS84):
+  """Solve all the pairs with one InverseMany call"""
+  geod.InverseMany(*zip(*points))
+
+def main(count = 1000, rounds = 30):
+  """Print calls per second for each variant"""
+  before, *others = rates([allocating, reusing, batch], pairs(count), rounds)
+  print("allocating scratch: {:10.0f} calls/s".format(before))
+  for name, after in zip(("reused scratch", "InverseMany"), others):
+    print("{:18s}: {:10.0f} calls/s ({:+.1f}%)".format(
+      name, after, 100 * (after / before - 1)))
+
+if __name__ == '__main__':
+  main()
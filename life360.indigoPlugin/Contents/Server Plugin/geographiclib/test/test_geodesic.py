@@ -107,6 +107,30 @@ class GeodesicTest(unittest.TestCase):
       self.assertAlmostEqual(M21, inv["M21"], delta = 1e-15)
       self.assertAlmostEqual(S12, inv["S12"], delta = 0.1)
 
+  def test_inversemany(self):
+    """Check InverseMany matches Inverse pair by pair"""
+    cases = GeodesicTest.testcases
+    lat1s = [l[0] for l in cases]; lon1s = [l[1] for l in cases]
+    lat2s = [l[3] for l in cases]; lon2s = [l[4] for l in cases]
+    keys = ["a12", "s12", "azi1", "azi2", "m12", "M12", "M21", "S12"]
+    many = Geodesic.WGS84.InverseMany(lat1s, lon1s, lat2s, lon2s,
+                                      Geodesic.ALL)
+    for i in range(len(cases)):
+      inv = Geodesic.WGS84.Inverse(lat1s[i], lon1s[i], lat2s[i], lon2s[i],
+                                   Geodesic.ALL)
+      for k in keys:
+        self.assertEqual(inv[k], many[k][i])
+    # A single-number origin is used for every pair
+    many = Geodesic.WGS84.InverseMany(lat1s[0], lon1s[0], lat2s, lon2s)
+    self.assertEqual(sorted(many), ["a12", "s12"])
+    for i in range(len(cases)):
+      inv = Geodesic.WGS84.Inverse(lat1s[0], lon1s[0], lat2s[i], lon2s[i])
+      self.assertEqual(inv["s12"], many["s12"][i])
+    self.assertEqual(Geodesic.WGS84.InverseMany([], [], [], []),
+                     {"a12": [], "s12": []})
+    with self.assertRaises(ValueError):
+      Geodesic.WGS84.InverseMany(lat1s, lon1s, lat2s[1:], lon2s)
+
   def test_direct(self):
     """Helper function for testing direct calculation"""
     for l in GeodesicTest.testcases:
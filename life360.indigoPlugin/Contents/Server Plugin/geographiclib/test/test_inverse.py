@@ -0,0 +1,303 @@
+"""Inverse scratch reuse tests"""
+
+import unittest
+import math
+
+from geographiclib.geodesic import Geodesic
+
+class InverseScratchTest(unittest.TestCase):
+  """Check that reusing the scratch areas leaves results bit-identical"""
+
+  # [lat1, lon1, lat2, lon2, _GenInverse(..., ALL) as hex floats]
+  wgs84 = [
+    [35.60777, -139.44815, -11.17491, -69.95921,
+     '0x1.420778e6f70f7p+6 0x1.10ae991ef7797p+23 0x1.ddad1dccf6b90p-1 -0x1.709da93038d29p-2 0x1.8c4453fdf1c7dp-1 '
+     '-0x1.443780be0c4b6p-1 0x1.7ee248d2768e9p+22 0x1.5418ef53142a3p-3 0x1.517e085bde8e0p-3 0x1.75bbc58a980dep+43'],
+    [-41.32, 174.81, 40.96, -5.5,
+     '0x1.673d4a3a285bap+7 0x1.308f7f44714cdp+24 0x1.4c3cf01a253d7p-2 -0x1.e44d52dd057a3p-1 0x1.4a6d22884c7adp-2 '
+     '0x1.e49ca013527b3p-1 0x1.2a9a0da2d67a8p+16 -0x1.fd7112b1becf8p-1 -0x1.014046fe0a868p+0 -0x1.6e5cbd38fac1fp+46'],
+    [0.0, 0.0, 0.0, 179.5,
+     '0x1.6800000000000p+7 0x1.30e23de8ad140p+24 0x1.a84cbbd282dc1p-1 0x1.1e8e101cf9fddp-1 0x1.a84cbbd282dc1p-1 '
+     '-0x1.1e8e101cf9fddp-1 0x1.491afc51acf7ep+14 -0x1.0000000000000p+0 -0x1.0000000000000p+0 0x1.5d9fef07530adp+45'],
+    [0.0, 0.0, 0.5, 179.7,
+     '0x1.66f727c5568d0p+7 0x1.3052bf6bb64d5p+24 0x1.12a1b1019c3b6p-2 0x1.ed3e222f21daep-1 0x1.12a459c3537f2p-2 '
+     '-0x1.ed3dc36c42c13p-1 0x1.d38f01877fd2bp+16 -0x1.fffaa88aa060fp-1 -0x1.ffef0f3ba90afp-1 0x1.7f5f400dcf12ap+46'],
+    [-30.0, 0.0, 30.0, 179.9,
+     '0x1.6800000000000p+7 0x1.3138c06be80a7p+24 0x1.87d6fd336ef65p-3 -0x1.f68a988052ab6p-1 0x1.87d6fd336ef65p-3 '
+     '0x1.f68a988052ab6p-1 0x1.7b93e7f9b91a4p+15 -0x1.fdb52f9326943p-1 -0x1.012568366cb5fp+0 -0x1.96dc4c3277756p+46'],
+    [20.001, 0.0, 20.001, 0.0,
+     '0x0.0p+0 0x0.0p+0 0x0.0p+0 -0x1.0000000000000p+0 0x0.0p+0 '
+     '-0x1.0000000000000p+0 0x0.0p+0 0x1.fffffffffffffp-1 0x1.fffffffffffffp-1 0x0.0p+0'],
+    [90.0, 0.0, -90.0, 0.0,
+     '0x1.6800000000000p+7 0x1.313c5b75687a3p+24 0x0.0p+0 -0x1.0000000000000p+0 0x0.0p+0 '
+     '-0x1.0000000000000p+0 0x1.854a63fffffffp-488 -0x1.0000000000000p+0 -0x1.0000000000000p+0 0x0.0p+0'],
+    [-90.0, 10.0, 45.0, 30.0,
+     '0x1.0dcebd47ef906p+7 0x1.c95d3c36eec6bp+23 0x1.5e3a8748a0bf5p-2 0x1.e11f642522d1cp-1 0x0.0p+0 '
+     '0x1.0000000000000p+0 0x1.13bb5b83f0f96p+22 -0x1.6691bd501d2b8p-1 -0x1.6a09e667f3bccp-1 -0x1.9c5b790fedf95p+43'],
+    [10.0, 20.0, 70.0, 20.0,
+     '0x1.dfc4777a22a91p+5 0x1.96af57940132ep+22 0x0.0p+0 0x1.0000000000000p+0 0x0.0p+0 '
+     '0x1.0000000000000p+0 0x1.50935459d4408p+22 0x1.005f44f511d6dp-1 0x1.01688714b48a5p-1 0x0.0p+0'],
+    [40.0, -74.0, 40.0001, -74.0001,
+     '0x1.08685cd396939p-13 0x1.c03ccf3d2c7ebp+3 -0x1.3821af4ac8aeap-1 0x1.95dac097393b9p-1 -0x1.3821cd21c3a55p-1 '
+     '0x1.95daa9a449446p-1 0x1.c03ccf3d25176p+3 0x1.fffffffffab0dp-1 0x1.fffffffffab0dp-1 -0x1.5a80fbd4b9f2fp+25'],
+    [51.5, -0.12, 48.85, 2.35,
+     '0x1.8b822b332a5adp+1 0x1.4f71342f857abp+18 0x1.0e4079d2a6e20p-1 -0x1.b2dd8c1c1c280p-1 0x1.ff685ba39e6d4p-2 '
+     '-0x1.bb936c5ab56d9p-1 0x1.4f47bfd75e68ap+18 0x1.ff4237612a6f8p-1 0x1.ff422d79e1342p-1 0x1.386ba87e1d916p+40'],
+    [-33.87, 151.21, 35.68, 139.69,
+     '0x1.18d315393906fp+6 0x1.db977c9d1556ep+22 -0x1.62850f950a0a2p-3 0x1.f8453f3d256a0p-1 -0x1.6a58e64a6996fp-3 '
+     '0x1.f7ec323e46beep-1 0x1.6d378fc18a351p+22 0x1.5b2ae83457518p-2 0x1.5b43fa0f5b577p-2 -0x1.249ac0aefe3bfp+37'],
+    [83.74358547938212, -175.8043102348292, 42.478491563437586, -123.11541908469067,
+     '0x1.603d3205e1b99p+5 0x1.2aef895eab3fdp+22 0x1.b0dc7a549c6cbp-1 -0x1.11735051e8463p-1 0x1.004c481ec4dafp-3 '
+     '-0x1.fbf9907ab8fbbp-1 0x1.0e84f4d6f9e46p+22 0x1.7101ceb7a910cp-1 0x1.70a78f108daf0p-1 0x1.045e49eb6da09p+45'],
+    [87.5411012993082, -173.92296448512855, 68.3084282642408, 65.28623918450924,
+     '0x1.71d088e029074p+4 0x1.3a09671526dbbp+21 -0x1.9f5082e6bd284p-1 0x1.2b6de281c7c46p-1 -0x1.81d68d24a5618p-4 '
+     '-0x1.fdb92d3eeaa3ep-1 0x1.31a4772d43966p+21 0x1.d72c645973029p-1 0x1.d726030501358p-1 -0x1.36407739403b5p+46'],
+    [64.32162884667446, 179.933844299803, -46.851267210518046, -58.29200738758804,
+     '0x1.20ee020ac833cp+7 0x1.e9acc97985852p+23 0x1.ffeb3ab200a80p-1 0x1.23aaf81ecb9ddp-6 0x1.44a8e32622c76p-1 '
+     '-0x1.8be7741faf270p-1 0x1.c4410af7be9f9p+21 -0x1.9e925c4486d69p-1 -0x1.a10df62418262p-1 0x1.0a0191dc793eep+45'],
+    [37.474979937322985, -78.99059309647059, -42.60343371345707, -97.70049887439016,
+     '0x1.46c929572fba3p+6 0x1.14bf5946ffd01p+23 -0x1.eabdee0dbefd5p-3 -0x1.f11571e250f97p-1 -0x1.087b5589570a5p-2 '
+     '-0x1.eea0a2c8ac576p-1 0x1.8023fab5ebbdcp+22 0x1.28d245163fc20p-3 0x1.299b19818bb40p-3 0x1.6b44eebbf9e06p+39'],
+    [64.41067753095945, 134.83173793450345, 53.57087862794654, -99.57916535414866,
+     '0x1.b7a8e04f4740bp+5 0x1.75394710ac497p+22 0x1.2e7873a4ea69ep-1 0x1.9d1ad52053162p-1 0x1.b83f2220c55d0p-2 '
+     '-0x1.ce440fb45fb48p-1 0x1.3ee32084e1465p+22 0x1.2738c3fafc311p-1 0x1.270d42d9f89b9p-1 0x1.30cdb93987ce0p+46'],
+    [76.47089042359735, 4.093180830539893, -48.350543648847065, -16.00674791154441,
+     '0x1.f56606706a8cbp+6 0x1.a8e377a059fd8p+23 -0x1.1fa55e14504f1p-2 -0x1.eb627d6fc47fdp-1 -0x1.958cfd4389e8bp-4 '
+     '-0x1.fd7bf3854fd8cp-1 0x1.3d16d50454b8cp+22 -0x1.261cfd132cb66p-1 -0x1.2849299232694p-1 -0x1.b61c80bbd7be3p+42'],
+    [-14.422441064329092, -151.57465572656344, 11.64448562135577, -50.41279853769481,
+     '0x1.9f5275e934c4ep+6 0x1.5f9304c340899p+23 0x1.fa253cd2e8275p-1 0x1.34d2fe791ebbbp-3 0x1.f487f63c1be18p-1 '
+     '0x1.af0c23298979ap-3 0x1.78c540fd39392p+22 -0x1.e92ddc055dd24p-3 -0x1.e97c9161f1489p-3 -0x1.1d8cc6f32e7a4p+41'],
+    [12.530827646910538, 154.87825252003427, 26.202825018062313, -34.163846673965764,
+     '0x1.18d4b2d144678p+7 0x1.dc604dcfd5bc4p+23 0x1.c07f17395f2aap-3 0x1.f3926e9ce1a30p-1 0x1.e7b7277969483p-3 '
+     '-0x1.f145181e7e761p-1 0x1.f55bb3d18dd57p+21 -0x1.8991c174b6e86p-1 -0x1.8866cf58ad79ep-1 0x1.8b895f946a707p+46'],
+    [65.4433180818896, 178.2622479178163, -1.7538254510017026, 160.20893143097413,
+     '0x1.1191d25ba85e0p+6 0x1.cfa39accd39bdp+22 -0x1.55bfa81216259p-2 -0x1.e2a50ef14bf32p-1 -0x1.1cfab59e06b96p-3 '
+     '-0x1.fb04d7322a6acp-1 0x1.694e26c244ee3p+22 0x1.7ba265d7c3477p-2 0x1.7909cec192532p-2 -0x1.d938134869accp+42'],
+    [-86.6249908862419, -129.48547607498247, -59.00498859190415, 157.7033242776293,
+     '0x1.e3c5ee3b13007p+4 0x1.9abc570d76d51p+21 -0x1.f57594fdbe975p-1 0x1.9d6d0de8712aap-3 -0x1.cb0585750c9c3p-4 '
+     '0x1.fcc6597aa2cfcp-1 0x1.880cb928a3668p+21 0x1.bacceeb64b343p-1 0x1.bab7cea04956dp-1 0x1.72aaed8c9948ep+45'],
+    [34.28729185415092, 78.86964266193837, -38.40891454072731, -1.8053730233886256,
+     '0x1.a0f05f216e104p+6 0x1.6113adf8ed748p+23 -0x1.993c8690e24b6p-1 -0x1.33af25798330fp-1 -0x1.af66201c752ebp-1 '
+     '-0x1.13c06b4a38fb3p-1 0x1.78495dffce6f8p+22 -0x1.f67b5fe4f7711p-3 -0x1.f57b31b6fc24ap-3 0x1.65c70f5dc1e13p+41'],
+    [69.67165167630202, -144.04476850435242, -69.08008075380917, -162.93018023303293,
+     '0x1.166c9d949e276p+7 0x1.d7ec821a9a56bp+23 -0x1.6bec99e5cc44ap-3 -0x1.f7da0347e6b85p-1 -0x1.621562c554023p-3 '
+     '-0x1.f84a26a01d819p-1 0x1.fbd7cbfa261d0p+21 -0x1.82a238d5d87d8p-1 -0x1.82afac0e9c9f4p-1 -0x1.70c9d44fbff27p+37'],
+    [-5.640913914144704, 122.57359096215322, 9.89828641152286, -35.474644510833485,
+     '0x1.3cb18dfc525a8p+7 0x1.0c17d122feb15p+24 -0x1.f39ce382a7b1bp-1 0x1.bfc4928879875p-3 -0x1.f8ac345e35085p-1 '
+     '-0x1.593de3f88df72p-3 0x1.1ea3ced48c3f2p+21 -0x1.dbf620f30a599p-1 -0x1.dbacaa43717bfp-1 -0x1.ca82d5f539cd2p+43'],
+    [0.3701800244028135, -115.48387292229029, 80.66393248746414, -52.63149329877206,
+     '0x1.55874c5b94da6p+6 0x1.218adebc88a15p+23 0x1.29ae311785c8dp-3 0x1.fa90053c7f0b5p-1 0x1.c93d3b3805ad3p-1 '
+     '0x1.ccc418e697e1ep-2 0x1.83dbce3547239p+22 0x1.49d89fdb612bcp-4 0x1.5cbeb1a869e8bp-4 0x1.1acf0097b04aap+45'],
+    [-47.6532112373348, -67.95612797710015, 58.48788852026982, -65.42367682396613,
+     '0x1.a7ebac76fd366p+6 0x1.671fdc2a9f43ap+23 0x1.8b745e2212bbcp-6 0x1.ffd9d08e82379p-1 0x1.fd57e9454e909p-6 '
+     '0x1.ffc0a5a95d7f0p-1 0x1.7564f0c1da936p+22 -0x1.19194eaa44964p-2 -0x1.17bb7b5e82fe3p-2 0x1.0674dfe7070edp+38'],
+    [72.86517236961703, -58.976122489095786, -10.521269584229344, -153.28765576627998,
+     '0x1.9544594597eafp+6 0x1.578325021d92bp+23 -0x1.ffe8bcb38cb16p-1 0x1.34ab2b444eef6p-6 -0x1.33b458df241e2p-2 '
+     '-0x1.e85664aaca522p-1 0x1.7d9f4a2cd1119p+22 -0x1.86f8ff4ed316ap-3 -0x1.930cd88b1fb4fp-3 -0x1.7af611dc3463bp+45'],
+    [73.34482156324273, 106.61452604890678, -4.599575209714928, -138.45579383149052,
+     '0x1.959f3dcc4f989p+6 0x1.57e310bd533d3p+23 0x1.d7c9ada27995ep-1 0x1.8dcb95e2ac069p-2 0x1.1025042e32ed0p-2 '
+     '-0x1.ed9653208de08p-1 0x1.7dc2d3cdc27dbp+22 -0x1.891864a32d5ebp-3 -0x1.959f6ea36dfcbp-3 0x1.f5e9839302729p+45'],
+    [-1.3530545669670175, -44.58661254090393, 61.200487813388264, 154.0739338725038,
+     '0x1.da49fad983bfbp+6 0x1.923d3325c5b1cp+23 -0x1.6715d61e604c7p-3 0x1.f8118ce4fad59p-1 -0x1.73a113d2ea857p-2 '
+     '-0x1.dd17980cbfaaap-1 0x1.570a7de1afe68p+22 -0x1.e9e3f2a181fd8p-2 -0x1.e26f480cd020cp-2 -0x1.7ede51f520ab1p+46'],
+    [43.399111603360865, -76.60362643662253, -82.55180939196323, 141.81840078076692,
+     '0x1.15ea6ef70db79p+7 0x1.d723ae98bc7edp+23 -0x1.f7ba22089b773p-4 -0x1.fc1d0c4c935e9p-1 -0x1.6052b115b3d6bp-1 '
+     '0x1.73801577b12ecp-1 0x1.ffa500f8e7c5ep+21 -0x1.82fe2e9152cd9p-1 -0x1.7f145db96bf9ep-1 0x1.4d956fd6ad837p+46'],
+    [80.00990901820396, -122.98503714648331, -0.013245331474578848, -6.850523098582073,
+     '0x1.79ab97c05f0f8p+6 0x1.403aa68ba6a6ep+23 0x1.ccd4037f96be5p-1 0x1.be3c20806cd96p-2 0x1.40d131acfcaafp-3 '
+     '-0x1.f9add4484c23cp-1 0x1.84435fb653603p+22 -0x1.247a5858ecb1ap-4 -0x1.3b7f4081ef61ap-4 0x1.133229739ef3ap+46'],
+    [85.75717381924343, -164.50241491115554, -78.89282431152888, 123.74945841297625,
+     '0x1.4dc9e9a4c6ca0p+7 0x1.1af9400202a32p+24 -0x1.9e8773fc6a469p-1 -0x1.2c83fd12617f2p-1 -0x1.3e6d3e3ea5790p-2 '
+     '-0x1.e69db057ea59bp-1 0x1.60f4ce34e1986p+20 -0x1.f1c410bf1b48ep-1 -0x1.f2854ca0c6b2dp-1 -0x1.7280ecc71f7a8p+44'],
+    [12.524570918467475, -13.576000307207636, 49.99480661688571, 33.602568221708765,
+     '0x1.ad9d5a7dfd8a4p+5 0x1.6c0641f735863p+22 0x1.2ca2e6b1299ffp-1 0x1.9e7109325b609p-1 0x1.c7b3bbfdb4742p-1 '
+     '0x1.d2d13d50ae40cp-2 0x1.391e4fcef461ap+22 0x1.2f3b79329c8bfp-1 0x1.2fc2b368b85c9p-1 0x1.14c7c2a8f19a1p+44'],
+    [34.63693372729739, -87.97498670091241, -74.71254505258331, -176.786930707787,
+     '0x1.eb7dd3d59754dp+6 0x1.a0842fca64be5p+23 -0x1.42697535549f1p-2 -0x1.e5f5a1b6ae7a9p-1 -0x1.f6067c51e0dcbp-1 '
+     '-0x1.9248e51bd7d45p-3 0x1.46c4d866c982fp+22 -0x1.166ef9c194702p-1 -0x1.1332f87f91d6cp-1 0x1.36aa9a1e17f1ep+45'],
+    [-30.04101085910692, 53.46002474951433, -21.638003155199897, -54.96193334350659,
+     '0x1.790786550eb5bp+6 0x1.3f7d5f54cb348p+23 -0x1.c458c57060496p-1 -0x1.dfb17996b6286p-2 -0x1.a56df6930d1d2p-1 '
+     '0x1.22c2748d0eb26p-1 0x1.83ea2c4836d74p+22 -0x1.274ffacd4f528p-4 -0x1.2a054b2014760p-4 0x1.4166b245a3595p+45'],
+    [21.339854659990692, 73.8723178866448, 17.181791664764148, -67.77421684974787,
+     '0x1.f9d7d640ef16cp+6 0x1.acb25d9b80a09p+23 -0x1.7716ec5013249p-1 0x1.5c7fd8edf8ac7p-1 -0x1.6dbf8582f021bp-1 '
+     '-0x1.664a7289e8237p-1 0x1.39d3640e2e6c7p+22 -0x1.2f06c188e53fap-1 -0x1.2f48d48d147bcp-1 -0x1.c0d6ae003cfd7p+45'],
+    [57.91364554733255, 108.2534339663489, 70.82956803185746, 141.32853372872506,
+     '0x1.2e3c270bbfff7p+4 0x1.0087f72784959p+21 0x1.1c6887cd92839p-1 0x1.a9bdd93675335p-1 0x1.cbcc5618da3a1p-1 '
+     '0x1.c276fab2198fcp-2 0x1.f7de6d8234d34p+20 0x1.e4907e2d5a666p-1 0x1.e49603e5809e4p-1 0x1.36a9dd9b425cep+44'],
+    [-87.2931738134603, 60.89923090684988, -27.34461582480479, -40.15977436940091,
+     '0x1.fa4b782d99c56p+5 0x1.ad8bdda61efe1p+22 -0x1.f402e8ff3890ep-1 -0x1.b897c910fb50fp-3 -0x1.aa7749793f476p-5 '
+     '0x1.ff4e44d8e38b7p-1 0x1.5bc05f96625d8p+22 0x1.cfb3d61e052c8p-2 0x1.cd9494f6c4b3cp-2 0x1.00402ee38e7f6p+46'],
+    [3.255980465616531, -128.20120028882621, -45.10208957029409, 175.05331862365017,
+     '0x1.17245748d0211p+6 0x1.d8dd2c5c17d78p+22 -0x1.43225502b514fp-1 -0x1.8d2678effdf9dp-1 -0x1.c84b7114e07d9p-1 '
+     '-0x1.d07eff1407489p-2 0x1.6c6e8062d7312p+22 0x1.61c35c15ed1e6p-2 0x1.6364482708f7bp-2 0x1.eb15a0aebb010p+43']]
+
+  prolate = [
+    [35.60777, -139.44815, -11.17491, -69.95921,
+     '0x1.40dc567e93a78p+6 0x1.1310a103f9174p+23 0x1.dc0154d2d5741p-1 -0x1.7929d19e32c75p-2 0x1.89b07993d8e01p-1 '
+     '-0x1.475783f8d67aep-1 0x1.8316141bd0e8ep+22 0x1.576cddcdb2831p-3 0x1.5c94e7bb63d3dp-3 0x1.7d8856d3302bdp+43'],
+    [-41.32, 174.81, 40.96, -5.5,
+     '0x1.6625aaa3cfe07p+7 0x1.32b96dc06757bp+24 0x1.d8fcbca15e70ep-1 -0x1.880e713fddc52p-2 0x1.d660f20426b1fp-1 '
+     '0x1.946a4167a9060p-2 0x1.691fce4fe12edp+16 -0x1.0104b39c314fep+0 -0x1.fdeb3152e531ep-1 -0x1.e0732d5d95c76p+44'],
+    [0.0, 0.0, 0.0, 179.5,
+     '0x1.649f5d3eba7d8p+7 0x1.31f1a67268c00p+24 0x1.0000000000000p+0 -0x0.0p+0 0x1.0000000000000p+0 '
+     '-0x0.0p+0 0x1.72d42a3acf26ap+17 -0x1.ffc7124e3edcfp-1 -0x1.ffc7124e3edcfp-1 0x0.0p+0'],
+    [0.0, 0.0, 0.5, 179.7,
+     '0x1.64fbb6ae99a4dp+7 0x1.3223ce9cbfbe8p+24 0x1.e2a5995741165p-1 0x1.55bc9a3a168ecp-2 0x1.e2aa5de6ad537p-1 '
+     '-0x1.55a1a9ab9ccd2p-2 0x1.2e2a07c681af8p+17 -0x1.ffd29508bb890p-1 -0x1.ffda8e049081ep-1 0x1.9ab3ed865b687p+44'],
+    [-30.0, 0.0, 30.0, 179.9,
+     '0x1.660ac8e245a91p+7 0x1.32e836398067dp+24 0x1.fffe626250e0ep-1 0x1.45665974a0c50p-8 0x1.fffe626250e0ep-1 '
+     '0x1.45665974a0c50p-8 0x1.ad42ae7f011adp+16 -0x1.fff2af71dc844p-1 -0x1.fff2af71dc844p-1 0x0.0p+0'],
+    [20.001, 0.0, 20.001, 0.0,
+     '0x0.0p+0 0x0.0p+0 0x0.0p+0 -0x1.0000000000000p+0 0x0.0p+0 '
+     '-0x1.0000000000000p+0 0x0.0p+0 0x1.0000000000000p+0 0x1.0000000000000p+0 0x0.0p+0'],
+    [90.0, 0.0, -90.0, 0.0,
+     '0x1.6800000000000p+7 0x1.33d1d54a910c7p+24 0x0.0p+0 -0x1.0000000000000p+0 0x0.0p+0 '
+     '-0x1.0000000000000p+0 0x1.869ffffffffffp-488 -0x1.0000000000000p+0 -0x1.0000000000000p+0 0x0.0p+0'],
+    [-90.0, 10.0, 45.0, 30.0,
+     '0x1.0e6175a6834a1p+7 0x1.ceb4bf8156e7cp+23 0x1.5e3a8748a0bf5p-2 0x1.e11f642522d1cp-1 0x0.0p+0 '
+     '0x1.0000000000000p+0 0x1.134b5eb7b5c59p+22 -0x1.70ec3ff101034p-1 -0x1.6a09e667f3bccp-1 -0x1.a1f8357a74b13p+43'],
+    [10.0, 20.0, 70.0, 20.0,
+     '0x1.e0743275ed652p+5 0x1.9b01cdfc709fap+22 0x0.0p+0 0x1.0000000000000p+0 0x0.0p+0 '
+     '0x1.0000000000000p+0 0x1.536649fb9a000p+22 0x1.fe887ef71154ep-2 0x1.fa631cba37f55p-2 0x0.0p+0'],
+    [40.0, -74.0, 40.0001, -74.0001,
+     '0x1.07b8518d11207p-13 0x1.c33dde94b7922p+3 -0x1.35d4a8edd6b0ep-1 0x1.979d1c06fdb34p-1 -0x1.35d4c6e5ee45cp-1 '
+     '0x1.979d053f5c575p-1 0x1.c33dde949aa84p+3 0x1.fffffffffaacap-1 0x1.fffffffffaacap-1 -0x1.61f9581eab398p+25'],
+    [51.5, -0.12, 48.85, 2.35,
+     '0x1.89f24eb98d756p+1 0x1.50a369080f9b9p+18 0x1.0caf62b0c838bp-1 -0x1.b3d5cf576c2dbp-1 0x1.fc3630c3535eep-2 '
+     '-0x1.bc7e4398a1846p-1 0x1.5079a531a5756p+18 0x1.ff416aa73cdd4p-1 0x1.ff417e49b756dp-1 0x1.3e66e7aa53336p+40'],
+    [-33.87, 151.21, 35.68, 139.69,
+     '0x1.1ae1fbec141f4p+6 0x1.e4fefc1b875c0p+22 -0x1.5d2aa87d41ad3p-3 0x1.f880fe5fa27cap-1 -0x1.64fb51f84fd44p-3 '
+     '0x1.f8297458f3a21p-1 0x1.72dcf171e5ad4p+22 0x1.5148ace25411cp-2 0x1.511623900f60dp-2 -0x1.2aa5df267e1c0p+37'],
+    [83.74358547938212, -175.8043102348292, 42.478491563437586, -123.11541908469067,
+     '0x1.5e354eddca32ep+5 0x1.2ae3002ac9b75p+22 0x1.b0a4a72d1e3f4p-1 -0x1.11cb9ab34a999p-1 0x1.fd9f40f69b687p-4 '
+     '-0x1.fc05885daddfdp-1 0x1.0e598ef6c8722p+22 0x1.6fedfa71f19e3p-1 0x1.70a05f944e7fcp-1 0x1.0823b999a507fp+45'],
+    [87.5411012993082, -173.92296448512855, 68.3084282642408, 65.28623918450924,
+     '0x1.6e72f58c59c90p+4 0x1.386238c4fee01p+21 -0x1.9f59e6db680c0p-1 0x1.2b60dbbd8c0c5p-1 -0x1.815a919ca6017p-4 '
+     '-0x1.fdbaa467c3adep-1 0x1.3006659a6a9d0p+21 0x1.d71a4e848f896p-1 0x1.d726d495637d4p-1 -0x1.3a8044421b2f0p+46'],
+    [64.32162884667446, 179.933844299803, -46.851267210518046, -58.29200738758804,
+     '0x1.20d33966c376ep+7 0x1.ee7a1e183b2dap+23 0x1.fffbe9a66b43bp-1 0x1.02c6d218832cep-7 0x1.43cb497c242aep-1 '
+     '-0x1.8c9cc5899f39fp-1 0x1.c72f720618b71p+21 -0x1.a47955e83947dp-1 -0x1.9f95e72c1a756p-1 0x1.0c3cccc92da37p+45'],
+    [37.474979937322985, -78.99059309647059, -42.60343371345707, -97.70049887439016,
+     '0x1.48d944e669364p+6 0x1.19d60524e7ba9p+23 -0x1.e3fdfc534215fp-3 -0x1.f17f494ac1e18p-1 -0x1.0512f1e9cab00p-2 '
+     '-0x1.ef1473403a693p-1 0x1.85272e97f9befp+22 0x1.136443eadd35bp-3 0x1.11d0d8d4a3c0ap-3 0x1.72203e7afb9b8p+39'],
+    [64.41067753095945, 134.83173793450345, 53.57087862794654, -99.57916535414866,
+     '0x1.b3f56489e6442p+5 0x1.73e1561a89dfdp+22 0x1.2ec3ae7987d7ap-1 0x1.9ce3b5820d154p-1 0x1.b7f1a8086a4ebp-2 '
+     '-0x1.ce56800bed81fp-1 0x1.3dabd72a26f98p+22 0x1.26eb753993942p-1 0x1.274118ff7f9dap-1 0x1.35581bb42c0bbp+46'],
+    [76.47089042359735, 4.093180830539893, -48.350543648847065, -16.00674791154441,
+     '0x1.f7026b688dadep+6 0x1.ae91cd86f3680p+23 -0x1.1e5b0d36ad0a5p-2 -0x1.eb92b656e843ap-1 -0x1.922cae92c1c78p-4 '
+     '-0x1.fd86a7eac0c5ap-1 0x1.3ddcb5283154ap+22 -0x1.2f5abfc4f9cefp-1 -0x1.2b09936cb1f39p-1 -0x1.bbd389d0a55b4p+42'],
+    [-14.422441064329092, -151.57465572656344, 11.64448562135577, -50.41279853769481,
+     '0x1.9bb73a09f4148p+6 0x1.6129199ed3bd4p+23 0x1.f9be596aa3a7ep-1 0x1.3f2f7a11f4c94p-3 0x1.f406dc9509966p-1 '
+     '0x1.b85002cfbbf4ap-3 0x1.7f3116bff612cp+22 -0x1.cb0200377dcbcp-3 -0x1.ca67ba2b75590p-3 -0x1.22c047c72525bp+41'],
+    [12.530827646910538, 154.87825252003427, 26.202825018062313, -34.163846673965764,
+     '0x1.18054abdb8112p+7 0x1.de8e58b801480p+23 0x1.cad929ead7cadp-3 0x1.f2fbee8153ca3p-1 0x1.f3b68c0c6aa4ap-3 '
+     '-0x1.f0865ca343a92p-1 0x1.ebb1495b76fe9p+21 -0x1.8a4d5ef13e268p-1 -0x1.8ca01613ece86p-1 0x1.900813ac102f5p+46'],
+    [65.4433180818896, 178.2622479178163, -1.7538254510017026, 160.20893143097413,
+     '0x1.12673d5d91487p+6 0x1.d5ca88bc53384p+22 -0x1.5387a4b1b9b7cp-2 -0x1.e3093d85dfaa5p-1 -0x1.18cc105dd4c36p-3 '
+     '-0x1.fb2a2b9685ba5p-1 0x1.6cf2470e966dfp+22 0x1.708324bf1fbd7p-2 0x1.75b71279a8267p-2 -0x1.e1bc58a5645cap+42'],
+    [-86.6249908862419, -129.48547607498247, -59.00498859190415, 157.7033242776293,
+     '0x1.dfd8b237d8e3dp+4 0x1.9930e2a0d6e2dp+21 -0x1.f56d3c7772c45p-1 0x1.9e0ee45e4ebf8p-3 -0x1.c9cb664d20539p-4 '
+     '0x1.fccac58f2bf99p-1 0x1.86896638fc6f0p+21 0x1.ba8e9dfd0b023p-1 0x1.bab82c74d829dp-1 0x1.77d2b72db1b97p+45'],
+    [34.28729185415092, 78.86964266193837, -38.40891454072731, -1.8053730233886256,
+     '0x1.a062af9323025p+6 0x1.64e5ada9a041cp+23 -0x1.9699328537b6bp-1 -0x1.37297155d2e56p-1 -0x1.ace9a3fe0966ap-1 '
+     '-0x1.179a6930971fep-1 0x1.7cf53e0965e96p+22 -0x1.f50516f2cd711p-3 -0x1.f7004da7a77e3p-3 0x1.6bb87907561c5p+41'],
+    [69.67165167630202, -144.04476850435242, -69.08008075380917, -162.93018023303293,
+     '0x1.17282aaf98681p+7 0x1.ddd0c57394921p+23 -0x1.69df9dba7983fp-3 -0x1.f7f1a4a66191bp-1 -0x1.60107971ed72bp-3 '
+     '-0x1.f860c4b19c896p-1 0x1.fc17179c5a37ap+21 -0x1.87ce29517c4a0p-1 -0x1.87b3842045d54p-1 -0x1.7528523f950cdp+37'],
+    [-5.640913914144704, 122.57359096215322, 9.89828641152286, -35.474644510833485,
+     '0x1.39b4a6f7dc7adp+7 0x1.0d139d15f6603p+24 -0x1.f49d3c5ac3bd6p-1 0x1.ad80248d372b4p-3 -0x1.f9c8fc577296dp-1 '
+     '-0x1.3e215e2460d9dp-3 0x1.3496e5e3d8799p+21 -0x1.d69d9553d3851p-1 -0x1.d727080dc38ffp-1 -0x1.bb7eaa5218014p+43'],
+    [0.3701800244028135, -115.48387292229029, 80.66393248746414, -52.63149329877206,
+     '0x1.559b8cd63cb11p+6 0x1.2427ea2a99f19p+23 0x1.2675ecc5c1fdep-3 0x1.faae207cc8e54p-1 0x1.c8b87270c18fap-1 '
+     '0x1.ced1b2f1cb0d4p-2 0x1.85b3ad86e5df5p+22 0x1.48344a53a9845p-4 0x1.2284ad29fe9b2p-4 0x1.1efd72253513cp+45'],
+    [-47.6532112373348, -67.95612797710015, 58.48788852026982, -65.42367682396613,
+     '0x1.aa14a35da852fp+6 0x1.6cef80dc5b0c5p+23 0x1.8701965e8e777p-6 0x1.ffdaab460416dp-1 0x1.f886081601e1fp-6 '
+     '0x1.ffc1d739ae2a8p-1 0x1.7830dcfc6dad4p+22 -0x1.24ce6b25fccc1p-2 -0x1.2788f6816c4fbp-2 0x1.0a6746bb805b9p+38'],
+    [72.86517236961703, -58.976122489095786, -10.521269584229344, -153.28765576627998,
+     '0x1.954c7950f59a9p+6 0x1.5ac2d2d61bf0fp+23 -0x1.fff3632777762p-1 0x1.c69291bf08735p-7 -0x1.31085372062e5p-2 '
+     '-0x1.e8c1a1833b01ep-1 0x1.7f38bbb13bc9bp+22 -0x1.a7e39abc28f7bp-3 -0x1.8fd9f663ab523p-3 -0x1.808eeb35b1d82p+45'],
+    [73.34482156324273, 106.61452604890678, -4.599575209714928, -138.45579383149052,
+     '0x1.9545f24619e10p+6 0x1.5a97b1cadb022p+23 0x1.d8a31ba10b9eep-1 0x1.89bde0b71d8b3p-2 0x1.0e28dc68616cep-2 '
+     '-0x1.eddc181fb22e7p-1 0x1.7eb83aa5cb548p+22 -0x1.a99dd998011f4p-3 -0x1.90b1ef22698cfp-3 0x1.fd30c12503888p+45'],
+    [-1.3530545669670175, -44.58661254090393, 61.200487813388264, 154.0739338725038,
+     '0x1.d94bbbea9d86ep+6 0x1.947ed7e18c1d5p+23 -0x1.6756c519f0d66p-3 0x1.f80ea883776fap-1 -0x1.76c26e163e8b1p-2 '
+     '-0x1.dc7ac88ba03bap-1 0x1.5590886e17ca8p+22 -0x1.e58e0e44ef3ffp-2 -0x1.f4610d19bda9cp-2 -0x1.84124bff5a151p+46'],
+    [43.399111603360865, -76.60362643662253, -82.55180939196323, 141.81840078076692,
+     '0x1.165add33a4aa6p+7 0x1.dc4ad12f9d1aap+23 -0x1.f660598dcc622p-4 -0x1.fc22659ffad8fp-1 -0x1.612d3b5719560p-1 '
+     '0x1.72b058ddf2c25p-1 0x1.fde52d1851a0ep+21 -0x1.81d071159da7ep-1 -0x1.89931a4e85c4fp-1 0x1.51f9693f5ff08p+46'],
+    [80.00990901820396, -122.98503714648331, -0.013245331474578848, -6.850523098582073,
+     '0x1.7968a9fd56132p+6 0x1.42aeea831c91dp+23 0x1.cd5e892410525p-1 0x1.bbfe23f024d5dp-2 0x1.3e17a910350dbp-3 '
+     '-0x1.f9c95e0716115p-1 0x1.853e8bd310a1cp+22 -0x1.64a9fc0abf7bdp-4 -0x1.36d3e5f79eaa0p-4 0x1.171c3eed78c77p+46'],
+    [85.75717381924343, -164.50241491115554, -78.89282431152888, 123.74945841297625,
+     '0x1.4e083341002b2p+7 0x1.1db0f3282fde8p+24 -0x1.9e18b5fccb766p-1 -0x1.2d1c83c07d8d1p-1 -0x1.3dfe7ce9367b3p-2 '
+     '-0x1.e6afcb3ef7691p-1 0x1.5f4ed278c5315p+20 -0x1.f4af455de58ddp-1 -0x1.f331e7757eaf2p-1 -0x1.770492bec98fdp+44'],
+    [12.524570918467475, -13.576000307207636, 49.99480661688571, 33.602568221708765,
+     '0x1.ac76e01f7de7ep+5 0x1.6ed2e6e1185b6p+22 0x1.29f22a3ebc82bp-1 0x1.a0613ffc9c2e7p-1 0x1.c6125e2a6ab18p-1 '
+     '0x1.d9211d5a6af2bp-2 0x1.3b7d94932b9dbp+22 0x1.2fdd5d905f299p-1 0x1.2ed0c09e04f8bp-1 0x1.1a89cb0989491p+44'],
+    [34.63693372729739, -87.97498670091241, -74.71254505258331, -176.786930707787,
+     '0x1.ec4c5485f7e1bp+6 0x1.a55b65f829bf5p+23 -0x1.401db921a2ab3p-2 -0x1.e656bb0216c46p-1 -0x1.f57c5f096439ap-1 '
+     '-0x1.9ce935c896089p-3 0x1.47b41923c2243p+22 -0x1.165d75fe653c5p-1 -0x1.1cc9c7babdf5dp-1 0x1.3ac44bb8300cbp+45'],
+    [-30.04101085910692, 53.46002474951433, -21.638003155199897, -54.96193334350659,
+     '0x1.75eaffe06abd4p+6 0x1.4015670659a1fp+23 -0x1.c53170509bc7ap-1 -0x1.dc7cb47713436p-2 -0x1.a5bbaeea66cdep-1 '
+     '0x1.2251ae5be89afp-1 0x1.868772bf87b01p+22 -0x1.09ceacac6dd44p-4 -0x1.047a0d16ed53bp-4 0x1.474038426dfbap+45'],
+    [21.339854659990692, 73.8723178866448, 17.181791664764148, -67.77421684974787,
+     '0x1.f67e8472e15d4p+6 0x1.ae0e6d975495bp+23 -0x1.79e7c310084a1p-1 0x1.5971ab1bb403fp-1 -0x1.7053b1fa85a1cp-1 '
+     '-0x1.63a3a542b38fbp-1 0x1.3c25ce222dbebp+22 -0x1.2ca8264481df0p-1 -0x1.2c2607319fb61p-1 -0x1.c5e82ecbda494p+45'],
+    [57.91364554733255, 108.2534339663489, 70.82956803185746, 141.32853372872506,
+     '0x1.2bcb6f02298d9p+4 0x1.ff977c6f9acecp+20 0x1.1bab8bfa19dfdp-1 0x1.aa3bdbd06e5e5p-1 0x1.cb6750b039612p-1 '
+     '0x1.c412865f6f06ep-2 0x1.f66c1a5778914p+20 0x1.e4978d09a1c13p-1 0x1.e48cb0d06de39p-1 0x1.3b946eb51798bp+44'],
+    [-87.2931738134603, 60.89923090684988, -27.34461582480479, -40.15977436940091,
+     '0x1.f85e1f36869eap+5 0x1.aeb82ef830ceep+22 -0x1.f410ffeabe97ap-1 -0x1.b797a5686949fp-3 -0x1.a72bf2df48e72p-5 '
+     '0x1.ff5101873b602p-1 0x1.5c2bbb823b8f5p+22 0x1.c96e536ef3a62p-2 0x1.cda447e2167f3p-2 0x1.03ce62915bc74p+46'],
+    [3.255980465616531, -128.20120028882621, -45.10208957029409, 175.05331862365017,
+     '0x1.16ab7beaef81cp+6 0x1.dd87f3c545a67p+22 -0x1.40259b0323cf1p-1 -0x1.8f8fed66f16b2p-1 -0x1.c6571f4e3d3f6p-1 '
+     '-0x1.d818cedfd4095p-2 0x1.7009fd4c6dfe0p+22 0x1.63f000464a4c0p-2 0x1.60b35286ecee9p-2 0x1.f54e74f0825dap+43']]
+
+  prolate_geod = Geodesic(6.4e6, -1/150.0)
+
+  @staticmethod
+  def equiv(x, y):
+    """Test for equivalence"""
+
+    return ( (math.isnan(x) and math.isnan(y)) or
+             (x == y and math.copysign(1.0, x) == math.copysign(1.0, y)) )
+
+  def check(self, geod, cases, scratch = None):
+    """Helper function comparing _GenInverse against the golden values"""
+    for lat1, lon1, lat2, lon2, golden in cases:
+      res = geod._GenInverse(lat1, lon1, lat2, lon2, Geodesic.ALL, scratch)
+      for x, h in zip(res, golden.split()):
+        self.assertTrue(InverseScratchTest.equiv(x, float.fromhex(h)),
+                        (lat1, lon1, lat2, lon2, x.hex(), h))
+
+  def test_golden(self):
+    """Check results against the allocating implementation"""
+    self.check(Geodesic.WGS84, InverseScratchTest.wgs84)
+    self.check(InverseScratchTest.prolate_geod,
+               InverseScratchTest.prolate)
+
+  def test_reuse(self):
+    """Check results do not depend on what ran before in the scratch areas"""
+    # reversed order, and with other output masks interleaved, so every
+    # case starts from scratch areas left behind by a different case
+    scratch = Geodesic._Scratch()
+    for l in reversed(InverseScratchTest.wgs84):
+      Geodesic.WGS84._GenInverse(l[0], l[1], l[2], l[3], Geodesic.DISTANCE,
+                                 scratch)
+      self.check(Geodesic.WGS84, [l], scratch)
+    self.check(Geodesic.WGS84, InverseScratchTest.wgs84[::2], scratch)
+    self.check(InverseScratchTest.prolate_geod,
+               InverseScratchTest.prolate, scratch)
+
+  def test_inversemany(self):
+    """Check InverseMany against the golden values"""
+    cases = InverseScratchTest.wgs84
+    many = Geodesic.WGS84.InverseMany([l[0] for l in cases],
+                                      [l[1] for l in cases],
+                                      [l[2] for l in cases],
+                                      [l[3] for l in cases], Geodesic.ALL)
+    for i, l in enumerate(cases):
+      golden = [float.fromhex(h) for h in l[4].split()]
+      self.assertTrue(InverseScratchTest.equiv(many["a12"][i], golden[0]))
+      self.assertTrue(InverseScratchTest.equiv(many["s12"][i], golden[1]))
+      self.assertTrue(InverseScratchTest.equiv(many["S12"][i], golden[9]))
@@ -141,6 +141,8 @@ from geopy.units import radians
 # sphere with this radius results in an error of up to about 0.5%.
 EARTH_RADIUS = 6371.009
 
+_DEGREES_TO_RADIANS = pi / 180
+
 # From http://www.movable-type.co.uk/scripts/LatLongVincenty.html:
 #   The most accurate and widely used globally-applicable model for the earth
 #   ellipsoid is WGS-84, used in this script. Other ellipsoids offering a
@@ -159,6 +161,81 @@ ELLIPSOIDS = {
 }
 
 
+def haversine_km(lat1, lon1, lat2, lon2, radius=EARTH_RADIUS):
+    """
+    Great-circle distance in kilometers between two points given as plain
+    numbers in degrees.
+
+    This is the kernel behind :class:`.great_circle`, without the
+    :class:`.Point` coercion and :class:`.Distance` bookkeeping, for code
+    that measures many pairs in a loop.  It uses the same atan2 form of
+    the Vincenty formula for a sphere that :class:`.great_circle` always
+    has, which unlike the plain haversine formula stays accurate for
+    nearly antipodal points::
+
+        >>> from geopy.distance import haversine_km
+        >>> newport_ri = (41.49008, -71.312796)
+        >>> cleveland_oh = (41.499498, -81.695391)
+        >>> print(haversine_km(*(newport_ri + cleveland_oh)))
+        864.2144943393623
+
+    :param float radius: Sphere radius in kilometers.
+    """
+    lat1 *= _DEGREES_TO_RADIANS
+    lat2 *= _DEGREES_TO_RADIANS
+    return radius * _central_angle(
+        sin(lat1), cos(lat1), sin(lat2), cos(lat2),
+        (lon2 - lon1) * _DEGREES_TO_RADIANS)
+
+
+def haversine_km_many(lat1s, lon1s, lat2s, lon2s, radius=EARTH_RADIUS,
+                      in_radians=False, cos_lat1s=None, cos_lat2s=None,
+                      sin_lat1s=None, sin_lat2s=None):
+    """
+    :func:`haversine_km` over paired sequences: returns a list whose i-th
+    item is the distance between ``(lat1s[i], lon1s[i])`` and
+    ``(lat2s[i], lon2s[i])``.
+
+    With ``in_radians=True`` the coordinates are taken as radians, so
+    callers can convert fixed points (fence centers, say) once and reuse
+    them.  ``cos_lat1s``, ``cos_lat2s``, ``sin_lat1s`` and ``sin_lat2s``
+    may likewise supply the precomputed cosines and sines of the
+    latitudes.
+
+    :param float radius: Sphere radius in kilometers.
+    """
+    if not in_radians:
+        lat1s = [x * _DEGREES_TO_RADIANS for x in lat1s]
+        lon1s = [x * _DEGREES_TO_RADIANS for x in lon1s]
+        lat2s = [x * _DEGREES_TO_RADIANS for x in lat2s]
+        lon2s = [x * _DEGREES_TO_RADIANS for x in lon2s]
+    if cos_lat1s is None:
+        cos_lat1s = map(cos, lat1s)
+    if cos_lat2s is None:
+        cos_lat2s = map(cos, lat2s)
+    if sin_lat1s is None:
+        sin_lat1s = map(sin, lat1s)
+    if sin_lat2s is None:
+        sin_lat2s = map(sin, lat2s)
+
+    return [radius * _central_angle(sin1, cos1, sin2, cos2, lon2 - lon1)
+            for lon1, lon2, sin1, cos1, sin2, cos2 in zip(
+                lon1s, lon2s, sin_lat1s, cos_lat1s, sin_lat2s, cos_lat2s)]
+
+
+def _central_angle(sin_lat1, cos_lat1, sin_lat2, cos_lat2, delta_lng):
+    """
+    Angle in radians subtended at the center of a sphere by two points,
+    from the sines and cosines of their latitudes and the longitude
+    difference in radians.
+    """
+    cos_delta_lng, sin_delta_lng = cos(delta_lng), sin(delta_lng)
+    return atan2(sqrt((cos_lat2 * sin_delta_lng) ** 2 +
+                      (cos_lat1 * sin_lat2 -
+                       sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
+                 sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
+
+
 def lonlat(x, y, z=0):
     """
     ``geopy.distance.distance`` accepts coordinates in ``(y, x)``/``(lat, lon)``
@@ -184,6 +261,18 @@ def lonlat(x, y, z=0):
     return Point(y, x, z)
 
 
+def _as_point(value):
+    # measure() only reads coordinates, so an existing Point is used as is
+    # and (lat, lon[, alt]) number sequences skip the constructor's type
+    # dispatch and reuse interned Points for repeated coordinates.
+    if isinstance(value, Point):
+        return value
+    if (isinstance(value, (tuple, list)) and 2 <= len(value) <= 3 and
+            all(isinstance(x, util.NUMBER_TYPES) for x in value)):
+        return Point.from_floats(*value, intern=True)
+    return Point(value)
+
+
 def _ensure_same_altitude(a, b):
     if abs(a.altitude - b.altitude) > 1e-6:
         warnings.warn(
@@ -353,24 +442,10 @@ class great_circle(Distance):
         super(great_circle, self).__init__(*args, **kwargs)
 
     def measure(self, a, b):
-        a, b = Point(a), Point(b)
+        a, b = _as_point(a), _as_point(b)
         _ensure_same_altitude(a, b)
-
-        lat1, lng1 = radians(degrees=a.latitude), radians(degrees=a.longitude)
-        lat2, lng2 = radians(degrees=b.latitude), radians(degrees=b.longitude)
-
-        sin_lat1, cos_lat1 = sin(lat1), cos(lat1)
-        sin_lat2, cos_lat2 = sin(lat2), cos(lat2)
-
-        delta_lng = lng2 - lng1
-        cos_delta_lng, sin_delta_lng = cos(delta_lng), sin(delta_lng)
-
-        d = atan2(sqrt((cos_lat2 * sin_delta_lng) ** 2 +
-                       (cos_lat1 * sin_lat2 -
-                        sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
-                  sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
-
-        return self.RADIUS * d
+        return haversine_km(a.latitude, a.longitude,
+                            b.latitude, b.longitude, self.RADIUS)
 
     def destination(self, point, bearing, distance=None):
         """
@@ -460,7 +535,7 @@ class geodesic(Distance):
 
     # Call geographiclib routines for measure and destination
     def measure(self, a, b):
-        a, b = Point(a), Point(b)
+        a, b = _as_point(a), _as_point(b)
         _ensure_same_altitude(a, b)
         lat1, lon1 = a.latitude, a.longitude
         lat2, lon2 = b.latitude, b.longitude
@@ -568,7 +643,7 @@ class vincenty(Distance):
         return
 
     def measure(self, a, b):
-        a, b = Point(a), Point(b)
+        a, b = _as_point(a), _as_point(b)
         lat1, lng1 = radians(degrees=a.latitude), radians(degrees=a.longitude)
         lat2, lng2 = radians(degrees=b.latitude), radians(degrees=b.longitude)
 
@@ -24,6 +24,7 @@ from geopy.exc import (
     GeocoderTimedOut,
     GeocoderUnavailable,
 )
+from geopy.adapters import AdapterHTTPError
 from geopy.point import Point
 from geopy.util import __version__, decode_page, logger
 
@@ -221,6 +222,7 @@ class Geocoder(object):
             proxies=DEFAULT_SENTINEL,
             user_agent=None,
             ssl_context=DEFAULT_SENTINEL,
+            adapter_factory=None,
     ):
         if format_string is not None or options.default_format_string != "%s":
             warnings.warn(
@@ -260,6 +262,13 @@ class Geocoder(object):
         )
         self.urlopen = opener.open
 
+        # Backported from geopy 2.0: an adapter (see geopy.adapters) built
+        # from adapter_factory makes the requests instead of urlopen.
+        self.adapter = None
+        if adapter_factory is not None:
+            self.adapter = adapter_factory(proxies=self.proxies,
+                                           ssl_context=self.ssl_context)
+
     @staticmethod
     def _coerce_point_to_string(point, output_format="%(lat)s,%(lon)s"):
         """
@@ -334,6 +343,8 @@ class Geocoder(object):
         For a generated query URL, get the results.
         """
 
+        use_adapter = self.adapter is not None and not requester and not raw
+
         if requester:
             req = url  # Don't construct an urllib's Request for a custom requester.
 
@@ -369,6 +380,9 @@ class Geocoder(object):
         timeout = (timeout if timeout is not DEFAULT_SENTINEL
                    else self.timeout)
 
+        if use_adapter:
+            return self._call_adapter(req, timeout, deserializer)
+
         try:
             page = requester(req, timeout=timeout, **kwargs)
         except Exception as error:
@@ -431,6 +445,32 @@ class Geocoder(object):
         else:
             return page
 
+    def _call_adapter(self, req, timeout, deserializer):
+        """
+        Get the results for an urllib Request through ``self.adapter``.
+        """
+        try:
+            page = self.adapter.get_text(req.get_full_url(), timeout=timeout,
+                                         headers=dict(req.header_items()))
+        except AdapterHTTPError as error:
+            if error.text:
+                logger.info('Received an HTTP error (%s): %s', error.status_code,
+                            error.text, exc_info=False)
+            message = str(error)
+            self._geocoder_exception_handler(error, message, error.status_code,
+                                             error.text)
+            raise ERROR_CODE_MAP.get(error.status_code, GeocoderServiceError)(message)
+
+        if deserializer is not None:
+            try:
+                return deserializer(page)
+            except ValueError:
+                raise GeocoderParseError(
+                    "Could not deserialize using deserializer:\n%s" % page
+                )
+        else:
+            return page
+
     def _read_http_error_body(self, error):
         try:
             return decode_page(error)
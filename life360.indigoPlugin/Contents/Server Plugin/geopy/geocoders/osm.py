@@ -66,6 +66,7 @@ class Nominatim(Geocoder):
             scheme=None,
             user_agent=None,
             ssl_context=DEFAULT_SENTINEL,
+            adapter_factory=None,
             # Make sure to synchronize the changes of this signature in the
             # inheriting classes (e.g. PickPoint).
     ):
@@ -137,6 +138,14 @@ class Nominatim(Geocoder):
 
             .. versionadded:: 1.14.0
 
+        :param callable adapter_factory: A callable which returns a
+            :class:`geopy.adapters.BaseSyncAdapter` instance, called with
+            the ``proxies`` and ``ssl_context`` keyword arguments.  When
+            given, requests go through the adapter (e.g. a keep-alive
+            :class:`geopy.adapters.RequestsAdapter`) instead of urllib.
+
+            Backported from geopy 2.0.
+
         """
         super(Nominatim, self).__init__(
             format_string=format_string,
@@ -145,6 +154,7 @@ class Nominatim(Geocoder):
             proxies=proxies,
             user_agent=user_agent,
             ssl_context=ssl_context,
+            adapter_factory=adapter_factory,
         )
 
         if country_bias is not None:
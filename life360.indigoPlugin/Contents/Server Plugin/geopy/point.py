@@ -5,6 +5,7 @@
 
 import collections
 import re
+import threading
 import warnings
 from itertools import islice
 from math import fmod
@@ -41,6 +42,11 @@ POINT_PATTERN = re.compile(r"""
     "SEP": r'\s*[,;/\s]\s*',
 }, re.VERBOSE | re.UNICODE)
 
+# Recently created coordinate tuples -> Point, see ``Point.from_floats``.
+INTERN_CACHE_SIZE = 256
+_interned = {}
+_interned_lock = threading.Lock()
+
 
 def _normalize_angle(x, limit):
     """
@@ -60,7 +66,7 @@ def _normalize_coordinates(latitude, longitude, altitude):
     longitude = float(longitude or 0.0)
     altitude = float(altitude or 0.0)
 
-    is_all_finite = all(isfinite(x) for x in (latitude, longitude, altitude))
+    is_all_finite = isfinite(latitude) and isfinite(longitude) and isfinite(altitude)
     if not is_all_finite:
         raise ValueError('Point coordinates must be finite. %r has been passed '
                          'as coordinates.' % ((latitude, longitude, altitude),))
@@ -477,6 +483,38 @@ class Point(object):
                              'must not have more than 3 items.')
         return cls(*args)
 
+    @classmethod
+    def from_floats(cls, latitude, longitude, altitude=0.0, intern=False):
+        """
+        Create and return a new ``Point`` instance from numeric latitude,
+        longitude and (optionally) altitude, skipping the argument type
+        dispatch done by the constructor.  The coordinates are validated and
+        normalized exactly as ``Point(latitude, longitude, altitude)`` does.
+
+        With ``intern=True`` the instance comes from a small cache of the
+        last ``INTERN_CACHE_SIZE`` coordinate tuples, so coordinates that
+        repeat (fixed fence centers, members that haven't moved) are only
+        normalized once.  Interned points are shared and must not be
+        modified.
+        """
+        if intern:
+            key = (cls, latitude, longitude, altitude)
+            point = _interned.get(key)  # atomic, so lookups take no lock
+            if point is not None:
+                return point
+
+        self = super(Point, cls).__new__(cls)
+        self.latitude, self.longitude, self.altitude = \
+            _normalize_coordinates(latitude, longitude, altitude)
+
+        if intern:
+            with _interned_lock:
+                _interned[key] = self
+                # dicts keep insertion order: drop the oldest entries
+                while len(_interned) > INTERN_CACHE_SIZE:
+                    del _interned[next(iter(_interned))]
+        return self
+
     @classmethod
     def from_point(cls, point):
         """
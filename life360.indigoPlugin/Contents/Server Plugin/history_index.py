@@ -0,0 +1,161 @@
+"""SQLite index of member fixes and geofence visits for history queries."""
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixes (
+    member_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    accuracy REAL,
+    speed REAL,
+    battery REAL,
+    place TEXT
+);
+CREATE INDEX IF NOT EXISTS fixes_member_time ON fixes (member_id, timestamp);
+CREATE INDEX IF NOT EXISTS fixes_place_time ON fixes (place, timestamp) WHERE place IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS visits (
+    member_id TEXT NOT NULL,
+    fence_id INTEGER NOT NULL,
+    fence_name TEXT,
+    entered REAL NOT NULL,
+    exited REAL
+);
+CREATE INDEX IF NOT EXISTS visits_fence_time ON visits (fence_id, entered);
+CREATE INDEX IF NOT EXISTS visits_member_time ON visits (member_id, entered);
+"""
+
+
+class HistoryIndex:
+    """
+    Fixes and geofence visits in an SQLite database, indexed for lookups.
+
+    The database runs in WAL mode, so each poll's commit is a short append
+    to the log rather than a rewrite of the database pages.  Fixes and visit
+    changes are buffered during a poll and written by commit() in a single
+    transaction; queries from action threads share the connection.  Visits
+    are kept as (member, fence, entered, exited) rows, exited being NULL
+    while the member is still inside; update_visits() opens and closes them
+    from the geofence occupancy each poll.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending_fixes = []
+        self._pending_visits = []   # (sql, params) in the order they happened
+        # (member, fence) of every visit still open in the database
+        self._open = set(self._conn.execute(
+            "SELECT member_id, fence_id FROM visits WHERE exited IS NULL"))
+
+    def add_fix(self, member_id, timestamp, latitude, longitude, accuracy=None, speed=None,
+                battery=None, place=None):
+        """Buffer one fix for the next commit()."""
+        with self._lock:
+            self._pending_fixes.append((member_id, float(timestamp), float(latitude), float(longitude),
+                                        accuracy, speed, battery, place or None))
+
+    def update_visits(self, member_id, inside, now=None):
+        """
+        Bring the member's open visits in line with the fences it is inside.
+
+        inside maps fence id -> fence name.  Visits to fences the member has
+        left are closed at now; fences it is newly inside get a visit opened.
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            for (member, fence_id) in [k for k in self._open if k[0] == member_id]:
+                if fence_id not in inside:
+                    self._open.discard((member, fence_id))
+                    self._pending_visits.append((
+                        "UPDATE visits SET exited = ? WHERE member_id = ? AND fence_id = ? AND exited IS NULL",
+                        (now, member_id, fence_id)))
+            for fence_id, fence_name in inside.items():
+                if (member_id, fence_id) not in self._open:
+                    self._open.add((member_id, fence_id))
+                    self._pending_visits.append((
+                        "INSERT INTO visits (member_id, fence_id, fence_name, entered) VALUES (?, ?, ?, ?)",
+                        (member_id, fence_id, fence_name, now)))
+
+    def close_visits(self, member_id=None, fence_id=None, now=None):
+        """
+        Close the open visits of a member, or to a fence, at now.
+
+        Used when a device stops, so its last visit doesn't keep counting up
+        to now in time_in_fence().  With neither argument every open visit
+        is closed.  Returns the number closed.
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            closing = [k for k in self._open
+                       if (member_id is None or k[0] == member_id) and (fence_id is None or k[1] == fence_id)]
+            for member, fence in closing:
+                self._open.discard((member, fence))
+                self._pending_visits.append((
+                    "UPDATE visits SET exited = ? WHERE member_id = ? AND fence_id = ? AND exited IS NULL",
+                    (now, member, fence)))
+            return len(closing)
+
+    def commit(self):
+        """Write everything buffered since the last commit in one transaction."""
+        with self._lock:
+            fixes, self._pending_fixes = self._pending_fixes, []
+            visits, self._pending_visits = self._pending_visits, []
+            if not fixes and not visits:
+                return 0
+            with self._conn:
+                self._conn.executemany("INSERT INTO fixes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", fixes)
+                for sql, params in visits:
+                    self._conn.execute(sql, params)
+            return len(fixes) + len(visits)
+
+    def prune(self, before):
+        """Delete fixes, and visits that ended, before the epoch time before."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM fixes WHERE timestamp < ?", (before,))
+            self._conn.execute("DELETE FROM visits WHERE exited IS NOT NULL AND exited < ?", (before,))
+
+    def time_in_fence(self, fence_id, start, end, member_id=None):
+        """
+        Return the seconds spent inside the fence between start and end.
+
+        Visits are clipped to the range; a visit still open counts up to now.
+        With member_id, only that member's visits count; otherwise the
+        visits of every member are added together.
+        """
+        now = time.time()
+        sql = ("SELECT SUM(MIN(COALESCE(exited, :now), :end) - MAX(entered, :start)) FROM visits "
+               "WHERE fence_id = :fence AND entered < :end AND COALESCE(exited, :now) > :start")
+        params = {'now': now, 'start': start, 'end': end, 'fence': fence_id}
+        if member_id is not None:
+            sql += " AND member_id = :member"
+            params['member'] = member_id
+        with self._lock:
+            total = self._conn.execute(sql, params).fetchone()[0]
+        return max(0.0, total or 0.0)
+
+    def last_visit(self, place, member_id=None):
+        """Return the timestamp of the latest fix at a Life360 place, or None."""
+        sql = "SELECT timestamp FROM fixes WHERE place = ?"
+        params = [place]
+        if member_id is not None:
+            sql += " AND member_id = ?"
+            params.append(member_id)
+        # walks the (place, timestamp) index backwards from the newest fix
+        sql += " ORDER BY timestamp DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,206 @@
+"""Append-only store of member location fixes, one binary file per day."""
+import datetime
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import uuid
+from collections import namedtuple
+
+# member key, timestamp, latitude, longitude, accuracy (m), speed (Life360
+# raw units, roughly m/s), battery (%)
+_RECORD = struct.Struct('<16sdddfff')
+RECORD_SIZE = _RECORD.size
+
+HistoryRecord = namedtuple('HistoryRecord', 'timestamp latitude longitude accuracy speed battery')
+
+_DAY_FORMAT = "%Y-%m-%d"
+_SUFFIX = ".bin"
+
+
+def member_key(member_id):
+    """Return the 16-byte key stored for a Life360 member id."""
+    try:
+        return uuid.UUID(str(member_id)).bytes
+    except ValueError:
+        # not a UUID — any stable 16 bytes will do
+        return hashlib.md5(str(member_id).encode('utf-8')).digest()
+
+
+def _day(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(_DAY_FORMAT)
+
+
+class LocationHistory:
+    """
+    Location history kept as fixed-size records in day files.
+
+    Every new fix is packed into a 52-byte record and buffered; flush() (once
+    per poll, or whenever max_buffer records are waiting) appends them to
+    YYYY-MM-DD.bin in directory, by UTC day of the fix.  Files are only ever
+    appended to, so a crash loses at most the unflushed buffer; a torn
+    record at the end of a file is ignored by the reader and cut off by the
+    next flush() before it appends.  Day files older than
+    retention_days are deleted by prune(), which flush() runs once a day.
+
+    If the disk can't be written the buffer keeps at most max_buffer
+    records, dropping the oldest.  query() memory-maps only the day files
+    that overlap the requested range.
+
+    The last fix of every member in the newest day file is read back when
+    the history is opened, so a fix already stored before a restart is not
+    appended again.
+    """
+
+    def __init__(self, directory, retention_days=30, max_buffer=1000):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.max_buffer = max_buffer
+        self._lock = threading.Lock()
+        self._buffer = []       # (day, packed record) waiting for flush()
+        self._last = {}         # member key -> timestamp of the last fix appended
+        self._pruned_day = None
+        self.appended = 0
+        self.dropped = 0
+        days = self._days()
+        if days:
+            try:
+                self._last = self._last_fixes(days[-1])
+            except OSError:
+                pass    # unreadable — the worst case is one repeated fix
+
+    def append(self, member_id, timestamp, latitude, longitude, accuracy=0.0, speed=0.0, battery=0.0):
+        """
+        Buffer one fix.  Returns False (and stores nothing) when it is not
+        newer than the last fix appended for the member.
+        """
+        key = member_key(member_id)
+        timestamp = float(timestamp)
+        record = _RECORD.pack(key, timestamp, float(latitude), float(longitude),
+                              float(accuracy or 0), float(speed or 0), float(battery or 0))
+        with self._lock:
+            if timestamp <= self._last.get(key, float('-inf')):
+                return False
+            self._last[key] = timestamp
+            self._buffer.append((_day(timestamp), record))
+            self.appended += 1
+            full = len(self._buffer) >= self.max_buffer
+        if full:
+            try:
+                self.flush()
+            except OSError:
+                pass    # still buffered (bounded); the next flush() reports it
+        return True
+
+    def flush(self):
+        """Append the buffered records to their day files.  Returns the number written."""
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+            if not pending:
+                return 0
+            by_day = {}
+            for day, record in pending:
+                by_day.setdefault(day, []).append(record)
+            written = 0
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for day in sorted(by_day):
+                    with open(self._path(day), 'ab') as f:
+                        # drop a torn record left by a crash so the new
+                        # records start on a record boundary
+                        size = f.seek(0, os.SEEK_END)
+                        if size % RECORD_SIZE:
+                            f.truncate(size - size % RECORD_SIZE)
+                        f.write(b''.join(by_day[day]))
+                    written += len(by_day[day])
+                    del by_day[day]
+            except OSError:
+                # keep what wasn't written, newest first, up to max_buffer
+                unwritten = [(day, r) for day in sorted(by_day) for r in by_day[day]]
+                overflow = len(unwritten) - self.max_buffer
+                if overflow > 0:
+                    self.dropped += overflow
+                    unwritten = unwritten[overflow:]
+                self._buffer = unwritten + self._buffer
+                raise
+        today = _day(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        if today != self._pruned_day:
+            self._pruned_day = today
+            self.prune()
+        return written
+
+    def _path(self, day):
+        return os.path.join(self.directory, day + _SUFFIX)
+
+    def _days(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-len(_SUFFIX)] for n in names if n.endswith(_SUFFIX))
+
+    def _last_fixes(self, day):
+        """Return {member key: newest timestamp} for the records in one day file."""
+        last = {}
+        with open(self._path(day), 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            size -= size % RECORD_SIZE   # ignore a torn trailing record
+            if size == 0:
+                return last
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                for key, timestamp, *_ in _RECORD.iter_unpack(mm):
+                    if timestamp > last.get(key, float('-inf')):
+                        last[key] = timestamp
+        return last
+
+    def prune(self, now=None):
+        """Delete day files older than retention_days.  Returns the number deleted."""
+        if not self.retention_days or self.retention_days <= 0:
+            return 0
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        oldest = _day(now - self.retention_days * 86400)
+        removed = 0
+        for day in self._days():
+            if day < oldest:
+                try:
+                    os.remove(self._path(day))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def query(self, member_id, start, end):
+        """
+        Return the member's fixes with start <= timestamp <= end, oldest first.
+
+        Buffered records are flushed first so the answer is complete.
+        """
+        self.flush()
+        key = member_key(member_id)
+        first, last = _day(start), _day(end)
+        records = []
+        for day in self._days():
+            if day < first or day > last:
+                continue
+            with open(self._path(day), 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                size -= size % RECORD_SIZE   # ignore a torn trailing record
+                if size == 0:
+                    continue
+                with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                    for offset in range(0, size, RECORD_SIZE):
+                        # compare the key in place before unpacking anything
+                        if mm[offset:offset + 16] != key:
+                            continue
+                        fix = HistoryRecord._make(_RECORD.unpack_from(mm, offset)[1:])
+                        if start <= fix.timestamp <= end:
+                            records.append(fix)
+        records.sort(key=lambda r: r.timestamp)
+        return records
+
+    def stats(self):
+        """Return a one-line summary of the history counters."""
+        return (f"location history: {self.appended} fixes recorded, "
+                f"{len(self._buffer)} buffered, {self.dropped} dropped")
@@ -13,14 +13,19 @@ import indigo
 import re
 import sys
 import os
-from sync_life360 import SyncLife360
+import threading
+from sync_life360 import RetryCancelled, SyncLife360
+from request_budget import RequestBudget
+from state_cache import DeviceStateCache
+from cache_store import SnapshotStore
+from location_history import LocationHistory
+from history_index import HistoryIndex
+from trips import TripDetector
+from geocoding import GeocodeWorker, ReverseGeocodeCache, ReverseGeocoder
+from scheduler import PollScheduler, RetryBackoff, member_activity
+import geofence
 import datetime
-try:
-	from geopy.geocoders import Nominatim
-	from geopy import Point
-	from geopy.distance import great_circle
-except: 
-	pass
+import time
 
 
 ################################################################################
@@ -43,11 +48,19 @@ class Plugin(indigo.PluginBase):
 		self.debug = pluginPrefs.get("showDebugInfo", False)
 		self.deviceList = []
 		self.geoDeviceList = []
+		self.statusDeviceList = []
+		# geofence device id -> CompiledFence, rebuilt whenever the device (re)starts,
+		# plus a spatial index over them that is updated fence by fence
+		self.fences = {}
+		self.fence_index = geofence.FenceIndex()
 
 		# Setup cache directory
 		self.pluginprefDirectory = '{}/Preferences/Plugins/com.ryanbuckner.indigoplugin.life360'.format(indigo.server.getInstallFolderPath())
 		self.path = self.pluginprefDirectory + "/"
 		self.cache_file = self.path + "life360_cache.json"
+		self.geocode_cache_file = self.path + "life360_geocode_cache.json"
+		self.history_directory = self.path + "life360_history"
+		self.history_index_file = self.path + "life360_history.sqlite"
 		
 		# Debug: log paths and directory details so we can see exactly where it's looking
 		try:
@@ -142,9 +155,26 @@ class Plugin(indigo.PluginBase):
 		self.placesdata = {}
 		self.member_list = {}
 		self.places_list = {}
+		# Lookup indexes rebuilt once per snapshot: member id -> member, place name -> place
+		self.member_index = {}
+		self.places_index = {}
 
 		# Persistent API client — reused across polling cycles to preserve session/cookies
 		self._api = None
+		# The polling thread and action threads share that client's event loop,
+		# which can only run one request batch at a time
+		self._api_lock = threading.RLock()
+		# The polling thread, action threads (Refresh Member Data) and device
+		# start/stop all update the occupancy, state cache, trip and history
+		# state; they take this lock to do it
+		self._state_lock = threading.RLock()
+		# One request budget for every Life360 call, so manual refreshes and
+		# credential checks can't push the background poll into a 429
+		self.request_budget = RequestBudget()
+		# Failed startup fetches are retried on a schedule; the wake event cuts
+		# the wait between polls short (prefs saved, plugin stopping)
+		self.retry_backoff = RetryBackoff()
+		self._wake = threading.Event()
 
 		# Set when the API rejects our token (401/403) — cleared by closedPrefsConfigUi
 		self.auth_error = False
@@ -153,51 +183,169 @@ class Plugin(indigo.PluginBase):
 		self.circle_id_override = self._parse_circle_id(
 			self.pluginPrefs.get('circle_id_override', '')
 		)
+		# Circle ID learned from the circles API — reused on later polls so the
+		# members/places requests don't have to wait for the circles call
+		self.circle_id = None
+
+		# True when the last poll came back 304 Not Modified — device updates
+		# are skipped because they would only re-write the same states
+		self.snapshot_unchanged = False
+
+		# Occupancy of every geofence by every member, evaluated once per poll,
+		# and the enter/exit state machines that debounce it
+		self.geofence_result = geofence.evaluate([], [])
+		self.occupancy = geofence.OccupancyTracker()
+		self._configure_occupancy()
+
+		# Last values pushed per device/state — only changed states are written
+		self.state_cache = DeviceStateCache()
+
+		# Polling interval adapted to what the members are doing
+		self.scheduler = PollScheduler()
+		self._configure_scheduler()
+
+		# Reverse-geocoded addresses keyed on a ~N metre grid, so members who
+		# haven't moved never trigger a Nominatim lookup
+		self.geocode_cache = ReverseGeocodeCache(path=self.geocode_cache_file)
+		self._configure_geocode_cache()
+		try:
+			loaded = self.geocode_cache.load()
+			self.logger.debug(f"Loaded {loaded} cached addresses from {self.geocode_cache_file}")
+		except Exception as e:
+			self.logger.error(f"Error loading geocode cache: {str(e)}")
+
+		# One geocoder for the life of the plugin, on a keep-alive session.
+		# Cache misses are resolved on a background thread so a slow Nominatim
+		# response never holds up the polling loop.
+		self.geocode_worker = None
+		# device id -> (lat, lon) of the fix whose address the device should show
+		self.address_fixes = {}
+		# member devices whose last lookup failed; resubmitted every poll
+		self.geocode_retries = set()
+		try:
+			self.geocoder = ReverseGeocoder(user_agent='life360', cache=self.geocode_cache)
+			if not self.geocoder.keepalive:
+				self.logger.info("The requests package is not installed — address lookups will open a new connection each time")
+			self.geocode_worker = GeocodeWorker(self.geocoder, self._address_resolved, logger=self.logger)
+			self.geocode_worker.start()
+		except Exception as e:
+			self.geocoder = None
+			self.logger.error(f"Error instantiating geocoder object: {str(e)}")
 
-		# Load cached data on startup
-		self.load_cache()
+		# Trips assembled from each member's fixes as they arrive
+		self.trips = TripDetector()
+
+		# Every new member fix, appended to day files under the prefs directory
+		self.history = LocationHistory(self.history_directory)
+		self._configure_history()
+		# ...and indexed in SQLite, with geofence visits, for the history actions
+		self._history_pruned_day = None
+		try:
+			self.history_index = HistoryIndex(self.history_index_file)
+		except Exception as e:
+			self.history_index = None
+			self.logger.error(f"Error opening history database: {str(e)}")
+
+		# Load cached data on startup.  When it is recent enough, devices are
+		# published from it once they have all started (stamped with
+		# warm_start_time, when it was last confirmed), and devices started
+		# later are published from it until the first live poll completes.
+		self.snapshot_store = SnapshotStore(self.cache_file)
+		self.warm_start_time = None
+		self.warm_started = False
+		if self.load_cache():
+			self._configure_warm_start()
 
 
+	########################################
+	def shutdown(self):
+		self.interrupt_waits()
+		if self.geocode_worker is not None:
+			self.geocode_worker.stop()
+		self.save_geocode_cache()
+		self.save_history()
+		if self.history_index is not None:
+			self.history_index.close()
+		if self.geocoder is not None:
+			self.geocoder.close()
+
 	########################################
 	def deviceStartComm(self, device):
 		super().deviceStartComm(device)
 		self.logger.debug("Starting device: " + device.name)
 		device.stateListOrDisplayStateIdChanged()
 
-		if device.id not in self.deviceList:
-			self.update(device)
-			if (device.deviceTypeId == "members"):
-				self.deviceList.append(device.id)
-			elif  (device.deviceTypeId == "geofence"):
-				self.geoDeviceList.append(device.id)
+		with self._state_lock:
+			if device.id not in self.deviceList:
+				self.update(device)
+				self.state_cache.forget(device.id)
+				if (device.deviceTypeId == "members"):
+					self.deviceList.append(device.id)
+				elif  (device.deviceTypeId == "geofence"):
+					self.geoDeviceList.append(device.id)
+					self.compile_geofence(device)
+					# member geofence states depend on the set of fences
+					self.state_cache.reset_timestamps()
+				elif (device.deviceTypeId == "pluginStatus"):
+					self.statusDeviceList.append(device.id)
+					self.update_status_devices()
+				# devices present at startup are published together by warm_start()
+				if self.warm_started and self.warm_start_time is not None:
+					if (device.deviceTypeId == "members"):
+						self.updatedevicestates(device, as_of=self.warm_start_time)
+					elif (device.deviceTypeId == "geofence"):
+						self.updategeodevicestates(device, as_of=self.warm_start_time)
 
 	########################################
 	def deviceStopComm(self, device):
 		self.logger.debug("Stopping device: " + device.name)
-		if device.id in self.deviceList:
-			self.deviceList.remove(device.id)
-		if device.id in self.geoDeviceList:
-			self.geoDeviceList.remove(device.id)
+		with self._state_lock:
+			if device.id in self.deviceList:
+				self.deviceList.remove(device.id)
+			if device.id in self.statusDeviceList:
+				self.statusDeviceList.remove(device.id)
+			if device.id in self.geoDeviceList:
+				self.geoDeviceList.remove(device.id)
+				self.state_cache.reset_timestamps()
+				self.occupancy.forget_fence(device.id)
+				if self.history_index is not None:
+					self.history_index.close_visits(fence_id=device.id)
+			else:
+				self.occupancy.forget_member(device.id)
+				self.trips.forget(device.id)
+				if self.history_index is not None and device.deviceTypeId == "members":
+					# a stopped member's open visits would otherwise count up to now
+					self.history_index.close_visits(member_id=device.address)
+			self.fences.pop(device.id, None)
+			self.address_fixes.pop(device.id, None)
+			self.geocode_retries.discard(device.id)
+			self.fence_index.remove(device.id)
+			self.state_cache.forget(device.id)
 
 	########################################
 	def runConcurrentThread(self):
 		self.logger.debug("Starting concurrent thread")
-		try:
-			pollingFreq = int(self.pluginPrefs['refresh_frequency']) * 1
-		except:
-			pollingFreq = 60
+		self._configure_scheduler()
+		self.logger.debug("Current polling frequency is: " + str(self.scheduler.base_interval) + " seconds")
 
-		self.logger.debug("Current polling frequency is: " + str(pollingFreq) + " seconds")
+		# every device has started by now — publish the cache once, before the first fetch
+		with self._state_lock:
+			if self.warm_start_time is not None:
+				self.warm_start()
+			self.warm_started = True
 
 		iterationcount = 1
-		needs_background_retry = False
 
 		try:
 			while True:
 				if iterationcount > 1:
 					# When auth is broken, slow down to one reminder per 5 minutes
-					# so the log isn't flooded while waiting for the user to update creds
-					self.sleep(300 if self.auth_error else pollingFreq)
+					# so the log isn't flooded while waiting for the user to update creds,
+					# and never poll into a Retry-After cooldown
+					wait = 300 if self.auth_error else self.scheduler.interval
+					if self.retry_backoff.pending:
+						wait = min(wait, self.retry_backoff.remaining())
+					self.wait_for_next_poll(max(wait, self.request_budget.cooldown_remaining()))
 
 				# If auth is broken, just remind the user and skip API calls entirely
 				if self.auth_error:
@@ -208,37 +356,89 @@ class Plugin(indigo.PluginBase):
 					iterationcount += 1
 					continue
 
-				# On first iteration, try without long retries
-				if iterationcount == 1:
-					success = self.get_new_life360json(retry_on_startup=False)
-					if not success and not self.auth_error:
-						self.logger.warning(
-							"Could not retrieve Circles & Members on startup. "
-							"Will retry in background. Devices will update once data is retrieved."
-						)
-						needs_background_retry = True
-				# If we need background retry, do it with long retry delays
-				elif needs_background_retry:
-					self.logger.info("Starting background retry for Circles & Members...")
-					success = self.get_new_life360json(retry_on_startup=True)
-					if success:
+				# While a background retry is pending, polls in between keep
+				# evaluating geofences on the cached data until the retry is due
+				fetched = self.retry_backoff.due()
+				if fetched:
+					retrying = self.retry_backoff.pending
+					if retrying:
+						self.logger.info("Retrying Circles & Members in the background...")
+					success = self.get_new_life360json()
+					if success and retrying:
 						self.logger.info("Background retry succeeded — Circles & Members retrieved")
-						needs_background_retry = False
-				# Normal periodic updates
+						self.retry_backoff.reset()
+					elif not success and not self.auth_error and (retrying or iterationcount == 1):
+						delay = self.retry_backoff.fail()
+						if iterationcount == 1:
+							self.logger.warning(
+								"Could not retrieve Circles & Members on startup. "
+								"Will retry in background. Devices will update once data is retrieved."
+							)
+						self.logger.debug(f"Next background retry in {delay}s")
 				else:
-					self.get_new_life360json(retry_on_startup=False)
+					success = False
 
 				iterationcount += 1
-				self.logger.debug(self.deviceList)
-				for deviceId in self.deviceList:
-					self.update(indigo.devices[deviceId])
-					self.updatedevicestates(indigo.devices[deviceId])
-				for geoDeviceId in self.geoDeviceList:
-					self.updategeodevicestates(indigo.devices[geoDeviceId])
+				# On an unchanged snapshot (304) the occupancy state machines still
+				# advance — that is when dwell timers are running — but only the
+				# members with a committed enter/exit get their states rebuilt
+				with self._state_lock:
+					unchanged = fetched and self.snapshot_unchanged
+					self.logger.debug(self.deviceList)
+					transitioned = self.evaluate_geofences()
+					for deviceId in self.deviceList:
+						if unchanged and deviceId not in transitioned:
+							self.touch_api_update(indigo.devices[deviceId])
+							continue
+						self.update(indigo.devices[deviceId])
+						self.updatedevicestates(indigo.devices[deviceId])
+					for geoDeviceId in self.geoDeviceList:
+						self.updategeodevicestates(indigo.devices[geoDeviceId])
+					self.retry_geocodes()
+					self.expire_trips()
+					self.logger.debug(self.state_cache.stats())
+					self.logger.debug(self.geocode_cache.stats())
+					self.logger.debug(self.request_budget.stats())
+					self.logger.debug(self.snapshot_store.stats())
+					self.save_geocode_cache()
+					self.save_history()
+					self.logger.debug(self.history.stats())
+					# an unchanged snapshot still says who is moving or near a fence;
+					# a failed poll has nothing new to react to, so it backs off
+					activity = self._poll_activity() if success else None
+				self.schedule_next_poll(activity)
 		except self.StopThread:
 			pass
 
 
+	def stopConcurrentThread(self):
+		super().stopConcurrentThread()
+		# don't make Indigo wait out a back-off or the polling interval
+		self.interrupt_waits()
+
+
+	def wait_for_next_poll(self, seconds):
+		"""
+		Sleep until the next poll, or until interrupt_waits() wakes us.
+
+		Replaces self.sleep so that saving the prefs or stopping the plugin
+		takes effect at once instead of after the polling interval.
+		"""
+		self._wake.wait(seconds)
+		self._wake.clear()
+		if self.stopThread:
+			raise self.StopThread
+
+
+	def interrupt_waits(self, wake=True):
+		"""Cancel any Life360 back-off in progress and, with wake, wake the polling loop."""
+		api = self._api
+		if api is not None:
+			api.cancel()
+		if wake:
+			self._wake.set()
+
+
 	########################################
 	def update(self, device):
 		#self.logger.debug(device.name)
@@ -249,6 +449,27 @@ class Plugin(indigo.PluginBase):
 	# UI Validate, Device Config
 	########################################
 	def validateDeviceConfigUi(self, valuesDict, typeId, device):
+		if (typeId == 'geofence' and valuesDict.get('geofence_shape', 'circle') == 'polygon'):
+			if (not valuesDict['geofence_name']):
+				self.logger.error("Geofence name is a required field")
+				errorsDict = indigo.Dict()
+				errorsDict['geofence_name'] = "Geofence name is a required field"
+				return (False, valuesDict, errorsDict)
+
+			try:
+				polygon = geofence.CompiledPolygon.from_props(0, valuesDict)
+			except ValueError as e:
+				self.logger.error("Invalid geofence polygon: " + str(e))
+				errorsDict = indigo.Dict()
+				errorsDict['geofence_polygon'] = "Enter at least 3 corners as lat,long; lat,long; ..."
+				return (False, valuesDict, errorsDict)
+
+			# keep the centre fields meaningful for anything that reads them
+			valuesDict['geofence_lat'] = str(round(polygon.lat, 8))
+			valuesDict['geofence_long'] = str(round(polygon.lon, 8))
+			valuesDict['geofence_radius'] = "0"
+			return (True, valuesDict)
+
 		if (typeId == 'geofence'):
 			if (not valuesDict['geofence_lat']):
 				self.logger.error("Geofence latitude is a required field")
@@ -291,7 +512,8 @@ class Plugin(indigo.PluginBase):
 
 	# assigns the device.address to the value of the member.id
 	def menuChanged(self, valuesDict = None, typeId = None, devId = None):
-		self.create_member_list()
+		if not self.member_list:
+			self.create_member_list()
 		self.logger.debug(self.member_list)
 		if valuesDict['membername'] in self.member_list:
 			tempName = valuesDict['membername']
@@ -302,14 +524,15 @@ class Plugin(indigo.PluginBase):
 
 
 	def populate_places_attributes(self, valuesDict, typeId, devId):
-		if valuesDict['places_name'] in self.places_list:
-			for p in self.placesdata['places']:
-				if (p['name'] == valuesDict['places_name']):
-					# assign the values
-					valuesDict['geofence_name'] = p['name']
-					valuesDict['geofence_lat'] = p['latitude']
-					valuesDict['geofence_long'] = p['longitude']
-					valuesDict['geofence_radius'] = self.convertMetersToKm(float(p['radius']))
+		if not self.places_index:
+			self.create_places_list()
+		p = self.places_index.get(valuesDict['places_name'])
+		if p:
+			# assign the values
+			valuesDict['geofence_name'] = p['name']
+			valuesDict['geofence_lat'] = p['latitude']
+			valuesDict['geofence_long'] = p['longitude']
+			valuesDict['geofence_radius'] = self.convertMetersToKm(float(p['radius']))
 		return valuesDict
 
 
@@ -329,6 +552,44 @@ class Plugin(indigo.PluginBase):
 			errorsDict['refresh_frequency'] = "Invalid entry for Refresh Frequency - must be greater than 15"
 			return (False, valuesDict, errorsDict)
 
+		for field, label in (('geocode_precision', "Address Cache Precision"), ('geocode_cache_ttl', "Address Cache Lifetime")):
+			try:
+				if float(valuesDict.get(field, 1)) <= 0:
+					raise ValueError
+			except ValueError:
+				self.logger.error(f"Invalid entry for {label} - must be a positive number")
+				errorsDict = indigo.Dict()
+				errorsDict[field] = f"Invalid entry for {label} - must be a positive number"
+				return (False, valuesDict, errorsDict)
+
+		try:
+			if float(valuesDict.get('poll_min_interval', 15)) < 15:
+				raise ValueError
+		except ValueError:
+			self.logger.error("Invalid entry for Fastest Refresh Frequency - must be at least 15")
+			errorsDict = indigo.Dict()
+			errorsDict['poll_min_interval'] = "Invalid entry for Fastest Refresh Frequency - must be at least 15"
+			return (False, valuesDict, errorsDict)
+
+		try:
+			if float(valuesDict.get('poll_max_interval', 300)) < int(valuesDict['refresh_frequency']):
+				raise ValueError
+		except ValueError:
+			self.logger.error("Invalid entry for Slowest Refresh Frequency - must be at least the Refresh Frequency")
+			errorsDict = indigo.Dict()
+			errorsDict['poll_max_interval'] = "Invalid entry for Slowest Refresh Frequency - must be at least the Refresh Frequency"
+			return (False, valuesDict, errorsDict)
+
+		for field, label in (('geofence_exit_margin', "Geofence Exit Margin"), ('geofence_dwell', "Geofence Dwell Time"), ('geofence_max_accuracy', "Geofence Maximum GPS Error"), ('poll_speed_threshold', "Moving Speed"), ('poll_boundary_margin', "Geofence Approach Distance"), ('warm_start_max_age', "Startup Cache Age Limit"), ('history_retention_days', "Location History Retention")):
+			try:
+				if float(valuesDict.get(field, 0)) < 0:
+					raise ValueError
+			except ValueError:
+				self.logger.error(f"Invalid entry for {label} - must be zero or a positive number")
+				errorsDict = indigo.Dict()
+				errorsDict[field] = f"Invalid entry for {label} - must be zero or a positive number"
+				return (False, valuesDict, errorsDict)
+
 		# Check if using Bearer Token method or Username/Password method
 		auth_token = valuesDict.get('authorizationtoken', '').strip()
 		username = valuesDict.get('life360_username', '').strip()
@@ -397,10 +658,12 @@ class Plugin(indigo.PluginBase):
 		try:
 			if authorization_token and authorization_token.strip():
 				self.logger.debug("Validating with Bearer Token")
-				api = SyncLife360(access_token=authorization_token.strip(), logger=self.logger)
+				api = SyncLife360(access_token=authorization_token.strip(), logger=self.logger,
+					budget=self.request_budget)
 			elif username and password:
 				self.logger.debug("Validating with Username/Password")
-				api = SyncLife360(username=username, password=password, logger=self.logger)
+				api = SyncLife360(username=username, password=password, logger=self.logger,
+					budget=self.request_budget)
 			else:
 				self.logger.debug("No credentials provided")
 				return False
@@ -409,6 +672,15 @@ class Plugin(indigo.PluginBase):
 				self.logger.debug("Validation of API FAILED")
 				return False
 
+			cooldown = self.request_budget.cooldown_remaining()
+			if cooldown > 0:
+				# don't hold the config dialog for the rest of a Retry-After
+				self.logger.warning(
+					f"Life360 asked us to pause requests for another {cooldown:.0f}s — "
+					"config saved without checking circle access."
+				)
+				return True
+
 			# Quick check — retry=False so we fail fast and don't block the UI thread.
 			# LoginError (403) and RateLimited (429) are transient Life360 server responses
 			# that do NOT mean the credentials are wrong, so we accept those as "valid".
@@ -431,17 +703,12 @@ class Plugin(indigo.PluginBase):
 
 	def load_cache(self):
 		"""Load cached Life360 data from disk if available."""
-		import json
-		import os
-		
 		self.logger.info(f"[Life360 Debug] load_cache checking for cache file at: {self.cache_file}")
-		if not os.path.exists(self.cache_file):
-			self.logger.info("[Life360 Debug] No cache file found - will need to retrieve data from Life360")
-			return False
-		
 		try:
-			with open(self.cache_file, 'r') as f:
-				cache_data = json.load(f)
+			cache_data = self.snapshot_store.load()
+			if cache_data is None:
+				self.logger.info("[Life360 Debug] No cache file found - will need to retrieve data from Life360")
+				return False
 			
 			self.life360data = cache_data.get('life360data', {})
 			self.placesdata = cache_data.get('placesdata', {})
@@ -449,7 +716,10 @@ class Plugin(indigo.PluginBase):
 			self.places_list = cache_data.get('places_list', {})
 			
 			if self.life360data and self.member_list:
-				self.logger.info("Successfully loaded cached Life360 data from previous session")
+				self.logger.info(
+					"Successfully loaded cached Life360 data from previous session "
+					f"(last confirmed {self.snapshot_store.age() / 60:.0f} minutes ago)"
+				)
 				self.create_member_list()
 				self.create_places_list()
 				return True
@@ -461,9 +731,7 @@ class Plugin(indigo.PluginBase):
 			return False
 	
 	def save_cache(self):
-		"""Save Life360 data to disk cache."""
-		import json
-		
+		"""Save Life360 data to disk cache (skipped when the snapshot is unchanged)."""
 		try:
 			cache_data = {
 				'life360data': self.life360data,
@@ -472,16 +740,139 @@ class Plugin(indigo.PluginBase):
 				'places_list': self.places_list
 			}
 			
-			with open(self.cache_file, 'w') as f:
-				json.dump(cache_data, f, indent=2)
-			
-			self.logger.debug("Successfully saved Life360 data to cache")
+			if self.snapshot_store.save(cache_data):
+				self.logger.debug("Successfully saved Life360 data to cache")
+			else:
+				self.logger.debug("Life360 data unchanged — cache not rewritten")
 			return True
 		except Exception as e:
 			self.logger.error(f"Error saving cache: {str(e)}")
 			return False
 
 
+	def _configure_geocode_cache(self):
+		"""Apply the geocode cache settings from the plugin prefs."""
+		try:
+			precision = float(self.pluginPrefs.get('geocode_precision', 25))
+			ttl_hours = float(self.pluginPrefs.get('geocode_cache_ttl', 168))
+		except (TypeError, ValueError):
+			precision, ttl_hours = 25.0, 168.0
+		self.geocode_cache.configure(precision_m=precision, ttl=ttl_hours * 3600)
+
+	def _configure_history(self):
+		"""Apply the location history retention from the plugin prefs (0 turns it off)."""
+		try:
+			self.history.retention_days = float(self.pluginPrefs.get('history_retention_days', 30))
+		except (TypeError, ValueError):
+			self.history.retention_days = 30.0
+
+	def _configure_occupancy(self):
+		"""Apply the geofence hysteresis/dwell settings from the plugin prefs."""
+		try:
+			# 0 (no hysteresis) unless chosen, so upgraded installs keep the plain radius check
+			exit_margin = float(self.pluginPrefs.get('geofence_exit_margin', 0))
+			dwell = float(self.pluginPrefs.get('geofence_dwell', 0))
+			max_accuracy = float(self.pluginPrefs.get('geofence_max_accuracy', 0))
+		except (TypeError, ValueError):
+			exit_margin, dwell, max_accuracy = 0.0, 0.0, 0.0
+		self.occupancy.configure(
+			exit_margin_km=self.convertMetersToKm(exit_margin),
+			dwell_seconds=dwell,
+			max_accuracy_km=self.convertMetersToKm(max_accuracy) if max_accuracy > 0 else None,
+		)
+
+	def _configure_warm_start(self):
+		"""Decide whether the cached snapshot is fresh enough to publish at startup."""
+		try:
+			max_age = float(self.pluginPrefs.get('warm_start_max_age', 60)) * 60
+		except (TypeError, ValueError):
+			max_age = 3600.0
+		age = self.snapshot_store.age()
+		if max_age > 0 and age is not None and age <= max_age:
+			self.warm_start_time = datetime.datetime.fromtimestamp(self.snapshot_store.confirmed_at)
+			self.logger.debug(f"Cached snapshot is {age:.0f}s old — publishing it to devices as they start")
+		else:
+			self.warm_start_time = None
+
+
+	def _configure_scheduler(self):
+		"""Apply the adaptive polling settings from the plugin prefs."""
+		try:
+			base = float(self.pluginPrefs.get('refresh_frequency', 30))
+			min_interval = float(self.pluginPrefs.get('poll_min_interval', 15))
+			max_interval = float(self.pluginPrefs.get('poll_max_interval', 300))
+			self.poll_speed_threshold = float(self.pluginPrefs.get('poll_speed_threshold', 5))
+			self.poll_boundary_margin_km = self.convertMetersToKm(float(self.pluginPrefs.get('poll_boundary_margin', 200)))
+		except (TypeError, ValueError):
+			base, min_interval, max_interval = 60.0, 15.0, 300.0
+			self.poll_speed_threshold, self.poll_boundary_margin_km = 5.0, 0.2
+		# off unless chosen, so upgraded installs keep their configured interval
+		if not self.pluginPrefs.get('adaptive_polling', False):
+			# a fixed interval, as before adaptive polling
+			min_interval = max_interval = base
+		self.scheduler.configure(
+			base_interval=base,
+			min_interval=min(min_interval, base),
+			max_interval=max(max_interval, base),
+		)
+
+	def save_geocode_cache(self):
+		"""Persist the reverse-geocode cache if it has new entries."""
+		try:
+			if self.geocode_cache.save():
+				self.logger.debug("Saved geocode cache")
+		except Exception as e:
+			self.logger.error(f"Error saving geocode cache: {str(e)}")
+
+
+	def save_history(self):
+		"""Write the fixes and visits buffered this poll to the history files and database."""
+		try:
+			self.history.flush()
+		except Exception as e:
+			self.logger.error(f"Error writing location history: {str(e)}")
+		if self.history_index is None:
+			return
+		try:
+			self.history_index.commit()
+			today = datetime.date.today()
+			if self.history.retention_days and today != self._history_pruned_day:
+				self._history_pruned_day = today
+				self.history_index.prune(time.time() - self.history.retention_days * 86400)
+		except Exception as e:
+			self.logger.error(f"Error writing history database: {str(e)}")
+
+
+	def _address_resolved(self, device_id, lat, lon, address):
+		"""Called on the geocoder thread when a member's address comes back."""
+		if device_id not in self.deviceList:
+			return
+		# an older lookup finishing after the member moved on must not
+		# overwrite the address for the member's current grid cell
+		current = self.address_fixes.get(device_id)
+		if current is None or self.geocode_cache.key(*current) != self.geocode_cache.key(lat, lon):
+			self.logger.debug(f"Discarding stale address for device {device_id}")
+			return
+		if address is None:
+			# keep the address already shown and ask again on the next poll
+			self.geocode_retries.add(device_id)
+			return
+		self.geocode_retries.discard(device_id)
+		changed_states = self.state_cache.diff(device_id, [{'key': 'member_closest_address', 'value': address}])
+		if changed_states:
+			indigo.devices[device_id].updateStatesOnServer(changed_states)
+
+
+	def retry_geocodes(self):
+		"""Resubmit the members whose last address lookup failed, for their current fix."""
+		for device_id in self.geocode_retries.copy():
+			current = self.address_fixes.get(device_id)
+			if current is None or device_id not in self.deviceList:
+				self.geocode_retries.discard(device_id)
+			elif self.geocode_worker is not None and self.geocode_worker.submit(device_id, *current):
+				self.geocode_retries.discard(device_id)
+
+
 	def get_member_list(self, filter="", valuesDict=None, typeId="", targetId=0):
 		if not self.member_list:
 			self.create_member_list()
@@ -501,23 +892,30 @@ class Plugin(indigo.PluginBase):
 		"""Return the circle UUID from user input, or None if empty."""
 		return raw.strip() if raw and raw.strip() else None
 
-	def get_new_life360json(self, retry_on_startup=False):
+	def get_new_life360json(self):
 		"""
 		Get Life360 circles and member data.
-		
-		Args:
-			retry_on_startup: If True, will do long retries (for background updates).
-							 If False, will fail fast and return quickly (for startup).
+
+		Fails fast: requests are not retried with long waits here.  A failed
+		poll is retried later by the polling loop's background back-off.
 		"""
+		with self._api_lock:
+			return self._get_new_life360json()
+
+	def _get_new_life360json(self):
+		# cleared up front so no failure path can leave last poll's True behind
+		self.snapshot_unchanged = False
 		try:
 			# Reuse the persistent API client if we have one; otherwise create it.
 			# Keeping the same SyncLife360 instance preserves the aiohttp session
 			# and cookies across polling cycles — matching how HA handles this.
 			if self._api is None:
 				if self.authorization_token and self.authorization_token.strip():
-					self._api = SyncLife360(access_token=self.authorization_token.strip(), logger=self.logger)
+					self._api = SyncLife360(access_token=self.authorization_token.strip(), logger=self.logger,
+						budget=self.request_budget)
 				elif self.username and self.password:
-					self._api = SyncLife360(username=self.username, password=self.password, logger=self.logger)
+					self._api = SyncLife360(username=self.username, password=self.password, logger=self.logger,
+						budget=self.request_budget)
 				else:
 					self.logger.error("No authentication credentials configured")
 					return False
@@ -532,16 +930,41 @@ class Plugin(indigo.PluginBase):
 				self.logger.debug("Attempting to get list of circles and places")
 				if self.circle_id_override:
 					self.logger.debug(f"Using Circle ID override: {self.circle_id_override}")
-					circle_id = self.circle_id_override
-				else:
-					circles = api.get_circles(retry=retry_on_startup)
-					circle_id = circles[0]['id']
-				circle = api.get_circle(circle_id, retry=retry_on_startup)
-				places = api.get_circle_places(circle_id, retry=retry_on_startup)
-				self.life360data = circle
-				self.placesdata = places
-				self.create_member_list()
-				self.create_places_list()
+				# Members, places and circles are fetched together in one batch.
+				# With an override the circles call is skipped entirely; otherwise
+				# the circle found on the previous poll is reused and the circles
+				# list is refreshed alongside the other two requests.
+				# Once we hold a snapshot, poll conditionally — Life360 answers 304
+				# for the (usual) case where nothing changed since the last poll.
+				snapshot = api.get_snapshot(
+					circle_id=self.circle_id_override or self.circle_id,
+					include_circles=not self.circle_id_override,
+					retry=False,
+					raise_not_modified=bool(self.life360data),
+				)
+				self.circle_id = snapshot['circle_id']
+				if snapshot['circles'] and not self.circle_id_override:
+					self.circle_id = snapshot['circles'][0]['id']
+				# live data from here on — devices started later aren't warm-started
+				self.warm_start_time = None
+				if not snapshot['modified']:
+					self.logger.debug("Life360 data not modified since last poll — reusing previous snapshot")
+					self.snapshot_unchanged = True
+					try:
+						# keeps the cache's age "since last confirmed" for the next warm start
+						self.snapshot_store.confirm()
+					except OSError as e:
+						self.logger.debug(f"Could not mark snapshot cache as current: {e}")
+					return True
+				# the indexes are rebuilt in place; don't let a poll or refresh
+				# on another thread read them half-built
+				with self._state_lock:
+					if snapshot['members'] is not None:
+						self.life360data = snapshot['members']
+					if snapshot['places'] is not None:
+						self.placesdata = snapshot['places']
+					self.create_member_list()
+					self.create_places_list()
 				
 				# Save to cache on success
 				self.save_cache()
@@ -549,7 +972,9 @@ class Plugin(indigo.PluginBase):
 				return True
 			except Exception as e:
 				from life360.exceptions import LoginError, Unauthorized
-				if isinstance(e, Unauthorized):
+				if isinstance(e, RetryCancelled):
+					self.logger.debug("Life360 request cancelled while backing off")
+				elif isinstance(e, Unauthorized):
 					# 401 = definitively bad/expired token, stop retrying
 					self.auth_error = True
 					self.logger.error(
@@ -578,15 +1003,19 @@ class Plugin(indigo.PluginBase):
 		if not self.life360data.get('members'):
 			return
 		self.member_list.clear()
+		self.member_index.clear()
 		for m in self.life360data['members']:
 			self.member_list[m['firstName']] = m['id']
+			self.member_index[m['id']] = m
 
 	def create_places_list(self):
 		if not self.placesdata.get('places'):
 			return
 		self.places_list.clear()
+		self.places_index.clear()
 		for p in self.placesdata['places']:
 			self.places_list[p['name']] = p['id']
+			self.places_index[p['name']] = p
 		self.logger.debug("creating places_list")
 		self.logger.debug(self.places_list)
 
@@ -601,20 +1030,31 @@ class Plugin(indigo.PluginBase):
 		self.password = self.pluginPrefs.get('life360_password', None)
 		self.refresh_frequency = self.pluginPrefs.get('refresh_frequency', 30)
 		self.debug = self.pluginPrefs.get('showDebugInfo', False)
+		self._configure_geocode_cache()
+		self._configure_occupancy()
+		self._configure_scheduler()
+		self._configure_history()
 		self.circle_id_override = self._parse_circle_id(
 			self.pluginPrefs.get('circle_id_override', '')
 		)
 		if self.circle_id_override:
 			self.logger.info(f"Circle ID override set: {self.circle_id_override}")
-		# Close the old session so the next poll starts a fresh one with new credentials
-		if self._api is not None:
-			try:
-				self._api.close()
-			except Exception:
-				pass
-			self._api = None
+		# Abandon any back-off on the old credentials first, so the lock below
+		# isn't held up by it, then close the old session so the next poll
+		# starts a fresh one with new credentials
+		self.interrupt_waits(wake=False)
+		with self._api_lock:
+			if self._api is not None:
+				try:
+					self._api.close()
+				except Exception:
+					pass
+				self._api = None
+		self.circle_id = None
 		# Clear any auth error so the polling loop retries immediately
 		self.auth_error = False
+		self.retry_backoff.reset()
+		self._wake.set()
 		self.logger.info("Plugin preferences saved — resuming Life360 data polling")
 
 	########################################
@@ -646,11 +1086,86 @@ class Plugin(indigo.PluginBase):
 
 
 	def refresh_member_data(self,pluginAction, device):
-		self.get_new_life360json()
-		self.updatedevicestates(device)
+		# a snapshot takes up to 3 requests; rather than queue behind the budget
+		# (and hold up the background poll), refresh from the data we have
+		wait = self.request_budget.wait_time(3)
+		if wait > 0:
+			self.logger.info(f"Life360 request budget is spent for the next {wait:.0f}s — "
+				f"refreshing {device.name} from the last poll")
+		else:
+			# a manual refresh supersedes whatever the polling loop is backing off on
+			self.interrupt_waits(wake=False)
+			if self.get_new_life360json():
+				self.retry_backoff.reset()
+		with self._state_lock:
+			self.evaluate_geofences()
+			# an explicit refresh rewrites every state, changed or not
+			self.state_cache.forget(device.id)
+			self.updatedevicestates(device)
+		self.update_status_devices()
 		return
 
 
+	def get_member_device_list(self, filter="", valuesDict=None, typeId="", targetId=0):
+		return [("all", "All Members")] + [(d, indigo.devices[d].name) for d in self.deviceList]
+
+
+	def get_variable_list(self, filter="", valuesDict=None, typeId="", targetId=0):
+		return [("none", "- Event Log only -")] + [(v.id, v.name) for v in indigo.variables]
+
+
+	def _history_period(self, period):
+		"""Return (start, end, description) in epoch seconds for a history action period."""
+		now = datetime.datetime.now()
+		midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+		if period == "today":
+			start, label = midnight, "today"
+		elif period == "this_week":
+			start, label = midnight - datetime.timedelta(days=now.weekday()), "this week"
+		elif period == "this_month":
+			start, label = midnight.replace(day=1), "this month"
+		else:
+			start, label = now - datetime.timedelta(days=7), "in the last 7 days"
+		return start.timestamp(), now.timestamp(), label
+
+
+	def _report_history(self, props, message, value):
+		indigo.server.log(message)
+		variable = props.get('variable', 'none')
+		if variable and variable != 'none':
+			indigo.variable.updateValue(int(variable), value=str(value))
+
+
+	def time_in_geofence(self, pluginAction, device):
+		if self.history_index is None:
+			self.logger.error("History database is not available")
+			return
+		self.save_history()
+		props = pluginAction.props
+		start, end, label = self._history_period(props.get('period', 'this_week'))
+		member = props.get('member', 'all')
+		member_id = None if member in ("", "all") else indigo.devices[int(member)].address
+		seconds = self.history_index.time_in_fence(device.id, start, end, member_id=member_id)
+		who = "All members" if member_id is None else indigo.devices[int(member)].name
+		hours = round(seconds / 3600.0, 2)
+		self._report_history(props, f"{who} spent {hours} hours in {device.name} {label}", hours)
+
+
+	def last_visit_to_place(self, pluginAction, device):
+		if self.history_index is None:
+			self.logger.error("History database is not available")
+			return
+		self.save_history()
+		props = pluginAction.props
+		place = props.get('place', '')
+		timestamp = self.history_index.last_visit(place, member_id=device.address)
+		if timestamp is None:
+			self._report_history(props, f"{device.name} has no recorded visit to {place}", "")
+			return
+		when = datetime.datetime.fromtimestamp(timestamp).strftime("%m/%d/%Y %I:%M %p")
+		self._report_history(props, f"{device.name} was last at {place} on {when}", when)
+
+
 	def create_quick_geofence(self, pluginAction, device):
 		self.logger.info("Action called for creation of temporary geofence")
 		# get member information 
@@ -697,21 +1212,132 @@ class Plugin(indigo.PluginBase):
 		return radius_meters / 1000
 
 
-	def isInsideGeoFence(self, device, memberLat, memberLong):
-		fenceLat = device.pluginProps['geofence_lat']
-		fenceLong =  device.pluginProps['geofence_long']
-		fenceRadius =  device.pluginProps['geofence_radius']
-		
-		center = Point(fenceLat, fenceLong)
-		
-		memberPoint = Point(memberLat, memberLong)
+	def compile_geofence(self, device):
+		"""Parse a geofence device's props once into the record the evaluation uses."""
+		try:
+			fence = geofence.compile_fence(device.id, device.pluginProps)
+			self.fences[device.id] = fence
+			self.fence_index.add(fence)
+			if fence.polygon:
+				device.updateStatesOnServer([
+					{'key': 'geofence_area_sq_m', 'value': round(fence.area_m2)},
+					{'key': 'geofence_perimeter_m', 'value': round(fence.perimeter_m)},
+				])
+		except ValueError as e:
+			self.fences.pop(device.id, None)
+			self.fence_index.remove(device.id)
+			self.logger.error("Geofence " + device.name + " has an invalid shape, latitude, longitude or radius: " + str(e))
+
+
+	def _member_coordinates(self, device):
+		"""
+		Return (lat, long, accuracy in km) for a member device from the snapshot,
+		falling back to its states.  Accuracy is None when unknown.
+		"""
+		m = self.member_index.get(device.address)
+		try:
+			if m and m.get('location'):
+				loc = m['location']
+				try:
+					accuracy = self.convertMetersToKm(float(loc.get('accuracy')))
+				except (TypeError, ValueError):
+					accuracy = None
+				return float(loc['latitude']), float(loc['longitude']), accuracy
+			return float(device.states['member_lat']), float(device.states['member_long']), None
+		except (KeyError, TypeError, ValueError):
+			return None
 
-		distance = great_circle(center, memberPoint).km
-		
-		return distance <= float(fenceRadius)
+
+	def evaluate_geofences(self, record_visits=True):
+		"""
+		Evaluate every member device against every geofence device in one batch,
+		then advance the enter/exit state machines with the result.  Returns the
+		ids of the members with a committed enter or exit.
+		"""
+		members = []
+		for deviceId in self.deviceList:
+			coords = self._member_coordinates(indigo.devices[deviceId])
+			if coords:
+				members.append((deviceId,) + coords)
+		fences = [self.fences[d] for d in self.geoDeviceList if d in self.fences]
+		self.geofence_result = geofence.evaluate([m[:3] for m in members], fences, self.fence_index)
+		now = time.time()
+		transitions = self.occupancy.update(members, self.fences, self.geofence_result, now)
+		for memberId, fenceId, entered in transitions:
+			self.logger.debug(indigo.devices[memberId].name + (" entered " if entered else " left ") + self.fences[fenceId].name)
+			# member_within_geofence must be rewritten even if the fix itself didn't move
+			self.state_cache.expire_location(memberId)
+		if record_visits and self.history_index is not None:
+			if not self.history.retention_days:
+				# history is off: record nothing, and end any visits left open
+				# from before it was turned off (nothing would ever prune them)
+				self.history_index.close_visits(now=now)
+			else:
+				# visits follow the debounced occupancy, not the raw fixes
+				for memberId in (m[0] for m in members):
+					inside = {f: self.fences[f].name for f in self.occupancy.fences_for(memberId) if f in self.fences}
+					self.history_index.update_visits(indigo.devices[memberId].address, inside, now)
+		return {memberId for memberId, fenceId, entered in transitions}
+
+
+	def warm_start(self):
+		"""
+		Publish member and geofence states from the cached snapshot.
+
+		Runs once, after every device has started and before the first live
+		poll, so devices show the last known data within moments of a
+		restart.  Everything is stamped with the time the cache was last
+		confirmed.  The states written here seed the state cache, so the live
+		poll then only writes what changed.  Cached positions may be stale,
+		so no geofence visits are recorded from them.
+		"""
+		self.evaluate_geofences(record_visits=False)
+		for deviceId in self.deviceList:
+			self.updatedevicestates(indigo.devices[deviceId], as_of=self.warm_start_time)
+		for geoDeviceId in self.geoDeviceList:
+			self.updategeodevicestates(indigo.devices[geoDeviceId], as_of=self.warm_start_time)
 
 
-	def updategeodevicestates(self, device):
+	def _poll_activity(self):
+		"""Return why the next poll should come soon, or None if every member is settled."""
+		fences = [self.fences[d] for d in self.geoDeviceList if d in self.fences]
+		for deviceId in self.deviceList:
+			device = indigo.devices[deviceId]
+			activity = member_activity(self.member_index.get(device.address), self.poll_speed_threshold)
+			if activity:
+				return device.name + " " + activity
+			coords = self._member_coordinates(device)
+			if coords and self.poll_boundary_margin_km > 0:
+				fence = geofence.near_boundary(coords[0], coords[1], fences, self.poll_boundary_margin_km)
+				if fence is not None:
+					return device.name + " near " + fence.name
+		return None
+
+
+	def schedule_next_poll(self, activity=None):
+		"""Pick the delay before the next poll and publish it on the status devices."""
+		interval = self.scheduler.next_interval(activity)
+		self.logger.debug(f"Next poll in {interval:g} seconds ({self.scheduler.reason})")
+		self.update_status_devices()
+
+
+	def update_status_devices(self):
+		"""Push the polling loop's state to every Life360 Plugin Status device."""
+		next_poll = datetime.datetime.now() + datetime.timedelta(seconds=self.scheduler.interval)
+		device_states = [
+			{'key': 'poll_interval', 'value': round(self.scheduler.interval)},
+			{'key': 'poll_reason', 'value': self.scheduler.reason},
+			{'key': 'next_poll', 'value': next_poll.strftime("%m/%d/%Y %I:%M:%S %p")},
+			{'key': 'api_requests_available', 'value': self.request_budget.remaining()},
+			{'key': 'api_cooldown', 'value': round(self.request_budget.cooldown_remaining())},
+		]
+		for deviceId in self.statusDeviceList:
+			changed_states = self.state_cache.diff(deviceId, device_states)
+			if changed_states:
+				indigo.devices[deviceId].updateStatesOnServer(changed_states)
+
+
+	def updategeodevicestates(self, device, as_of=None):
 		device_states = []
 		self.logger.debug("Updating Geofence device: " + device.name)
 		prevMemberCount = int(device.states['number_of_members_in_geofence'])
@@ -720,22 +1346,18 @@ class Plugin(indigo.PluginBase):
 		memberCount = 0
 		memberList = []
 		occupied = False
-		x = datetime.datetime.now()
+		x = as_of or datetime.datetime.now()
 		cur_date_time = x.strftime("%m/%d/%Y %I:%M %p")
 
-		for deviceId in self.deviceList:
-			# self.logger.debug(deviceId)
+		# occupancy comes from the debounced state machines, advanced once per poll
+		for deviceId in self.occupancy.members_in(device.id, order=self.deviceList):
+			if deviceId not in self.deviceList:
+				continue
 			dev = indigo.devices[deviceId]
-			loclat = float(dev.states['member_lat'])
-			loclng = float(dev.states['member_long'])
-			#self.logger.debug(dev.states)
-			self.logger.debug("Checking member " + dev.states['member_first_name'] + " to see if they are in the fence")
-			isFenced = self.isInsideGeoFence(device, loclat, loclng)
-			if (isFenced):
-				self.logger.debug("Member " + dev.states['member_first_name'] + " is in the fence")
-				memberCount += 1
-				memberList.append(dev.states['member_first_name'])
-				occupied = True
+			self.logger.debug("Member " + dev.states['member_first_name'] + " is in the fence")
+			memberCount += 1
+			memberList.append(dev.states['member_first_name'])
+			occupied = True
 
 		
 		if (memberCount > 0):
@@ -750,28 +1372,93 @@ class Plugin(indigo.PluginBase):
 		device_states.append({'key': 'members_in_geofence','value': ', '.join(memberList) })
 		device_states.append({'key': 'number_of_members_in_geofence','value': memberCount })
 		device_states.append({'key': 'occupied','value': occupied })
-		device_states.append({'key': 'last_update','value': cur_date_time })
-
-		if (memberCount > 0):
-			device.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-		else:
-			device.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
 
+		# only a real enter/exit changes the occupancy states, so triggers on
+		# them fire once per transition; last_update is written every poll
+		changed_states = self.state_cache.diff(device.id, device_states)
+		if changed_states:
+			if (memberCount > 0):
+				device.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
+			else:
+				device.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+		changed_states.append({'key': 'last_update','value': cur_date_time })
 
-		device.updateStatesOnServer(device_states)
+		device.updateStatesOnServer(changed_states)
 
 
-	def updatedevicestates(self, device):
+	def record_history(self, member):
+		"""Buffer a member's current fix for the location history."""
+		if not self.history.retention_days:
+			return
+		loc = member['location']
+		try:
+			if not self.history.append(member['id'], float(loc['timestamp']), loc['latitude'], loc['longitude'],
+				accuracy=loc.get('accuracy'), speed=loc.get('speed'), battery=loc.get('battery')):
+				return
+			if self.history_index is not None:
+				self.history_index.add_fix(member['id'], float(loc['timestamp']), loc['latitude'], loc['longitude'],
+					accuracy=float(loc.get('accuracy') or 0), speed=float(loc.get('speed') or 0),
+					battery=float(loc.get('battery') or 0), place=loc.get('name'))
+		except (KeyError, TypeError, ValueError) as e:
+			self.logger.debug("Skipping history record for " + str(member.get('firstName')) + ": " + str(e))
+
+
+	def trip_states(self, device, member):
+		"""Feed a member's new fix to the trip detector; return last_trip_* states if a trip ended."""
+		loc = member['location']
+		try:
+			lat, lon = float(loc['latitude']), float(loc['longitude'])
+			speed = float(loc.get('speed') or 0)
+			speed_mph = 2.2 * speed if speed > 0 else 0.0
+			fenced = [d for d in self.occupancy.fences_for(device.id, order=self.geoDeviceList) if d in self.fences]
+			place = loc.get('name') or (self.fences[fenced[0]].name if fenced else f"{lat:.5f}, {lon:.5f}")
+			trip = self.trips.update(device.id, float(loc['timestamp']), lat, lon, speed_mph,
+				in_transit=str(loc.get('inTransit', '0')) == '1', place=place)
+		except (KeyError, TypeError, ValueError) as e:
+			self.logger.debug("Skipping trip detection for " + device.name + ": " + str(e))
+			return []
+		if trip is None:
+			return []
+		return self._trip_states(device, trip)
+
+
+	def expire_trips(self):
+		"""End the trips of members who have stopped but sent no new fix since."""
+		now = time.time()
+		for deviceId in self.deviceList:
+			trip = self.trips.expire(deviceId, now)
+			if trip is not None:
+				device = indigo.devices[deviceId]
+				device.updateStatesOnServer(self._trip_states(device, trip))
+
+
+	def _trip_states(self, device, trip):
+		miles = trip.distance_km / 1.609344
+		self.logger.info(f"{device.name} travelled {miles:.1f} miles from {trip.start_place} to {trip.end_place}")
+		return [
+			{'key': 'last_trip_start', 'value': datetime.datetime.fromtimestamp(trip.start_time).strftime("%m/%d/%Y %I:%M %p")},
+			{'key': 'last_trip_end', 'value': datetime.datetime.fromtimestamp(trip.end_time).strftime("%m/%d/%Y %I:%M %p")},
+			{'key': 'last_trip_from', 'value': trip.start_place},
+			{'key': 'last_trip_to', 'value': trip.end_place},
+			{'key': 'last_trip_distance', 'value': round(miles, 1)},
+			{'key': 'last_trip_distance_km', 'value': round(trip.distance_km, 1)},
+			{'key': 'last_trip_max_speed', 'value': round(trip.max_speed_mph)},
+			{'key': 'last_trip_avg_speed', 'value': round(trip.avg_speed_mph)},
+		]
+
+
+	def touch_api_update(self, device, as_of=None):
+		# last_api_update is written on every poll, bypassing the state cache
+		x = as_of or datetime.datetime.now()
+		device.updateStateOnServer('last_api_update', x.strftime("%m/%d/%Y %I:%M %p"))
+
+	def updatedevicestates(self, device, as_of=None):
+		# as_of stamps the states with the time of a cached snapshot (warm start)
 
 		device_states = []
 		member_device = device.pluginProps['membername']
 		member_device_address = device.address
 		self.logger.debug("Updating device: " + member_device)
-		try: 
-			geocoder = Nominatim(user_agent='life360')
-		except:
-			self.logger.error("Error instantiating geocoder object")
-		pass
 
 
 		try:
@@ -783,84 +1470,97 @@ class Plugin(indigo.PluginBase):
 			return
 
 
-		if self.life360data['members']:
-			for m in self.life360data['members']:
-				if ((m['id'] == member_device_address) and (m['location'])):
-					x = datetime.datetime.now()
-					cur_date_time = x.strftime("%m/%d/%Y %I:%M %p")
-
-					# the raw speed from Life360 is exstimated to be MPH/2.2
-					adjustedSpeed = self.mphSpeed(float(m['location']['speed']))
-
-					# the raw speed from Life360 is exstimated to be mph * 1.609344
-					adjustedSpeedkm = self.kphSpeed(float(m['location']['speed']))
-
-					# the raw Life360 isDriving boolean always comes back 0. Let's use speed to determine isDriving for Indigo
-					adjustedDriving = self.isDriving(float(adjustedSpeed))
-
-					device_states.append({'key': 'member_id','value': m['id'] })
-					device_states.append({'key': 'member_avatar','value': m['avatar'] })
-					device_states.append({'key': 'member_first_name','value': m['firstName'] })
-					device_states.append({'key': 'member_last_name','value': m['lastName'] })
-					device_states.append({'key': 'member_phone_num','value': m['loginPhone']})
-					device_states.append({'key': 'member_email','value': m['loginEmail']})
-					device_states.append({'key': 'last_api_update','value': str(cur_date_time)})
-					device_states.append({'key': 'member_360_location','value': m['location']['name']})
-					device_states.append({'key': 'member_battery','value': m['location']['battery']})
-					device_states.append({'key': 'batteryLevel','value': int(float(m['location']['battery']))})
-					device_states.append({'key': 'member_wifi','value': m['location']['wifiState']})
-					device_states.append({'key': 'member_battery_charging','value': m['location']['charge']})
-					device_states.append({'key': 'member_in_transit','value': m['location']['inTransit']})
-					device_states.append({'key': 'member_driveSDKStatus','value': m['location']['driveSDKStatus']})
-					device_states.append({'key': 'member_lat','value': float(m['location']['latitude'])})
-					device_states.append({'key': 'member_long','value': float(m['location']['longitude'])})
-					device_states.append({'key': 'member_is_driving','value': adjustedDriving })
-					device_states.append({'key': 'member_speed','value': adjustedSpeed })
-					device_states.append({'key': 'member_speed_km','value': adjustedSpeedkm })
-					
-
-					try: 
-						# get address from lat long information 
-						loclat = float(m['location']['latitude'])
-						loclng = float(m['location']['longitude'])
-						geoloc = geocoder.reverse((loclat, loclng))
-						currentaddress = geoloc
-					except Exception as g:
-						self.logger.debug(u"Geocoder error")
-						currentaddress = "-geocoder error-"
-
-					try:
-						device_states.append({'key': 'member_closest_address','value': str(currentaddress) })
-					except:
-						device_states.append({'key': 'member_closest_address','value': "" })
-
+		m = self.member_index.get(member_device_address)
+		if m and m['location']:
+			# nothing else to do if Life360 hasn't reported a new fix for this
+			# member, but last_api_update still records that it was polled
+			if self.state_cache.location_unchanged(device.id, m['location'].get('timestamp')):
+				self.logger.debug("Location unchanged for " + member_device + " — skipping update")
+				self.touch_api_update(device, as_of)
+				return
+
+			x = as_of or datetime.datetime.now()
+			cur_date_time = x.strftime("%m/%d/%Y %I:%M %p")
+
+			# a warm start replays cached fixes that are already in the history
+			# and already went through the trip detector
+			if as_of is None:
+				self.record_history(m)
+				device_states.extend(self.trip_states(device, m))
+
+			# the raw speed from Life360 is exstimated to be MPH/2.2
+			adjustedSpeed = self.mphSpeed(float(m['location']['speed']))
+
+			# the raw speed from Life360 is exstimated to be mph * 1.609344
+			adjustedSpeedkm = self.kphSpeed(float(m['location']['speed']))
+
+			# the raw Life360 isDriving boolean always comes back 0. Let's use speed to determine isDriving for Indigo
+			adjustedDriving = self.isDriving(float(adjustedSpeed))
+
+			device_states.append({'key': 'member_id','value': m['id'] })
+			device_states.append({'key': 'member_avatar','value': m['avatar'] })
+			device_states.append({'key': 'member_first_name','value': m['firstName'] })
+			device_states.append({'key': 'member_last_name','value': m['lastName'] })
+			device_states.append({'key': 'member_phone_num','value': m['loginPhone']})
+			device_states.append({'key': 'member_email','value': m['loginEmail']})
+			device_states.append({'key': 'member_360_location','value': m['location']['name']})
+			device_states.append({'key': 'member_battery','value': m['location']['battery']})
+			device_states.append({'key': 'batteryLevel','value': int(float(m['location']['battery']))})
+			device_states.append({'key': 'member_wifi','value': m['location']['wifiState']})
+			device_states.append({'key': 'member_battery_charging','value': m['location']['charge']})
+			device_states.append({'key': 'member_in_transit','value': m['location']['inTransit']})
+			device_states.append({'key': 'member_driveSDKStatus','value': m['location']['driveSDKStatus']})
+			device_states.append({'key': 'member_lat','value': float(m['location']['latitude'])})
+			device_states.append({'key': 'member_long','value': float(m['location']['longitude'])})
+			device_states.append({'key': 'member_is_driving','value': adjustedDriving })
+			device_states.append({'key': 'member_speed','value': adjustedSpeed })
+			device_states.append({'key': 'member_speed_km','value': adjustedSpeedkm })
+			
 
-					if (m['location']['since']):
-						sincedate = datetime.datetime.fromtimestamp(m['location']['since'])
-						sincedatestr  = sincedate.strftime("%m/%d/%Y %I:%M %p")
-						device_states.append({'key': 'member_location_since_datetime','value': sincedatestr})
-					else: 
-						device_states.append({'key': 'member_location_since_datetime','value': ''})
+			# get address from lat long information — the cache answers for
+			# members who are still within the same grid cell as last time.
+			# Anything else goes to the geocoder thread, and member_closest_address
+			# is filled in by _address_resolved once the lookup finishes.
+			loclat = float(m['location']['latitude'])
+			loclng = float(m['location']['longitude'])
+			self.address_fixes[device.id] = (loclat, loclng)
+			currentaddress = self.geocode_cache.get(loclat, loclng)
+			if currentaddress is not None:
+				self.geocode_retries.discard(device.id)
+				device_states.append({'key': 'member_closest_address','value': currentaddress })
+				# a lookup still queued for an earlier cell would only overwrite this
+				if self.geocode_worker is not None:
+					self.geocode_worker.cancel(device.id)
+			elif self.geocode_worker is None:
+				device_states.append({'key': 'member_closest_address','value': "-geocoder error-" })
+			elif not self.geocode_worker.submit(device.id, loclat, loclng):
+				self.logger.debug("Geocoder queue full — address for " + member_device + " not refreshed")
+
+
+			if (m['location']['since']):
+				sincedate = datetime.datetime.fromtimestamp(m['location']['since'])
+				sincedatestr  = sincedate.strftime("%m/%d/%Y %I:%M %p")
+				device_states.append({'key': 'member_location_since_datetime','value': sincedatestr})
+			else: 
+				device_states.append({'key': 'member_location_since_datetime','value': ''})
+
+			# read from the per-poll geofence state machines rather than re-testing every fence
+			fenced = [d for d in self.occupancy.fences_for(device.id, order=self.geoDeviceList) if d in self.fences]
+			if fenced:
+				device_states.append({'key': 'member_within_geofence','value': self.fences[fenced[0]].name})
+			else:
+				device_states.append({'key': 'member_within_geofence','value': 'None'})
+			
 
-					if (m['location']['name'] == "Home"):
-						device.updateStateImageOnServer(indigo.kStateImageSel.MotionSensorTripped)
-					else:
-						device.updateStateImageOnServer(indigo.kStateImageSel.NoImage)
-
-					for deviceId in self.geoDeviceList:
-						# call the update method with the device instance
-						isFenced = self.isInsideGeoFence(indigo.devices[deviceId], loclat, loclng)
-						if (isFenced):
-							#self.logger.debug(m['firstName'] + ' is within the geofence named ' + indigo.devices[deviceId].pluginProps['geofence_name'])
-							device_states.append({'key': 'member_within_geofence','value': indigo.devices[deviceId].pluginProps['geofence_name']}) 
-						else:
-							#self.logger.debug(m['firstName'] + ' is not in the fence named ' + indigo.devices[deviceId].pluginProps['geofence_name'])
-							device_states.append({'key': 'member_within_geofence','value': 'None'}) 
-					
-		
-					device.updateStatesOnServer(device_states)
+			changed_states = self.state_cache.diff(device.id, device_states)
+			if any(s['key'] == 'member_360_location' for s in changed_states):
+				if (m['location']['name'] == "Home"):
+					device.updateStateImageOnServer(indigo.kStateImageSel.MotionSensorTripped)
+				else:
+					device.updateStateImageOnServer(indigo.kStateImageSel.NoImage)
 
-		else:
-			pass
+			# the poll time is written every time, outside the change cache
+			changed_states.append({'key': 'last_api_update','value': str(cur_date_time)})
+			device.updateStatesOnServer(changed_states)
 
 		return
\ No newline at end of file
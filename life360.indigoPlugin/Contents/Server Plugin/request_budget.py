@@ -0,0 +1,110 @@
+"""Token-bucket budget shared by every Life360 API request."""
+import math
+import threading
+import time
+
+
+class RequestBudget:
+    """
+    Token bucket that paces Life360 requests from every caller.
+
+    The polling loop, the Refresh Member Data action and credential
+    validation all draw from one bucket, so a burst of manual refreshes
+    spends the budget the background poll would otherwise have used and the
+    poll waits instead of running into a 429.  The bucket holds capacity
+    tokens and refills at refill_per_second; each request takes one.
+
+    When Life360 answers 429 with a Retry-After header, cooldown() pauses
+    every caller for exactly that long and can hold the token for the retry,
+    so the retry goes out the moment the cooldown ends rather than queueing
+    behind other callers.  A caller that reserved tokens and then never sent
+    its request gives them back with release().
+    """
+
+    def __init__(self, capacity=12, refill_per_second=0.5, clock=time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._cooldown_until = 0.0
+        self.requests = 0        # requests that drew from the budget
+        self.delayed = 0         # requests that had to wait for it
+        self.rate_limited = 0    # 429 answers recorded through cooldown()
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def _wait(self, tokens, now):
+        deficit = -tokens / self.refill_per_second if tokens < 0 else 0.0
+        return max(deficit, self._cooldown_until - now, 0.0)
+
+    def reserve(self, cost=1):
+        """
+        Take cost tokens and return the seconds to wait before sending.
+
+        The tokens are taken even when the caller has to wait, so callers that
+        reserve one after another queue up behind each other instead of all
+        firing the moment the bucket refills.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= cost
+            self.requests += 1
+            wait = self._wait(self._tokens, now)
+            if wait > 0:
+                self.delayed += 1
+            return wait
+
+    def wait_time(self, cost=1):
+        """Return the seconds a request for cost tokens would wait, without taking them."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return self._wait(self._tokens - cost, now)
+
+    def release(self, cost=1):
+        """Give back cost tokens taken by reserve() or cooldown() for a request never sent."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self.capacity, self._tokens + cost)
+
+    def cooldown(self, seconds, reserve=0):
+        """
+        Hold every request back for seconds (from a 429 Retry-After).
+
+        With reserve=1 the token for the caller's retry is taken here; the
+        caller sends the retry when the cooldown ends without calling
+        reserve() again, and releases the token if it doesn't retry after all.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._cooldown_until = max(self._cooldown_until, now + max(0.0, seconds))
+            # the server says we are over its limit, whatever we had saved up:
+            # allow just the one retry when the cooldown ends, and hand it to
+            # the caller that was rate-limited when it asks for it
+            self._tokens = min(self._tokens, 1.0) - reserve
+            self.requests += reserve
+            self.rate_limited += 1
+
+    def remaining(self):
+        """Return the whole tokens currently available."""
+        with self._lock:
+            self._refill(self._clock())
+            return max(0, math.floor(self._tokens))
+
+    def cooldown_remaining(self):
+        """Return the seconds left on the current Retry-After cooldown."""
+        with self._lock:
+            return max(0.0, self._cooldown_until - self._clock())
+
+    def stats(self):
+        """Return a one-line summary of the budget counters."""
+        return (f"request budget: {self.remaining()}/{self.capacity:g} available, "
+                f"{self.requests} requests, {self.delayed} delayed, "
+                f"{self.rate_limited} rate-limited")
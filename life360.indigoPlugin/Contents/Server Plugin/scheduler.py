@@ -0,0 +1,122 @@
+"""Adaptive polling interval and retry scheduling for the Life360 polling loop."""
+import time
+
+# Life360 reports speed in roughly metres per second; the plugin shows mph
+# as 2.2 x that (see Plugin.mphSpeed), so thresholds are compared the same way
+_MPH_PER_RAW_SPEED = 2.2
+
+
+def member_activity(member, speed_threshold_mph):
+    """
+    Return why a member needs frequent polls ('in transit' or 'moving'), or None.
+
+    member is one entry of the Life360 members list.  Life360 sends inTransit
+    as "0"/"1" and speed as a string, -1 when unknown.
+    """
+    location = (member or {}).get('location') or {}
+    if str(location.get('inTransit', '0')) == '1':
+        return 'in transit'
+    try:
+        speed = float(location.get('speed') or 0)
+    except (TypeError, ValueError):
+        return None
+    if speed * _MPH_PER_RAW_SPEED > speed_threshold_mph:
+        return 'moving'
+    return None
+
+
+class PollScheduler:
+    """
+    Picks the delay before the next poll from what the members are doing.
+
+    While any member is active (in transit, faster than the speed threshold,
+    or near a geofence edge) the plugin polls every min_interval seconds.
+    Once everyone is settled it goes back to base_interval (the Refresh
+    Frequency) and then backs off exponentially, multiplying the interval by
+    backoff after every further quiet poll, up to max_interval.
+    """
+
+    def __init__(self, base_interval=30, min_interval=15, max_interval=300, backoff=2.0):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = base_interval
+        self.reason = 'starting'
+        self.quiet_polls = 0
+
+    def configure(self, base_interval=None, min_interval=None, max_interval=None):
+        """Apply new bounds; the current interval is clamped to them."""
+        if base_interval is not None:
+            self.base_interval = base_interval
+        if min_interval is not None:
+            self.min_interval = min_interval
+        if max_interval is not None:
+            self.max_interval = max_interval
+        self.interval = self._clamp(self.interval)
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def next_interval(self, activity=None):
+        """
+        Return the seconds to wait before the next poll.
+
+        activity is a short description of why polling should be quick (see
+        member_activity), or None when nobody is doing anything.
+        """
+        if activity:
+            self.quiet_polls = 0
+            self.interval = self.min_interval
+            self.reason = activity
+        else:
+            self.interval = self._clamp(self.base_interval * self.backoff ** self.quiet_polls)
+            if self.interval < self.max_interval:
+                self.quiet_polls += 1
+            self.reason = 'stationary' if self.interval > self.base_interval else 'idle'
+        return self.interval
+
+
+class RetryBackoff:
+    """
+    When the polling loop should next retry a Life360 fetch that failed.
+
+    Retries are scheduled rather than waited out: after each failure the
+    loop carries on serving cached data and only fetches again once due()
+    says so.  The delay starts at base seconds and doubles per failure up to
+    maximum.
+    """
+
+    def __init__(self, base=60, maximum=120, clock=time.monotonic):
+        self.base = base
+        self.maximum = maximum
+        self._clock = clock
+        self.failures = 0
+        self._retry_at = None
+
+    @property
+    def pending(self):
+        """True while a failed fetch is waiting to be retried."""
+        return self._retry_at is not None
+
+    def fail(self):
+        """Record a failed fetch and return the seconds until the retry."""
+        delay = min(self.base * 2 ** min(self.failures, 32), self.maximum)
+        self.failures += 1
+        self._retry_at = self._clock() + delay
+        return delay
+
+    def reset(self):
+        """Forget past failures; the next fetch goes ahead immediately."""
+        self.failures = 0
+        self._retry_at = None
+
+    def due(self):
+        """True when nothing is pending or the retry time has come."""
+        return self._retry_at is None or self._clock() >= self._retry_at
+
+    def remaining(self):
+        """Seconds until the pending retry (0 when none is pending or it is due)."""
+        if self._retry_at is None:
+            return 0.0
+        return max(0.0, self._retry_at - self._clock())
@@ -0,0 +1,87 @@
+"""Per-device cache of the state values last pushed to the Indigo server."""
+import threading
+
+
+class DeviceStateCache:
+    """
+    Remembers the last value written for every state key of every device so
+    that only changed keys are sent to updateStatesOnServer.
+
+    It also remembers the Life360 location timestamp last applied to each
+    member device, which lets the polling loop skip a member entirely when
+    its fix has not moved.  Counters record how many writes were avoided.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}        # device id -> {state key: last value pushed}
+        self._timestamps = {}    # device id -> last location.timestamp applied
+        self.writes = 0              # state keys sent to the server
+        self.suppressed_writes = 0   # state keys dropped because unchanged
+        self.skipped_updates = 0     # member updates skipped (fix unchanged)
+
+    def diff(self, device_id, device_states):
+        """
+        Return the entries of device_states whose value changed and record them.
+
+        device_states is the usual list of {'key': ..., 'value': ...} dicts.
+        When a key appears more than once the last entry wins, which is also
+        what updateStatesOnServer would have ended up storing.
+        """
+        latest = {}
+        for state in device_states:
+            latest[state['key']] = state
+
+        changed = []
+        with self._lock:
+            last = self._values.setdefault(device_id, {})
+            for key, state in latest.items():
+                if key in last and last[key] == state['value']:
+                    self.suppressed_writes += 1
+                    continue
+                last[key] = state['value']
+                changed.append(state)
+            self.writes += len(changed)
+        return changed
+
+    def location_unchanged(self, device_id, timestamp):
+        """
+        Return True if timestamp matches the fix last applied to device_id.
+
+        A new timestamp is recorded and False returned.  Missing timestamps
+        never count as unchanged.
+        """
+        if not timestamp:
+            return False
+        with self._lock:
+            if self._timestamps.get(device_id) == timestamp:
+                self.skipped_updates += 1
+                return True
+            self._timestamps[device_id] = timestamp
+            return False
+
+    def forget(self, device_id):
+        """Drop everything remembered for one device so it is fully rewritten."""
+        with self._lock:
+            self._values.pop(device_id, None)
+            self._timestamps.pop(device_id, None)
+
+    def expire_location(self, device_id):
+        """Make one member re-evaluate on its next update even if its fix is unchanged."""
+        with self._lock:
+            self._timestamps.pop(device_id, None)
+
+    def reset_timestamps(self):
+        """
+        Make every member re-evaluate on the next poll.
+
+        Used when the geofence set changes, because a member's geofence states
+        can change even though its own location did not.
+        """
+        with self._lock:
+            self._timestamps.clear()
+
+    def stats(self):
+        """Return a one-line summary of the write counters."""
+        return (f"{self.writes} state writes sent, {self.suppressed_writes} suppressed, "
+                f"{self.skipped_updates} unchanged member updates skipped")
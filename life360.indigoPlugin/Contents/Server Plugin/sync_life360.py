@@ -1,11 +1,18 @@
 """Synchronous wrapper for Life360 async API."""
 import asyncio
 import ssl
-import time
+import threading
 from aiohttp import ClientSession, TCPConnector
 
 from life360 import Life360
-from life360.exceptions import LoginError, RateLimited
+from life360.exceptions import LoginError, NotModified, RateLimited, Unauthorized
+
+# How often a back-off wait checks whether it has been cancelled (seconds)
+_CANCEL_CHECK_INTERVAL = 0.25
+
+
+class RetryCancelled(Exception):
+    """A back-off or request-budget wait was cancelled with SyncLife360.cancel()."""
 
 
 class SyncLife360:
@@ -17,9 +24,14 @@ class SyncLife360:
     behaviour of the HA life360 integration, which reuses one session for the
     lifetime of the integration.  Recreate (or call close() then recreate) when
     credentials change.
+
+    Pass a RequestBudget to pace requests; instances sharing one budget
+    (and its Retry-After cooldown) never outrun it together.  Waits can be
+    cut short from another thread with cancel().
     """
 
-    def __init__(self, access_token=None, username=None, password=None, logger=None):
+    def __init__(self, access_token=None, username=None, password=None, logger=None,
+                 budget=None):
         # Normalize: strip "Bearer " prefix so every caller can safely prepend it
         if access_token and access_token.strip().startswith("Bearer "):
             access_token = access_token.strip()[len("Bearer "):]
@@ -27,12 +39,15 @@ class SyncLife360:
         self.username = username
         self.password = password
         self.logger = logger
+        self.budget = budget
+        self._cancelled = threading.Event()
 
         # Persistent loop and session — created once, reused across all API calls
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
         self._session = None   # created lazily inside the loop
         self._api = None       # Life360 client, created once after auth
+        self._api_session = None   # session the Life360 client was built on
 
     # ------------------------------------------------------------------
     # Session / loop helpers
@@ -62,8 +77,29 @@ class SyncLife360:
 
     def _run(self, coro):
         """Run a coroutine on the persistent event loop."""
+        # a cancel() aimed at an earlier call must not abort this one
+        self._cancelled.clear()
         return self._loop.run_until_complete(coro)
 
+    def cancel(self):
+        """
+        Abandon any wait of the call in progress.  Safe from any thread.
+
+        The waiting call raises RetryCancelled straight away instead of
+        sleeping out its back-off or Retry-After; the next call starts afresh.
+        """
+        self._cancelled.set()
+
+    async def _sleep(self, seconds):
+        """asyncio.sleep that raises RetryCancelled as soon as cancel() is called."""
+        deadline = self._loop.time() + seconds
+        while not self._cancelled.is_set():
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, _CANCEL_CHECK_INTERVAL))
+        raise RetryCancelled()
+
     def close(self):
         """Close the session and event loop.  Call when credentials change."""
         async def _close():
@@ -74,6 +110,7 @@ class SyncLife360:
             self._loop.close()
         self._session = None
         self._api = None
+        self._api_session = None
 
     # ------------------------------------------------------------------
     # Authentication
@@ -87,6 +124,7 @@ class SyncLife360:
             return False
         try:
             async def _login():
+                await self._throttle("login")
                 session = await self._ensure_session()
                 api = Life360(session, max_retries=3)
                 await api.login_by_username(self.username, self.password)
@@ -103,42 +141,99 @@ class SyncLife360:
     def _make_api(self):
         """Return the shared Life360 API client (created once per session)."""
         # The API object holds etags and other per-session state — reuse it.
-        return Life360(
-            self._session,          # session must already exist
-            max_retries=3,
-            authorization=f"Bearer {self.access_token}",
-        )
+        # It is only rebuilt if the session itself had to be recreated.
+        if self._api is None or self._api_session is not self._session:
+            self._api = Life360(
+                self._session,          # session must already exist
+                max_retries=3,
+                authorization=f"Bearer {self.access_token}",
+            )
+            self._api_session = self._session
+        return self._api
 
     # ------------------------------------------------------------------
     # Retry helper
     # ------------------------------------------------------------------
 
+    async def _throttle(self, label):
+        """Wait until the shared request budget allows one more request."""
+        if self.budget is None:
+            return
+        delay = self.budget.reserve()
+        if delay > 0:
+            if self.logger:
+                self.logger.debug(f"{label}: waiting {delay:.1f}s for the request budget")
+            try:
+                await self._sleep(delay)
+            except RetryCancelled:
+                # the request is never sent — don't let it cost the next poll
+                self.budget.release()
+                raise
+
     def _call_with_retry(self, label, coro_fn, retry=True):
         """
         Run coro_fn() with optional retry on 403/429.
         coro_fn must be a zero-argument callable returning a coroutine.
         """
+        return self._run(self._retry_async(label, coro_fn, retry=retry))
+
+    async def _retry_async(self, label, coro_fn, retry=True):
+        """
+        Async core of _call_with_retry.
+
+        Waits with asyncio.sleep rather than time.sleep so that several
+        endpoints retrying inside one asyncio.gather back off independently,
+        and so that cancel() can end the wait early.
+        Every attempt draws from the request budget.  A 429 carrying
+        Retry-After is retried after exactly that delay (and pauses the shared
+        budget for as long, holding the retry's token so other requests can't
+        take it); without retry the call gives up instead of waiting longer
+        than max_wait.
+        """
         max_attempts = 20 if retry else 2
         base_wait   = 60  if retry else 5
         max_wait    = 120 if retry else 10
+        reserved = 0    # budget tokens cooldown() already took for the next attempt
 
         for attempt in range(1, max_attempts + 1):
+            if reserved:
+                reserved = 0
+            else:
+                await self._throttle(label)
             try:
-                return self._run(coro_fn())
+                return await coro_fn()
             except (LoginError, RateLimited) as e:
                 reason = "rate-limited (429)" if isinstance(e, RateLimited) \
                          else "temporarily blocked (403)"
+                retry_after = getattr(e, 'retry_after', None)
+                fail_fast = retry_after is not None and not retry and retry_after > max_wait
+                if retry_after is not None and self.budget is not None:
+                    reserved = 1 if attempt < max_attempts and not fail_fast else 0
+                    self.budget.cooldown(retry_after, reserve=reserved)
+                if fail_fast:
+                    # fail fast rather than block the caller for the whole cooldown
+                    msg = f"{label}: {reason}, server asked to wait {retry_after:g}s."
+                    (self.logger.warning if self.logger else print)(msg)
+                    raise
                 if attempt < max_attempts:
                     # Clear cookies on 403 before retrying — HA does this too.
                     # Stale Cloudflare cookies can cause persistent 403s; clearing
                     # them forces fresh cookie negotiation on the next attempt.
                     if isinstance(e, LoginError) and self._session and not self._session.closed:
                         self._session.cookie_jar.clear()
-                    wait_time = min(base_wait * (2 ** (attempt - 1)), max_wait)
+                    if retry_after is not None:
+                        wait_time = retry_after
+                    else:
+                        wait_time = min(base_wait * (2 ** (attempt - 1)), max_wait)
                     msg = (f"{label} attempt {attempt}/{max_attempts}: "
-                           f"{reason}. Retrying in {wait_time}s...")
+                           f"{reason}. Retrying in {wait_time:g}s...")
                     (self.logger.info if self.logger else print)(msg)
-                    time.sleep(wait_time)
+                    try:
+                        await self._sleep(wait_time)
+                    except RetryCancelled:
+                        if reserved:
+                            self.budget.release(reserved)
+                        raise
                 else:
                     msg = f"{label} failed after {max_attempts} attempts: {reason}."
                     if self.logger:
@@ -146,6 +241,9 @@ class SyncLife360:
                     else:
                         print(msg)
                     raise
+            except NotModified:
+                # 304 — not an error, the caller reuses what it already has
+                raise
             except Exception as e:
                 msg = f"{label} unexpected error: {type(e).__name__}: {e}"
                 (self.logger.error if self.logger else print)(msg)
@@ -169,8 +267,13 @@ class SyncLife360:
 
         return self._call_with_retry("get_circles", _coro, retry=retry)
 
-    def get_circle(self, circle_id, retry=True):
-        """Get circle member details."""
+    def get_circle(self, circle_id, retry=True, raise_not_modified=False):
+        """
+        Get circle member details.
+
+        With raise_not_modified=True the stored etag is sent as If-None-Match
+        and NotModified is raised when the members are unchanged.
+        """
         if not self.access_token:
             raise Exception("Must authenticate first")
 
@@ -178,13 +281,14 @@ class SyncLife360:
             async def _inner():
                 session = await self._ensure_session()
                 api = self._make_api()
-                return await api.get_circle(circle_id)
+                return await api.get_circle(
+                    circle_id, raise_not_modified=raise_not_modified)
             return _inner()
 
         return self._call_with_retry("get_circle", _coro, retry=retry)
 
-    def get_circle_places(self, circle_id, retry=True):
-        """Get places for a circle."""
+    def get_circle_places(self, circle_id, retry=True, raise_not_modified=False):
+        """Get places for a circle (see get_circle for raise_not_modified)."""
         if not self.access_token:
             raise Exception("Must authenticate first")
 
@@ -192,7 +296,99 @@ class SyncLife360:
             async def _inner():
                 session = await self._ensure_session()
                 api = self._make_api()
-                return await api.get_circle_places(circle_id)
+                return await api.get_circle_places(
+                    circle_id, raise_not_modified=raise_not_modified)
             return _inner()
 
         return self._call_with_retry("get_circle_places", _coro, retry=retry)
+
+    def get_snapshot(self, circle_id=None, include_circles=True, retry=True,
+                     raise_not_modified=False):
+        """
+        Fetch members, places and circles for one poll in a single batch.
+
+        The requests run together with asyncio.gather on the persistent loop
+        and each one goes through its own retry loop, so a 403/429 back-off
+        on one endpoint does not hold up the others.  When circle_id is None
+        the circles list has to come back first to learn the circle; otherwise
+        circles is only fetched (concurrently) when include_circles is True.
+
+        With raise_not_modified=True the members and places requests are
+        conditional (If-None-Match with the etag from the previous poll).
+
+        Returns a dict with keys 'circle_id', 'circles', 'members', 'places'
+        and 'modified'.  'members' and 'places' are None when the server
+        answered 304 Not Modified; 'places' is also None when that endpoint
+        failed.  Callers keep their previous data for any None entry.
+        'circles' is None when it was not requested or failed.  'modified' is
+        False only when neither members nor places changed.  A members
+        failure, or a 401 from any endpoint, is raised.
+        """
+        if not self.access_token:
+            raise Exception("Must authenticate first")
+
+        def _endpoint(method, *args, **kwargs):
+            async def _inner():
+                await self._ensure_session()
+                api = self._make_api()
+                return await getattr(api, method)(*args, **kwargs)
+            return _inner
+
+        async def _conditional(label, method, cid):
+            try:
+                return await self._retry_async(
+                    label,
+                    _endpoint(method, cid, raise_not_modified=raise_not_modified),
+                    retry=retry)
+            except NotModified:
+                return None
+
+        async def _gather():
+            cid = circle_id
+            circles = None
+            fetch_circles = include_circles
+            if cid is None:
+                circles = await self._retry_async(
+                    "get_circles", _endpoint("get_circles"), retry=retry)
+                cid = circles[0]['id']
+                fetch_circles = False
+
+            jobs = [
+                _conditional("get_circle", "get_circle", cid),
+                _conditional("get_circle_places", "get_circle_places", cid),
+            ]
+            if fetch_circles:
+                jobs.append(self._retry_async("get_circles", _endpoint("get_circles"), retry=retry))
+            results = await asyncio.gather(*jobs, return_exceptions=True)
+
+            # 401 anywhere means the token is dead — surface it first; a
+            # cancelled wait means the whole batch was abandoned
+            for result in results:
+                if isinstance(result, (Unauthorized, RetryCancelled)):
+                    raise result
+            members = results[0]
+            if isinstance(members, BaseException):
+                raise members
+            places = results[1]
+            if isinstance(places, BaseException):
+                (self.logger.warning if self.logger else print)(
+                    f"get_circle_places failed, keeping previous places: {places}")
+                places = None
+            # only once failures are None too: a failed places call is not news
+            modified = members is not None or places is not None
+            if fetch_circles:
+                circles = results[2]
+                if isinstance(circles, BaseException):
+                    (self.logger.warning if self.logger else print)(
+                        f"get_circles failed, keeping current circle: {circles}")
+                    circles = None
+
+            return {
+                'circle_id': cid,
+                'circles': circles,
+                'members': members,
+                'places': places,
+                'modified': modified,
+            }
+
+        return self._run(_gather())
@@ -0,0 +1,127 @@
+"""Tests for the on-disk snapshot cache"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from cache_store import SnapshotStore
+
+SNAPSHOT = {'life360data': {'members': [{'id': 'abc', 'firstName': 'Ann'}]}, 'placesdata': {}}
+
+
+class SnapshotStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "life360_cache.json")
+        self.store = SnapshotStore(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def backdate(self, seconds):
+        """Make the cache file (and the saved_at inside it) seconds old."""
+        with open(self.path) as f:
+            raw = json.load(f)
+        then = time.time() - seconds
+        raw['saved_at'] = then
+        with open(self.path, 'w') as f:
+            json.dump(raw, f)
+        os.utime(self.path, (then, then))
+
+    def test_round_trip(self):
+        self.assertIsNone(self.store.load())
+        self.assertIsNone(self.store.age())
+        self.assertTrue(self.store.save(SNAPSHOT))
+        self.assertEqual(os.listdir(self.directory), ["life360_cache.json"])
+        self.assertEqual(SnapshotStore(self.path).load(), SNAPSHOT)
+
+    def test_compact_encoding(self):
+        self.store.save(SNAPSHOT)
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        self.assertNotIn(b'\n', raw)
+        self.assertNotIn(b', ', raw)
+
+    def test_unchanged_save_is_skipped(self):
+        self.store.save(SNAPSHOT)
+        self.assertFalse(self.store.save(json.loads(json.dumps(SNAPSHOT))))
+        self.assertEqual((self.store.writes, self.store.skipped_writes), (1, 1))
+        changed = dict(SNAPSHOT, placesdata={'places': []})
+        self.assertTrue(self.store.save(changed))
+        self.assertEqual(SnapshotStore(self.path).load(), changed)
+
+    def test_loaded_digest_skips_identical_save(self):
+        self.store.save(SNAPSHOT)
+        store = SnapshotStore(self.path)
+        store.load()
+        self.assertFalse(store.save(SNAPSHOT))
+
+    def test_failed_write_keeps_previous_cache(self):
+        self.store.save(SNAPSHOT)
+        # the disk fails after the new snapshot was partly written
+        with mock.patch('cache_store.os.fsync', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.store.save(dict(SNAPSHOT, placesdata={'places': []}))
+        self.assertEqual(SnapshotStore(self.path).load(), SNAPSHOT)
+        self.assertEqual(self.store.writes, 1)
+
+    def test_age_counts_from_last_confirmation(self):
+        self.store.save(SNAPSHOT)
+        self.backdate(7200)
+        store = SnapshotStore(self.path)
+        store.load()
+        self.assertAlmostEqual(store.age(), 7200, delta=5)
+        # a 304 confirms the snapshot without rewriting it
+        store.confirm()
+        self.assertLess(store.age(), 5)
+        reloaded = SnapshotStore(self.path)
+        reloaded.load()
+        self.assertLess(reloaded.age(), 5)
+        self.assertAlmostEqual(reloaded.saved_at, time.time() - 7200, delta=5)
+
+    def test_identical_save_confirms(self):
+        self.store.save(SNAPSHOT)
+        self.backdate(7200)
+        store = SnapshotStore(self.path)
+        store.load()
+        store.save(SNAPSHOT)
+        reloaded = SnapshotStore(self.path)
+        reloaded.load()
+        self.assertLess(reloaded.age(), 5)
+
+    def test_warm_start_age_limit(self):
+        # the plugin warm-starts only from a cache confirmed within the limit
+        limit = 60 * 60
+        self.store.save(SNAPSHOT)
+        self.backdate(2 * 3600)
+        store = SnapshotStore(self.path)
+        self.assertEqual(store.load(), SNAPSHOT)
+        self.assertGreater(store.age(), limit)
+        self.backdate(30 * 60)
+        store.load()
+        self.assertLessEqual(store.age(), limit)
+
+    def test_legacy_format(self):
+        with open(self.path, 'w') as f:
+            json.dump(SNAPSHOT, f, indent=2)
+        then = time.time() - 600
+        os.utime(self.path, (then, then))
+        self.assertEqual(self.store.load(), SNAPSHOT)
+        self.assertAlmostEqual(self.store.age(), 600, delta=5)
+        # rewritten in the new format only when the data changes
+        self.assertFalse(self.store.save(SNAPSHOT))
+
+    def test_corrupt_file(self):
+        with open(self.path, 'w') as f:
+            f.write('{"saved_at": 1, "da')
+        with self.assertRaises(ValueError):
+            self.store.load()
+
+
+if __name__ == '__main__':
+    unittest.main()
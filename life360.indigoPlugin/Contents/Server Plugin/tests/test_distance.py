@@ -0,0 +1,59 @@
+"""Tests for geopy's great-circle kernels"""
+
+import math
+import unittest
+
+from geopy.distance import EARTH_RADIUS, great_circle, haversine_km, haversine_km_many
+
+
+def old_measure(lat1, lon1, lat2, lon2):
+    """great_circle.measure as it was before the kernels were split out."""
+    lat1, lng1 = math.radians(lat1), math.radians(lon1)
+    lat2, lng2 = math.radians(lat2), math.radians(lon2)
+    sin_lat1, cos_lat1 = math.sin(lat1), math.cos(lat1)
+    sin_lat2, cos_lat2 = math.sin(lat2), math.cos(lat2)
+    delta_lng = lng2 - lng1
+    cos_delta_lng, sin_delta_lng = math.cos(delta_lng), math.sin(delta_lng)
+    d = math.atan2(math.sqrt((cos_lat2 * sin_delta_lng) ** 2 +
+                             (cos_lat1 * sin_lat2 -
+                              sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
+                   sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
+    return EARTH_RADIUS * d
+
+
+# nearly antipodal pairs, where the haversine form loses about 0.2 m,
+# plus a few ordinary ones
+PAIRS = [
+    (0.0, 0.0, 0.0, 179.9999),
+    (0.0, 0.0, 1e-5, 179.99999),
+    (41.49008, -71.312796, -41.49008, 108.687),
+    (-33.9, 151.2, 33.9000001, -28.8000002),
+    (89.9999, 10.0, -89.9999, -170.0),
+    (41.49008, -71.312796, 41.499498, -81.695391),
+    (40.0, -75.0, 40.0001, -75.0001),
+]
+
+
+class GreatCircleKernelTest(unittest.TestCase):
+
+    def test_matches_old_formula(self):
+        for pair in PAIRS:
+            old = old_measure(*pair)
+            self.assertAlmostEqual(haversine_km(*pair), old, delta=1e-9, msg=pair)
+            self.assertAlmostEqual(great_circle(pair[:2], pair[2:]).km, old, delta=1e-9, msg=pair)
+
+    def test_many_matches_single(self):
+        lat1s, lon1s, lat2s, lon2s = zip(*PAIRS)
+        many = haversine_km_many(lat1s, lon1s, lat2s, lon2s)
+        radians = haversine_km_many(
+            [math.radians(x) for x in lat1s], [math.radians(x) for x in lon1s],
+            [math.radians(x) for x in lat2s], [math.radians(x) for x in lon2s],
+            in_radians=True, cos_lat2s=[math.cos(math.radians(x)) for x in lat2s],
+            sin_lat2s=[math.sin(math.radians(x)) for x in lat2s])
+        for pair, a, b in zip(PAIRS, many, radians):
+            self.assertAlmostEqual(a, old_measure(*pair), delta=1e-9, msg=pair)
+            self.assertAlmostEqual(b, old_measure(*pair), delta=1e-9, msg=pair)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+"""Tests for geofence compilation, indexing, evaluation and occupancy"""
+
+import random
+import unittest
+
+from geofence import (CompiledFence, CompiledPolygon, FenceIndex, OccupancyTracker,
+                      compile_fence, evaluate, near_boundary, parse_polygon, _KM_PER_DEGREE)
+
+
+def north_of(lat, lon, km):
+    """The point km due north of lat/lon (great-circle distance is exactly km)."""
+    return lat + km / _KM_PER_DEGREE, lon
+
+
+class CompiledFenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fence = CompiledFence('home', 'Home', 40.0, -75.0, 0.1)
+
+    def test_boundary(self):
+        self.assertTrue(self.fence.contains(40.0, -75.0))
+        self.assertTrue(self.fence.contains(*north_of(40.0, -75.0, 0.099)))
+        self.assertFalse(self.fence.contains(*north_of(40.0, -75.0, 0.101)))
+        self.assertAlmostEqual(self.fence.distance_km(*north_of(40.0, -75.0, 0.1)), 0.1, places=9)
+
+    def test_antimeridian(self):
+        fence = CompiledFence('dateline', 'Dateline', 0.0, 179.9995, 0.2)
+        # about 111 m away, on the other side of 180 degrees
+        self.assertTrue(fence.bbox_contains(0.0, -179.9995))
+        self.assertTrue(fence.contains(0.0, -179.9995))
+        self.assertAlmostEqual(fence.distance_km(0.0, -179.9995), 0.1112, places=3)
+        self.assertFalse(fence.contains(0.0, -179.997))
+
+    def test_pole(self):
+        fence = CompiledFence('pole', 'Pole', 89.99, 0.0, 5.0)
+        self.assertEqual(fence.lon_half_width, 180.0)
+        self.assertTrue(fence.contains(89.995, 120.0))
+
+    def test_from_props(self):
+        fence = compile_fence(7, {'geofence_name': 'Work', 'geofence_lat': '40.1',
+                                  'geofence_long': '-75.2', 'geofence_radius': '0.5'})
+        self.assertIsInstance(fence, CompiledFence)
+        self.assertEqual((fence.key, fence.name, fence.radius_km), (7, 'Work', 0.5))
+        with self.assertRaises(ValueError):
+            CompiledFence.from_props(7, {'geofence_lat': '40.1'})
+        with self.assertRaises(ValueError):
+            CompiledFence.from_props(7, {'geofence_lat': 'x', 'geofence_long': '1',
+                                         'geofence_radius': '1'})
+
+
+class FenceIndexTest(unittest.TestCase):
+
+    def test_add_remove(self):
+        index = FenceIndex()
+        home = CompiledFence('home', 'Home', 40.0, -75.0, 0.1)
+        work = CompiledFence('work', 'Work', 40.2, -75.0, 0.1)
+        index.add(home)
+        index.add(work)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.candidates(40.0, -75.0), {'home'})
+        self.assertEqual(index.candidates(40.2, -75.0), {'work'})
+        self.assertEqual(index.candidates(10.0, 10.0), set())
+        index.remove('home')
+        index.remove('nowhere')
+        self.assertNotIn('home', index)
+        self.assertEqual(index.candidates(40.0, -75.0), set())
+        index.remove('work')
+        self.assertEqual(index._buckets, {})
+
+    def test_replace_moves_fence(self):
+        index = FenceIndex()
+        index.add(CompiledFence('home', 'Home', 40.0, -75.0, 0.1))
+        index.add(CompiledFence('home', 'Home', 41.0, -75.0, 0.1))
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.candidates(40.0, -75.0), set())
+        self.assertEqual(index.candidates(41.0, -75.0), {'home'})
+
+    def test_wide_fences(self):
+        index = FenceIndex(max_cells=16)
+        index.add(CompiledFence('state', 'State', 40.0, -75.0, 100.0))
+        index.add(CompiledFence('home', 'Home', 40.0, -75.0, 0.1))
+        self.assertEqual(index.candidates(-30.0, 100.0), {'state'})
+        self.assertEqual(index.candidates(40.0, -75.0), {'home', 'state'})
+        index.remove('state')
+        self.assertEqual(index.candidates(-30.0, 100.0), set())
+
+    def test_antimeridian(self):
+        index = FenceIndex()
+        index.add(CompiledFence('dateline', 'Dateline', 0.0, 179.99, 3.0))
+        self.assertEqual(index.candidates(0.0, 179.99), {'dateline'})
+        self.assertEqual(index.candidates(0.0, -179.99), {'dateline'})
+
+
+class EvaluateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fences = [
+            CompiledFence('home', 'Home', 40.0, -75.0, 0.15),
+            CompiledFence('work', 'Work', 40.01, -75.01, 2.0),
+            CompiledFence('dateline', 'Dateline', -17.0, 179.999, 0.5),
+            CompiledPolygon('lot', 'Lot', [(40.0, -75.002), (40.001, -75.002), (40.001, -75.0005),
+                                           (40.0, -75.0005)]),
+        ]
+        self.index = FenceIndex()
+        for f in self.fences:
+            self.index.add(f)
+
+    def members(self):
+        rnd = random.Random(7)
+        members = []
+        for f in self.fences:
+            for i in range(200):
+                # scattered around each fence, many of them close to its edge
+                members.append((f'{f.key}{i}', f.lat + rnd.uniform(-0.03, 0.03),
+                                (f.lon + rnd.uniform(-0.03, 0.03) + 180.0) % 360.0 - 180.0))
+        return members
+
+    def test_matches_exact_containment(self):
+        members = self.members()
+        for index in (None, self.index):
+            result = evaluate(members, self.fences, index)
+            for key, lat, lon in members:
+                expected = [f.key for f in self.fences if f.contains(lat, lon)]
+                self.assertEqual(result.fences_for(key), expected, (key, lat, lon))
+
+    def test_boundary_pairs(self):
+        home = self.fences[0]
+        members = [('in', *north_of(home.lat, home.lon, 0.1499)),
+                   ('out', *north_of(home.lat, home.lon, 0.1501)),
+                   ('far', 10.0, 10.0)]
+        result = evaluate(members, self.fences, self.index)
+        # both are well inside the larger work fence
+        self.assertEqual(result.fences_for('in'), ['home', 'work'])
+        self.assertEqual(result.fences_for('out'), ['work'])
+        self.assertEqual(result.members_in('home'), ['in'])
+        self.assertAlmostEqual(result.distance('in', 'home'), 0.1499, places=6)
+        # due north, just past the radius is also just past the bounding box
+        self.assertIsNone(result.distance('out', 'home'))
+        self.assertIsNone(result.distance('far', 'home'))
+
+    def test_antimeridian(self):
+        result = evaluate([('m', -17.0, -179.999)], self.fences, self.index)
+        self.assertEqual(result.fences_for('m'), ['dateline'])
+
+    def test_fence_order_is_kept(self):
+        result = evaluate([('m', 40.0, -75.001)], self.fences)
+        self.assertEqual(result.fences_for('m'), ['home', 'work', 'lot'])
+
+
+class OccupancyTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fence = CompiledFence('home', 'Home', 40.0, -75.0, 0.1)
+        self.fences = {'home': self.fence}
+
+    def poll(self, tracker, km, now=0, accuracy_km=0.0):
+        lat, lon = north_of(40.0, -75.0, km)
+        result = evaluate([('m', lat, lon)], [self.fence])
+        return tracker.update([('m', lat, lon, accuracy_km)], self.fences, result, now)
+
+    def test_no_margin_exits_at_radius(self):
+        tracker = OccupancyTracker()
+        self.assertEqual(self.poll(tracker, 0.05), [('m', 'home', True)])
+        self.assertEqual(self.poll(tracker, 0.101, accuracy_km=0.05), [('m', 'home', False)])
+
+    def test_exit_margin(self):
+        tracker = OccupancyTracker(exit_margin_km=0.025)
+        self.poll(tracker, 0.05)
+        self.assertEqual(self.poll(tracker, 0.12), [])
+        self.assertEqual(tracker.fences_for('m'), ['home'])
+        # outside radius + margin, but not once the GPS error is allowed for
+        self.assertEqual(self.poll(tracker, 0.13, accuracy_km=0.01), [])
+        self.assertEqual(self.poll(tracker, 0.13), [('m', 'home', False)])
+        # entering still needs the fix within the radius itself
+        self.assertEqual(self.poll(tracker, 0.11), [])
+        self.assertEqual(self.poll(tracker, 0.099), [('m', 'home', True)])
+
+    def test_dwell(self):
+        tracker = OccupancyTracker(dwell_seconds=60)
+        # the first evaluation commits straight away
+        self.assertEqual(self.poll(tracker, 0.05, now=0), [('m', 'home', True)])
+        self.assertEqual(self.poll(tracker, 0.2, now=100), [])
+        self.assertEqual(self.poll(tracker, 0.2, now=130), [])
+        self.assertEqual(tracker.fences_for('m'), ['home'])
+        self.assertEqual(self.poll(tracker, 0.2, now=160), [('m', 'home', False)])
+        # a transition that doesn't hold restarts the dwell
+        self.assertEqual(self.poll(tracker, 0.05, now=200), [])
+        self.assertEqual(self.poll(tracker, 0.2, now=230), [])
+        self.assertEqual(self.poll(tracker, 0.05, now=240), [])
+        self.assertEqual(self.poll(tracker, 0.05, now=290), [])
+        self.assertEqual(self.poll(tracker, 0.05, now=300), [('m', 'home', True)])
+
+    def test_inaccurate_fixes_cannot_transition(self):
+        tracker = OccupancyTracker(max_accuracy_km=0.05)
+        self.assertEqual(self.poll(tracker, 0.05, accuracy_km=0.2), [])
+        self.assertEqual(tracker.fences_for('m'), [])
+        self.assertEqual(self.poll(tracker, 0.05, accuracy_km=0.01), [('m', 'home', True)])
+        self.assertEqual(self.poll(tracker, 5.0, accuracy_km=0.2), [])
+        self.assertEqual(tracker.members_in('home'), ['m'])
+
+    def test_forget(self):
+        tracker = OccupancyTracker(dwell_seconds=60)
+        self.poll(tracker, 0.05)
+        tracker.forget_fence('home')
+        self.assertEqual(tracker.fences_for('m'), [])
+        tracker.forget_member('m')
+        # forgotten members are new again, so they commit without dwelling
+        self.assertEqual(self.poll(tracker, 0.05, now=10), [('m', 'home', True)])
+
+
+class NearBoundaryTest(unittest.TestCase):
+
+    def test_circle(self):
+        home = CompiledFence('home', 'Home', 40.0, -75.0, 0.5)
+        fences = [home]
+        self.assertIs(near_boundary(*north_of(40.0, -75.0, 0.45), fences, 0.1), home)
+        self.assertIs(near_boundary(*north_of(40.0, -75.0, 0.55), fences, 0.1), home)
+        self.assertIsNone(near_boundary(40.0, -75.0, fences, 0.1))
+        self.assertIsNone(near_boundary(*north_of(40.0, -75.0, 0.7), fences, 0.1))
+        self.assertIsNone(near_boundary(45.0, -75.0, fences, 0.1))
+
+    def test_polygon(self):
+        lot = CompiledPolygon('lot', 'Lot', [(40.0, -75.0), (40.01, -75.0), (40.01, -74.99), (40.0, -74.99)])
+        self.assertIs(near_boundary(40.005, -75.0005, [lot], 0.1), lot)
+        self.assertIs(near_boundary(40.005, -74.9995, [lot], 0.1), lot)
+        self.assertIsNone(near_boundary(40.005, -74.995, [lot], 0.1))
+
+
+class CompiledPolygonTest(unittest.TestCase):
+
+    def test_concave(self):
+        # a U open to the north: the notch is inside the bounding box but not the polygon
+        u = CompiledPolygon('u', 'U', [(0.0, 0.0), (0.0, 0.03), (0.03, 0.03), (0.03, 0.02),
+                                       (0.01, 0.02), (0.01, 0.01), (0.03, 0.01), (0.03, 0.0)])
+        self.assertTrue(u.contains(0.005, 0.015))
+        self.assertTrue(u.contains(0.02, 0.005))
+        self.assertTrue(u.contains(0.02, 0.025))
+        self.assertTrue(u.bbox_contains(0.02, 0.015))
+        self.assertFalse(u.contains(0.02, 0.015))
+        self.assertGreater(u.distance_km(0.02, 0.015), 0.5)
+        self.assertEqual(u.distance_km(0.02, 0.005), 0.0)
+
+    def test_antimeridian(self):
+        square = CompiledPolygon('sq', 'Square', [(10.0, 179.99), (10.02, 179.99), (10.02, -179.99),
+                                                  (10.0, -179.99)])
+        self.assertTrue(square.contains(10.01, 179.995))
+        self.assertTrue(square.contains(10.01, -179.995))
+        self.assertTrue(square.contains(10.01, 180.0))
+        self.assertFalse(square.contains(10.01, 179.98))
+        self.assertFalse(square.contains(10.01, -179.98))
+        self.assertAlmostEqual(square.lon_half_width, 0.01)
+
+    def test_area_and_perimeter(self):
+        # about 1 km x 1 km at the equator
+        side = 1.0 / 111.32
+        square = CompiledPolygon('sq', 'Square', [(0.0, 0.0), (side, 0.0), (side, side), (0.0, side)])
+        self.assertAlmostEqual(square.area_m2 / 1e6, 1.0, delta=0.01)
+        self.assertAlmostEqual(square.perimeter_m / 1e3, 4.0, delta=0.02)
+        self.assertGreater(square.area_m2, 0)
+
+    def test_parse_polygon(self):
+        self.assertEqual(parse_polygon("1,2; 3,4\n5,6; 1,2"), [(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)])
+        for text in ("", "1,2; 3,4", "1,2; 3,4; 1,2", "1,2; 3; 5,6", "91,0; 1,1; 2,2",
+                     "0,181; 1,1; 2,2", "a,b; 1,1; 2,2"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_polygon(text)
+
+    def test_from_props(self):
+        fence = compile_fence(3, {'geofence_shape': 'polygon', 'geofence_name': 'Lot',
+                                  'geofence_polygon': "0,0; 0,0.01; 0.01,0.01"})
+        self.assertIsInstance(fence, CompiledPolygon)
+        self.assertTrue(fence.polygon)
+        self.assertEqual(fence.radius_km, 0.0)
+        with self.assertRaises(ValueError):
+            compile_fence(3, {'geofence_shape': 'polygon', 'geofence_polygon': "0,0; 0,1"})
+        with self.assertRaises(ValueError):
+            CompiledPolygon('x', 'X', [(0.0, 0.0), (1.0, 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for the SQLite history index"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from history_index import HistoryIndex
+
+
+class HistoryIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index = HistoryIndex(os.path.join(self.directory, "history.sqlite"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_visits_follow_occupancy(self):
+        self.index.update_visits('alice', {1: 'Home'}, now=1000)
+        self.index.update_visits('alice', {}, now=1600)
+        self.index.commit()
+        self.assertEqual(self.index.time_in_fence(1, 0, 5000), 600)
+        self.assertEqual(self.index.time_in_fence(1, 1300, 5000), 300)
+
+    def test_close_visits_of_member(self):
+        self.index.update_visits('alice', {1: 'Home', 2: 'Work'}, now=1000)
+        self.index.update_visits('bob', {1: 'Home'}, now=1000)
+        self.assertEqual(self.index.close_visits(member_id='alice', now=1100), 2)
+        self.index.commit()
+        self.assertEqual(self.index.time_in_fence(1, 0, 5000, member_id='alice'), 100)
+        self.assertEqual(self.index.time_in_fence(2, 0, 5000), 100)
+        # bob's visit is still open and counts up to the end of the range
+        self.assertEqual(self.index.time_in_fence(1, 0, 5000, member_id='bob'), 4000)
+
+    def test_close_visits_to_fence(self):
+        self.index.update_visits('alice', {1: 'Home', 2: 'Work'}, now=1000)
+        self.index.update_visits('bob', {1: 'Home'}, now=1000)
+        self.assertEqual(self.index.close_visits(fence_id=1, now=1200), 2)
+        self.assertEqual(self.index.close_visits(fence_id=1, now=1300), 0)
+        self.index.commit()
+        self.assertEqual(self.index.time_in_fence(1, 0, 5000), 400)
+        self.assertEqual(self.index.time_in_fence(2, 0, 5000), 4000)
+
+    def test_closed_visit_reopens_on_next_update(self):
+        self.index.update_visits('alice', {1: 'Home'}, now=1000)
+        self.index.close_visits(member_id='alice', now=1100)
+        self.index.update_visits('alice', {1: 'Home'}, now=2000)
+        self.index.update_visits('alice', {}, now=2100)
+        self.index.commit()
+        self.assertEqual(self.index.time_in_fence(1, 0, 5000), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
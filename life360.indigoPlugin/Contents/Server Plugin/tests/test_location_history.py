@@ -0,0 +1,73 @@
+"""Tests for the day-file location history"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from location_history import LocationHistory, RECORD_SIZE
+
+MEMBER = "9f1c2b3a-4d5e-6f70-8192-a3b4c5d6e7f8"
+# noon UTC, so every fix below lands in the same day file
+NOON = 1700006400.0
+
+
+class LocationHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.history = LocationHistory(self.directory, retention_days=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def day_file(self):
+        names = os.listdir(self.directory)
+        self.assertEqual(len(names), 1)
+        return os.path.join(self.directory, names[0])
+
+    def test_round_trip(self):
+        for i in range(3):
+            self.assertTrue(self.history.append(MEMBER, NOON + i, 40.0 + i, -75.0, 5.0, 1.5, 80.0))
+        self.assertFalse(self.history.append(MEMBER, NOON + 1, 0.0, 0.0))
+        records = self.history.query(MEMBER, NOON, NOON + 60)
+        self.assertEqual([r.timestamp for r in records], [NOON, NOON + 1, NOON + 2])
+        self.assertEqual(records[2].latitude, 42.0)
+        self.assertEqual(self.history.query("someone else", NOON, NOON + 60), [])
+
+    def test_append_after_torn_record(self):
+        self.history.append(MEMBER, NOON, 40.0, -75.0)
+        self.history.flush()
+        # a crash mid-write leaves part of a record at the end of the file
+        with open(self.day_file(), 'ab') as f:
+            f.write(b'\xff' * 20)
+        self.history.append(MEMBER, NOON + 1, 40.1, -75.0)
+        self.history.append(MEMBER, NOON + 2, 40.2, -75.0)
+        self.history.flush()
+        self.assertEqual(os.path.getsize(self.day_file()), 3 * RECORD_SIZE)
+        records = self.history.query(MEMBER, NOON, NOON + 60)
+        self.assertEqual([r.timestamp for r in records], [NOON, NOON + 1, NOON + 2])
+        self.assertEqual([r.latitude for r in records], [40.0, 40.1, 40.2])
+
+    def test_reopen_skips_stored_fix(self):
+        self.history.append(MEMBER, NOON, 40.0, -75.0)
+        self.history.append(MEMBER, NOON + 5, 40.1, -75.0)
+        self.history.append("someone else", NOON + 1, 41.0, -75.0)
+        self.history.flush()
+        with open(self.day_file(), 'ab') as f:
+            f.write(b'\xff' * 20)
+        # after a restart the same fixes come back from Life360
+        reopened = LocationHistory(self.directory, retention_days=0)
+        self.assertFalse(reopened.append(MEMBER, NOON + 5, 40.1, -75.0))
+        self.assertFalse(reopened.append("someone else", NOON + 1, 41.0, -75.0))
+        self.assertTrue(reopened.append(MEMBER, NOON + 6, 40.2, -75.0))
+        records = reopened.query(MEMBER, NOON, NOON + 60)
+        self.assertEqual([r.timestamp for r in records], [NOON, NOON + 5, NOON + 6])
+
+    def test_open_empty_directory(self):
+        history = LocationHistory(os.path.join(self.directory, "missing"), retention_days=0)
+        self.assertTrue(history.append(MEMBER, NOON, 40.0, -75.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
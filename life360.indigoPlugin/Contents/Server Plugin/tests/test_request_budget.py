@@ -0,0 +1,90 @@
+"""Tests for the shared Life360 request budget"""
+
+import unittest
+
+from request_budget import RequestBudget
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RequestBudgetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.budget = RequestBudget(capacity=3, refill_per_second=0.5, clock=self.clock)
+
+    def test_burst_then_wait(self):
+        self.assertEqual([self.budget.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertEqual(self.budget.remaining(), 0)
+        # callers queue behind each other, one refill interval apart
+        self.assertEqual(self.budget.reserve(), 2.0)
+        self.assertEqual(self.budget.reserve(), 4.0)
+        self.assertEqual((self.budget.requests, self.budget.delayed), (5, 2))
+
+    def test_refill_is_capped(self):
+        self.budget.reserve()
+        self.budget.reserve()
+        self.clock.now += 1
+        self.assertEqual(self.budget.remaining(), 1)
+        self.clock.now += 1000
+        self.assertEqual(self.budget.remaining(), 3)
+
+    def test_wait_time_takes_nothing(self):
+        for _ in range(3):
+            self.budget.reserve()
+        self.assertEqual(self.budget.wait_time(), 2.0)
+        self.assertEqual(self.budget.wait_time(3), 6.0)
+        self.assertEqual(self.budget.wait_time(), 2.0)
+        self.assertEqual(self.budget.requests, 3)
+
+    def test_release(self):
+        for _ in range(3):
+            self.budget.reserve()
+        self.assertEqual(self.budget.reserve(), 2.0)
+        # that request was cancelled while waiting
+        self.budget.release()
+        self.assertEqual(self.budget.wait_time(), 2.0)
+        self.clock.now += 1000
+        self.budget.release(5)
+        self.assertEqual(self.budget.remaining(), 3)
+
+    def test_cooldown(self):
+        self.budget.cooldown(10)
+        self.assertEqual(self.budget.cooldown_remaining(), 10.0)
+        # whatever was saved up, only one request is allowed when it ends
+        self.assertEqual(self.budget.reserve(), 10.0)
+        self.assertEqual(self.budget.reserve(), 10.0)
+        self.clock.now += 4
+        self.assertEqual(self.budget.cooldown_remaining(), 6.0)
+        self.assertEqual(self.budget.rate_limited, 1)
+
+    def test_cooldown_holds_the_retry_token(self):
+        self.budget.cooldown(2, reserve=1)
+        # the token for the rate-limited call's retry is already taken, so
+        # anybody else waits a refill interval beyond the cooldown's start
+        self.assertEqual(self.budget.wait_time(), 2.0)
+        self.assertEqual(self.budget.reserve(), 2.0)
+        self.assertEqual(self.budget.reserve(), 4.0)
+        self.assertEqual(self.budget.requests, 3)
+
+    def test_unused_retry_token_is_released(self):
+        self.budget.cooldown(2, reserve=1)
+        self.budget.release()
+        self.clock.now += 2
+        self.assertEqual(self.budget.reserve(), 0.0)
+
+    def test_cooldowns_never_shorten(self):
+        self.budget.cooldown(30)
+        self.budget.cooldown(5)
+        self.assertEqual(self.budget.cooldown_remaining(), 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Tests for adaptive polling, retry scheduling and cancellable waits"""
+
+import threading
+import time
+import unittest
+
+from request_budget import RequestBudget
+from scheduler import PollScheduler, RetryBackoff, member_activity
+
+try:
+    from sync_life360 import RetryCancelled, SyncLife360
+except ImportError:     # aiohttp isn't installed
+    SyncLife360 = None
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class MemberActivityTest(unittest.TestCase):
+
+    def test_activity(self):
+        self.assertEqual(member_activity({'location': {'inTransit': '1', 'speed': '0'}}, 5), 'in transit')
+        self.assertEqual(member_activity({'location': {'inTransit': '0', 'speed': '3'}}, 5), 'moving')
+        self.assertIsNone(member_activity({'location': {'inTransit': '0', 'speed': '2'}}, 5))
+        self.assertIsNone(member_activity({'location': {'speed': '-1'}}, 5))
+        self.assertIsNone(member_activity({'location': {'speed': 'fast'}}, 5))
+        self.assertIsNone(member_activity({'location': None}, 5))
+        self.assertIsNone(member_activity(None, 5))
+
+
+class PollSchedulerTest(unittest.TestCase):
+
+    def test_backs_off_while_quiet(self):
+        scheduler = PollScheduler(base_interval=30, min_interval=15, max_interval=300)
+        intervals = [scheduler.next_interval() for _ in range(7)]
+        self.assertEqual(intervals, [30, 60, 120, 240, 300, 300, 300])
+        self.assertEqual(scheduler.reason, 'stationary')
+
+    def test_activity_polls_fast(self):
+        scheduler = PollScheduler(base_interval=30, min_interval=15, max_interval=300)
+        for _ in range(5):
+            scheduler.next_interval()
+        self.assertEqual(scheduler.next_interval('moving'), 15)
+        self.assertEqual(scheduler.reason, 'moving')
+        # quiet again: straight back to the base interval
+        self.assertEqual(scheduler.next_interval(), 30)
+        self.assertEqual(scheduler.reason, 'idle')
+
+    def test_fixed_interval(self):
+        scheduler = PollScheduler(base_interval=30, min_interval=15, max_interval=300)
+        scheduler.configure(min_interval=30, max_interval=30)
+        self.assertEqual({scheduler.next_interval(a) for a in (None, 'moving', None, None)}, {30})
+
+    def test_configure_clamps(self):
+        scheduler = PollScheduler(base_interval=30, min_interval=15, max_interval=300)
+        for _ in range(6):
+            scheduler.next_interval()
+        scheduler.configure(max_interval=100)
+        self.assertEqual(scheduler.interval, 100)
+
+
+class RetryBackoffTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.backoff = RetryBackoff(base=60, maximum=120, clock=self.clock)
+
+    def test_schedule(self):
+        self.assertFalse(self.backoff.pending)
+        self.assertTrue(self.backoff.due())
+        self.assertEqual(self.backoff.fail(), 60)
+        self.assertTrue(self.backoff.pending)
+        self.assertFalse(self.backoff.due())
+        self.clock.now += 45
+        self.assertEqual(self.backoff.remaining(), 15)
+        self.clock.now += 15
+        self.assertTrue(self.backoff.due())
+        self.assertEqual(self.backoff.remaining(), 0)
+        self.assertEqual([self.backoff.fail() for _ in range(3)], [120, 120, 120])
+
+    def test_reset(self):
+        self.backoff.fail()
+        self.backoff.fail()
+        self.backoff.reset()
+        self.assertFalse(self.backoff.pending)
+        self.assertTrue(self.backoff.due())
+        self.assertEqual(self.backoff.remaining(), 0)
+        self.assertEqual(self.backoff.fail(), 60)
+
+    def test_many_failures(self):
+        for _ in range(2000):
+            delay = self.backoff.fail()
+        self.assertEqual(delay, 120)
+
+
+@unittest.skipIf(SyncLife360 is None, "aiohttp is not installed")
+class CancelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = SyncLife360(access_token='token')
+
+    def tearDown(self):
+        self.api.close()
+
+    def test_cancel_ends_wait(self):
+        threading.Timer(0.1, self.api.cancel).start()
+        start = time.monotonic()
+        with self.assertRaises(RetryCancelled):
+            self.api._run(self.api._sleep(30))
+        self.assertLess(time.monotonic() - start, 2)
+        # a cancel aimed at an earlier call doesn't abort the next one
+        self.api._run(self.api._sleep(0.01))
+
+    def test_cancelled_budget_wait_is_released(self):
+        self.api.budget = RequestBudget(capacity=1, refill_per_second=0.1)
+        self.api.budget.reserve()
+        threading.Timer(0.1, self.api.cancel).start()
+        with self.assertRaises(RetryCancelled):
+            self.api._run(self.api._throttle('test'))
+        self.assertLessEqual(self.api.budget.wait_time(), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
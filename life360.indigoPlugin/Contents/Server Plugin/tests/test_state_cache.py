@@ -0,0 +1,70 @@
+"""Tests for the per-device state cache"""
+
+import unittest
+
+from state_cache import DeviceStateCache
+
+
+def states(**values):
+    return [{'key': k, 'value': v} for k, v in values.items()]
+
+
+class DeviceStateCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DeviceStateCache()
+
+    def test_only_changed_keys_are_written(self):
+        self.assertEqual(self.cache.diff(1, states(a=1, b='x')), states(a=1, b='x'))
+        self.assertEqual(self.cache.diff(1, states(a=1, b='y')), states(b='y'))
+        self.assertEqual(self.cache.diff(1, states(a=1, b='y')), [])
+        self.assertEqual((self.cache.writes, self.cache.suppressed_writes), (3, 3))
+
+    def test_devices_are_independent(self):
+        self.cache.diff(1, states(a=1))
+        self.assertEqual(self.cache.diff(2, states(a=1)), states(a=1))
+
+    def test_last_duplicate_wins(self):
+        changed = self.cache.diff(1, [{'key': 'a', 'value': 1}, {'key': 'a', 'value': 2}])
+        self.assertEqual(changed, [{'key': 'a', 'value': 2}])
+        self.assertEqual(self.cache.diff(1, states(a=2)), [])
+
+    def test_value_types_are_compared(self):
+        self.cache.diff(1, states(a='1'))
+        self.assertEqual(self.cache.diff(1, states(a=1)), states(a=1))
+
+    def test_forget_rewrites_everything(self):
+        self.cache.diff(1, states(a=1, b=2))
+        self.cache.location_unchanged(1, '1700000000')
+        self.cache.forget(1)
+        self.assertEqual(self.cache.diff(1, states(a=1, b=2)), states(a=1, b=2))
+        self.assertFalse(self.cache.location_unchanged(1, '1700000000'))
+
+    def test_location_unchanged(self):
+        self.assertFalse(self.cache.location_unchanged(1, '1700000000'))
+        self.assertTrue(self.cache.location_unchanged(1, '1700000000'))
+        self.assertFalse(self.cache.location_unchanged(1, '1700000060'))
+        self.assertFalse(self.cache.location_unchanged(1, None))
+        self.assertFalse(self.cache.location_unchanged(1, ''))
+        self.assertEqual(self.cache.skipped_updates, 1)
+
+    def test_expire_location(self):
+        self.cache.location_unchanged(1, '1700000000')
+        self.cache.location_unchanged(2, '1700000000')
+        self.cache.diff(1, states(a=1))
+        self.cache.expire_location(1)
+        self.assertFalse(self.cache.location_unchanged(1, '1700000000'))
+        self.assertTrue(self.cache.location_unchanged(2, '1700000000'))
+        # the state values are kept
+        self.assertEqual(self.cache.diff(1, states(a=1)), [])
+
+    def test_reset_timestamps(self):
+        self.cache.location_unchanged(1, '1700000000')
+        self.cache.location_unchanged(2, '1700000000')
+        self.cache.reset_timestamps()
+        self.assertFalse(self.cache.location_unchanged(1, '1700000000'))
+        self.assertFalse(self.cache.location_unchanged(2, '1700000000'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for streaming trip detection"""
+
+import unittest
+
+from trips import TripDetector
+
+HOME = (40.0, -75.0)
+WORK = (40.2, -75.0)    # about 22 km north
+
+
+class TripDetectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.trips = TripDetector(moving_mph=5.0, stop_seconds=180, min_distance_km=0.3)
+
+    def drive(self, start):
+        """Leave home at start and drive to work in 20 minutes."""
+        steps = 10
+        for i in range(1, steps + 1):
+            lat = HOME[0] + (WORK[0] - HOME[0]) * i / steps
+            self.assertIsNone(self.trips.update('m', start + i * 120, lat, HOME[1], 40.0, True, ''))
+        return start + steps * 120
+
+    def test_trip_starts_at_first_moving_fix_after_a_long_gap(self):
+        # the last fix at home is hours older than the first moving one
+        self.trips.update('m', 0, HOME[0], HOME[1], 0.0, False, 'Home')
+        arrived = self.drive(3 * 3600)
+        self.assertIsNone(self.trips.update('m', arrived + 60, WORK[0], WORK[1], 0.0, False, 'Work'))
+        trip = self.trips.update('m', arrived + 240, WORK[0], WORK[1], 0.0, False, 'Work')
+        self.assertIsNotNone(trip)
+        self.assertEqual(trip.start_time, 3 * 3600 + 120)
+        self.assertEqual(trip.end_time, arrived + 60)
+        self.assertGreater(trip.avg_speed_mph, 30)
+        self.assertEqual(trip.end_place, 'Work')
+
+    def test_trip_starts_at_recent_previous_fix(self):
+        self.trips.update('m', 1000, HOME[0], HOME[1], 0.0, False, 'Home')
+        arrived = self.drive(1000)
+        self.trips.update('m', arrived + 60, WORK[0], WORK[1], 0.0, False, 'Work')
+        trip = self.trips.expire('m', arrived + 240)
+        self.assertEqual(trip.start_time, 1000)
+        self.assertEqual(trip.start_place, 'Home')
+        self.assertAlmostEqual(trip.distance_km, 22.2, delta=0.5)
+
+    def test_expire_ends_trip_without_another_fix(self):
+        self.trips.update('m', 1000, HOME[0], HOME[1], 0.0, False, 'Home')
+        arrived = self.drive(1000)
+        self.trips.update('m', arrived + 60, WORK[0], WORK[1], 0.0, False, 'Work')
+        self.assertIsNone(self.trips.expire('m', arrived + 200))
+        self.assertTrue(self.trips.on_trip('m'))
+        self.assertIsNotNone(self.trips.expire('m', arrived + 240))
+        self.assertFalse(self.trips.on_trip('m'))
+        self.assertIsNone(self.trips.expire('m', arrived + 600))
+
+    def test_expire_leaves_moving_member_alone(self):
+        self.trips.update('m', 1000, HOME[0], HOME[1], 0.0, False, 'Home')
+        arrived = self.drive(1000)
+        self.assertIsNone(self.trips.expire('m', arrived + 600))
+        self.assertTrue(self.trips.on_trip('m'))
+
+    def test_expire_ends_trip_when_fixes_stop_while_moving(self):
+        # the phone goes quiet on arrival, so no stopped fix ever comes
+        self.trips.update('m', 1000, HOME[0], HOME[1], 0.0, False, 'Home')
+        arrived = self.drive(1000)
+        self.assertIsNone(self.trips.expire('m', arrived + 899))
+        trip = self.trips.expire('m', arrived + 900)
+        self.assertIsNotNone(trip)
+        self.assertFalse(self.trips.on_trip('m'))
+        # ends at the last moving fix, not when the trip was expired
+        self.assertEqual(trip.start_time, 1000)
+        self.assertEqual(trip.end_time, arrived)
+        self.assertEqual(trip.end_place, '')
+        self.assertAlmostEqual(trip.avg_speed_mph, 22.2 / 1.609344 * 3, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Streaming trip detection from successive member fixes."""
+from collections import namedtuple
+
+from geopy.distance import geodesic
+
+_KM_PER_MILE = 1.609344
+
+Trip = namedtuple('Trip', 'member start_time end_time start_place end_place '
+                          'distance_km max_speed_mph avg_speed_mph')
+
+
+class _Leg:
+    """Running totals for the trip a member is on."""
+
+    __slots__ = ('start_time', 'start_place', 'distance_km', 'max_speed_mph',
+                 'stopped_since', 'stopped_place', 'last_fix')
+
+    def __init__(self, start_time, start_place, last_fix):
+        self.start_time = start_time
+        self.start_place = start_place
+        self.distance_km = 0.0
+        self.max_speed_mph = 0.0
+        self.stopped_since = None
+        self.stopped_place = None
+        self.last_fix = last_fix
+
+
+class TripDetector:
+    """
+    Splits each member's fixes into trips as they arrive.
+
+    A member is moving while Life360 reports inTransit or the speed is above
+    moving_mph.  The first moving fix starts a trip from the fix before it
+    when that fix is at most stop_seconds older, otherwise from the moving
+    fix itself, so a member who sat at home for hours doesn't get a trip
+    that began hours ago.  Distance is added up fix to fix with the
+    geodesic distance, so each fix costs O(1) and nothing is rescanned.
+
+    The trip ends once the member has been stopped for stop_seconds.
+    Life360 often sends no new fix while a member stays put, so besides
+    update() the caller runs expire() each poll to end a trip by the clock;
+    either returns the Trip, with its end time set to when the member
+    stopped.  If fixes stop arriving mid-trip (the phone was switched off,
+    say) and the last one was still moving, expire() ends the trip once
+    lost_seconds have passed without a fix, at the time and place of that
+    last moving fix.  Trips shorter than min_distance_km are GPS wander
+    and are dropped.
+    """
+
+    def __init__(self, moving_mph=5.0, stop_seconds=180, min_distance_km=0.3, lost_seconds=900):
+        self.moving_mph = moving_mph
+        self.stop_seconds = stop_seconds
+        self.min_distance_km = min_distance_km
+        self.lost_seconds = lost_seconds
+        self._last = {}    # member -> (timestamp, lat, lon, place) of the last fix
+        self._trips = {}   # member -> _Leg of the trip in progress
+
+    def on_trip(self, member):
+        """True while the member has a trip in progress."""
+        return member in self._trips
+
+    def forget(self, member):
+        self._last.pop(member, None)
+        self._trips.pop(member, None)
+
+    def update(self, member, timestamp, lat, lon, speed_mph=0.0, in_transit=False, place=''):
+        """
+        Feed one fix.  Returns the Trip it completed, or None.
+
+        Fixes that are not newer than the member's previous fix are ignored.
+        """
+        previous = self._last.get(member)
+        if previous is not None and timestamp <= previous[0]:
+            return None
+        fix = (timestamp, lat, lon, place)
+        self._last[member] = fix
+        moving = in_transit or speed_mph > self.moving_mph
+
+        leg = self._trips.get(member)
+        if leg is None:
+            if not moving:
+                return None
+            if previous is not None and timestamp - previous[0] <= self.stop_seconds:
+                leg = self._trips[member] = _Leg(previous[0], previous[3], previous)
+            else:
+                leg = self._trips[member] = _Leg(timestamp, place, fix)
+
+        leg.distance_km += geodesic(leg.last_fix[1:3], (lat, lon)).km
+        leg.last_fix = fix
+        leg.max_speed_mph = max(leg.max_speed_mph, speed_mph)
+        if moving:
+            leg.stopped_since = None
+            return None
+        if leg.stopped_since is None:
+            leg.stopped_since, leg.stopped_place = timestamp, place
+        if timestamp - leg.stopped_since < self.stop_seconds:
+            return None
+        return self._finish(member, leg)
+
+    def expire(self, member, now):
+        """
+        End the member's trip if it has been stopped for stop_seconds by now
+        (epoch seconds), or if it is still moving but no fix has arrived for
+        lost_seconds.  Returns the Trip it completed, or None.
+        """
+        leg = self._trips.get(member)
+        if leg is None:
+            return None
+        if leg.stopped_since is None:
+            if now - leg.last_fix[0] < self.lost_seconds:
+                return None
+            # the member went quiet while moving: end at the last fix we had
+            leg.stopped_since, leg.stopped_place = leg.last_fix[0], leg.last_fix[3]
+        elif now - leg.stopped_since < self.stop_seconds:
+            return None
+        return self._finish(member, leg)
+
+    def _finish(self, member, leg):
+        del self._trips[member]
+        if leg.distance_km < self.min_distance_km:
+            return None
+        hours = (leg.stopped_since - leg.start_time) / 3600.0
+        avg_mph = leg.distance_km / _KM_PER_MILE / hours if hours > 0 else 0.0
+        return Trip(member, leg.start_time, leg.stopped_since, leg.start_place,
+                    leg.stopped_place, leg.distance_km, leg.max_speed_mph, avg_mph)